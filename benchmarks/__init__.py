@@ -0,0 +1 @@
+"""Benchmarks and synthetic data generation for the ETL pipeline."""
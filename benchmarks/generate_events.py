@@ -0,0 +1,217 @@
+"""Generate synthetic daily event files in the raw data/raw/event_data layout."""
+
+import csv
+import random
+import sys
+from datetime import date, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import List, Tuple
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import click
+
+RAW_COLUMNS = [
+    "artist",
+    "auth",
+    "firstName",
+    "gender",
+    "itemInSession",
+    "lastName",
+    "length",
+    "level",
+    "location",
+    "method",
+    "page",
+    "registration",
+    "sessionId",
+    "song",
+    "status",
+    "ts",
+    "userId",
+]
+
+FIRST_NAMES = ["Kaylee", "Ryan", "Tegan", "Samuel", "Wyatt", "Austin", "Lily", "Jacob", "Chloe"]
+LAST_NAMES = ["Summers", "Smith", "Levine", "Gonzalez", "Scott", "Rosales", "Koch", "Klein"]
+LOCATIONS = [
+    "San Francisco-Oakland-Hayward, CA",
+    "Phoenix-Mesa-Scottsdale, AZ",
+    "New York-Newark-Jersey City, NY-NJ-PA",
+    "Houston-The Woodlands-Sugar Land, TX",
+    "Portland-South Portland, ME",
+    "Chicago-Naperville-Elgin, IL-IN-WI",
+    "Atlanta-Sandy Springs-Roswell, GA",
+]
+# Non-song pages and their share of events, as in the sample data (~15% of rows)
+OTHER_PAGES = [("Home", "GET"), ("About", "GET"), ("Help", "GET"), ("Settings", "GET")]
+OTHER_PAGE_RATE = 0.15
+LOGGED_OUT_RATE = 0.01
+
+
+def zipf_cum_weights(size: int, exponent: float = 1.1) -> List[float]:
+    """
+    Cumulative Zipf weights, so a few items are drawn far more often than the rest.
+
+    Args:
+        size: Number of items
+        exponent: Skew of the distribution
+
+    Returns:
+        Cumulative weights for ``random.choices``
+    """
+    return list(accumulate(1 / rank**exponent for rank in range(1, size + 1)))
+
+
+class EventGenerator:
+    """
+    Build synthetic listening sessions with skewed song, artist and user activity.
+
+    Songs follow a Zipf distribution over a catalog in which each artist has
+    several songs; users start sessions at Zipf-skewed rates and each session
+    plays a run of consecutive items, like the real event logs.
+    """
+
+    def __init__(self, seed: int = 42, songs: int = 50000, artists: int = 5000, users: int = 2000):
+        """
+        Initialize generator.
+
+        Args:
+            seed: Random seed, so runs are reproducible
+            songs: Size of the song catalog
+            artists: Number of distinct artists
+            users: Number of distinct users
+        """
+        self.random = random.Random(seed)
+        self.songs = [
+            (
+                f"Artist {self.random.randrange(artists)}",
+                f"Song {i}",
+                round(self.random.uniform(90, 600), 5),
+            )
+            for i in range(songs)
+        ]
+        self.song_weights = zipf_cum_weights(songs)
+        self.users = [
+            (
+                str(user_id),
+                self.random.choice(FIRST_NAMES),
+                self.random.choice("MF"),
+                self.random.choice(LAST_NAMES),
+                self.random.choice(["free", "paid"]),
+                self.random.choice(LOCATIONS),
+                f"{self.random.uniform(1.530, 1.541):.5f}E+12",
+            )
+            for user_id in range(1, users + 1)
+        ]
+        self.user_weights = zipf_cum_weights(users, exponent=0.8)
+        self.next_session_id = 1
+
+    def session_rows(self, ts: float) -> List[List[str]]:
+        """
+        Generate the rows of one listening session.
+
+        Args:
+            ts: Session start timestamp in milliseconds
+
+        Returns:
+            Raw rows of the session
+        """
+        user_id, first, gender, last, level, location, registration = self.random.choices(
+            self.users, cum_weights=self.user_weights
+        )[0]
+        session_id = str(self.next_session_id)
+        self.next_session_id += 1
+
+        length = max(1, int(self.random.expovariate(1 / 12)))
+        played = self.random.choices(self.songs, cum_weights=self.song_weights, k=length)
+
+        rows = []
+        for item, (artist, song, song_length) in enumerate(played):
+            event_ts = f"{(ts + item * 240000) / 1e12:.5f}E+12"
+            if self.random.random() < LOGGED_OUT_RATE:
+                rows.append(
+                    ["", "Logged Out", "", "", str(item), "", "", level, "", "PUT", "Login", "",
+                     session_id, "", "307", event_ts, ""]
+                )  # fmt: skip
+            elif self.random.random() < OTHER_PAGE_RATE:
+                page, method = self.random.choice(OTHER_PAGES)
+                rows.append(
+                    ["", "Logged In", first, gender, str(item), last, "", level, location, method,
+                     page, registration, session_id, "", "200", event_ts, user_id]
+                )  # fmt: skip
+            else:
+                rows.append(
+                    [artist, "Logged In", first, gender, str(item), last, str(song_length), level,
+                     location, "PUT", "NextSong", registration, session_id, song, "200", event_ts,
+                     user_id]
+                )  # fmt: skip
+        return rows
+
+    def write_files(
+        self, output_folder: Path, rows: int, days: int, start: date = date(2018, 11, 1)
+    ) -> List[Tuple[Path, int]]:
+        """
+        Write ``rows`` events spread evenly over ``days`` daily files.
+
+        Args:
+            output_folder: Folder for the ``YYYY-MM-DD-events.csv`` files
+            rows: Total number of events
+            days: Number of daily files
+            start: Date of the first file
+
+        Returns:
+            Written files and their row counts
+        """
+        output_folder.mkdir(parents=True, exist_ok=True)
+        written = []
+
+        for day in range(days):
+            day_date = start + timedelta(days=day)
+            target = rows // days + (1 if day < rows % days else 0)
+            ts = 1.5410e12 + day * 86400000.0
+            file_path = output_folder / f"{day_date.isoformat()}-events.csv"
+
+            with open(file_path, "w", encoding="utf8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(RAW_COLUMNS)
+
+                count = 0
+                while count < target:
+                    session = self.session_rows(ts + count * 1000)[: target - count]
+                    writer.writerows(session)
+                    count += len(session)
+
+            written.append((file_path, target))
+
+        return written
+
+
+@click.command()
+@click.option("--rows", default=10000, show_default=True, help="Total number of events")
+@click.option("--days", default=30, show_default=True, help="Number of daily files")
+@click.option("--seed", default=42, show_default=True, help="Random seed")
+@click.option(
+    "--output",
+    default="data/synthetic/event_data",
+    show_default=True,
+    type=click.Path(file_okay=False),
+    help="Output folder",
+)
+def main(rows: int, days: int, seed: int, output: str):
+    """
+    Generate synthetic raw event files for benchmarks.
+
+    Example:
+        python benchmarks/generate_events.py --rows 1000000 --output data/bench_1m
+    """
+    written = EventGenerator(seed=seed).write_files(Path(output), rows=rows, days=days)
+    click.echo(
+        f"Wrote {sum(count for _, count in written)} events to {len(written)} files in {output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""Time the extract, transform and load stages on synthetic event data."""
+
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import click
+from loguru import logger
+
+from benchmarks.generate_events import EventGenerator
+from src.db.fake import FakeSession, lognormal_latency
+from src.db.schema import CassandraSchema
+from src.etl.extract import EXTRACT_ENGINES, EventDataExtractor
+from src.etl.load import EventDataLoader
+from src.etl.transform import EventDataTransformer
+
+SIZE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_size(size: str) -> int:
+    """
+    Parse a row count such as ``10k`` or ``1m``.
+
+    Args:
+        size: Row count with an optional k/m suffix
+
+    Returns:
+        Number of rows
+    """
+    size = size.strip().lower()
+    if size[-1] in SIZE_SUFFIXES:
+        return int(float(size[:-1]) * SIZE_SUFFIXES[size[-1]])
+    return int(size)
+
+
+class _TimedIterator:
+    """Iterator wrapper accumulating the time spent producing items."""
+
+    def __init__(self, items: Iterable):
+        self.items = iter(items)
+        self.seconds = 0.0
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            return next(self.items)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+
+def _stage(seconds: float, rows: int, **extra: Any) -> Dict[str, Any]:
+    """Build the result entry of one stage."""
+    return {
+        "seconds": round(seconds, 4),
+        "rows": rows,
+        "rows_per_second": round(rows / seconds, 1) if seconds > 0 else None,
+        **extra,
+    }
+
+
+def benchmark_extract(data_folder: Path, engine: str, chunk_size: int = 10000) -> Dict[str, Any]:
+    """
+    Time one extract engine and measure the memory its row chunks hold.
+
+    Rows are projected to the transformer's input columns where the engine
+    supports it. Allocation is measured with ``tracemalloc`` in a separate
+    pass over the first chunk, so tracing doesn't skew the timing.
+
+    Args:
+        data_folder: Folder with raw synthetic event files
+        engine: Extract engine name
+        chunk_size: Rows per chunk
+
+    Returns:
+        Timing, throughput, bytes retained per row and peak traced bytes
+    """
+    columns = EventDataTransformer.OUTPUT_COLUMNS
+    extractor = EventDataExtractor(str(data_folder), engine=engine, columns=columns)
+    file_paths = sorted(extractor.get_file_paths())
+
+    start = time.perf_counter()
+    for _ in extractor.iter_chunks(file_paths, chunk_size=chunk_size):
+        pass
+    seconds = time.perf_counter() - start
+    rows = extractor.rows_extracted
+
+    tracemalloc.start()
+    try:
+        chunk = next(iter(extractor.iter_chunks(file_paths, chunk_size=chunk_size)), [])
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return _stage(
+        seconds,
+        rows,
+        retained_bytes_per_row=round(retained / len(chunk), 1) if chunk else None,
+        peak_traced_bytes=peak,
+    )
+
+
+def benchmark_size(
+    data_folder: Path, work_folder: Path, batch_size: int, latency_ms: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Time each pipeline stage over one synthetic dataset.
+
+    Extraction time is measured inside the chunk iterator feeding the
+    transformer, so transform time excludes CSV reading. Each extract
+    engine is also timed on its own, with the memory its chunks hold.
+
+    Args:
+        data_folder: Folder with raw synthetic event files
+        work_folder: Folder for the consolidated file
+        batch_size: Writes in flight for the load stage
+        latency_ms: Median write latency of the fake session (0 completes writes immediately)
+
+    Returns:
+        Per-stage timings and throughput
+    """
+    extractor = EventDataExtractor(str(data_folder))
+    file_paths = sorted(extractor.get_file_paths())
+    transformer = EventDataTransformer(str(work_folder / "events.csv"))
+
+    chunks = _TimedIterator(extractor.iter_chunks(file_paths))
+    start = time.perf_counter()
+    output_file = transformer.transform_chunks(chunks)
+    extract_transform_seconds = time.perf_counter() - start
+
+    session = FakeSession(latency=lognormal_latency(latency_ms) if latency_ms else None)
+    CassandraSchema(session).create_all_tables()
+    loader = EventDataLoader(session, output_file, batch_size=batch_size, fan_out=True)
+    start = time.perf_counter()
+    rows_loaded = loader.load_all_tables()
+    load_seconds = time.perf_counter() - start
+    session.shutdown()
+
+    rows_transformed = extractor.rows_extracted - transformer.rows_skipped
+    return {
+        **{f"read_{engine}": benchmark_extract(data_folder, engine) for engine in EXTRACT_ENGINES},
+        "extract": _stage(chunks.seconds, extractor.rows_extracted),
+        "transform": _stage(extract_transform_seconds - chunks.seconds, extractor.rows_extracted),
+        "load": _stage(
+            load_seconds,
+            rows_transformed,
+            writes=sum(rows_loaded.values()),
+            requests=session.stats()["requests"],
+        ),
+    }
+
+
+def compare_results(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Find stages whose throughput dropped by more than ``threshold``.
+
+    Args:
+        baseline: Results of an earlier run
+        current: Results of this run
+        threshold: Allowed relative slowdown (0.2 = 20%)
+
+    Returns:
+        Descriptions of regressions
+    """
+    regressions = []
+
+    for size, stages in current["results"].items():
+        for stage, result in stages.items():
+            before = baseline.get("results", {}).get(size, {}).get(stage, {})
+            old, new = before.get("rows_per_second"), result["rows_per_second"]
+            if old and new and new < old * (1 - threshold):
+                regressions.append(
+                    f"{size} rows / {stage}: {new:,.0f} rows/s vs {old:,.0f} rows/s baseline "
+                    f"({(new / old - 1) * 100:+.1f}%)"
+                )
+
+    return regressions
+
+
+@click.command()
+@click.option(
+    "--sizes", default="10k", show_default=True, help="Comma-separated row counts (e.g. 10k,1m,10m)"
+)
+@click.option("--days", default=30, show_default=True, help="Daily files per dataset")
+@click.option("--batch-size", default=1000, show_default=True, help="Writes in flight during load")
+@click.option(
+    "--latency-ms", default=0.0, show_default=True, help="Median write latency of the fake session"
+)
+@click.option(
+    "--data-dir",
+    default="data/benchmarks",
+    show_default=True,
+    type=click.Path(file_okay=False),
+    help="Folder for generated datasets (reused between runs)",
+)
+@click.option(
+    "--output",
+    default="benchmarks/results.json",
+    show_default=True,
+    type=click.Path(dir_okay=False),
+    help="Machine-readable results file",
+)
+@click.option(
+    "--compare",
+    "baseline_file",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Earlier results file to check for regressions",
+)
+@click.option("--threshold", default=0.2, show_default=True, help="Allowed relative slowdown")
+def main(
+    sizes: str,
+    days: int,
+    batch_size: int,
+    latency_ms: float,
+    data_dir: str,
+    output: str,
+    baseline_file: str,
+    threshold: float,
+):
+    """
+    Benchmark extraction, transformation and loading on synthetic event data.
+
+    Example:
+        python benchmarks/run_benchmarks.py --sizes 10k,1m --output bench.json
+        python benchmarks/run_benchmarks.py --sizes 10k,1m --compare bench.json
+    """
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    results: Dict[str, Any] = {}
+    for size in sizes.split(","):
+        rows = parse_size(size)
+        data_folder = Path(data_dir) / f"{rows}_rows"
+        if not data_folder.exists():
+            click.echo(f"Generating {rows:,} events in {data_folder}...")
+            EventGenerator().write_files(data_folder, rows=rows, days=days)
+
+        results[str(rows)] = benchmark_size(data_folder, Path(data_dir), batch_size, latency_ms)
+        for stage, result in results[str(rows)].items():
+            click.echo(f"{rows:>10,} rows  {stage:<9} {result['rows_per_second']:>12,.0f} rows/s")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "batch_size": batch_size,
+            "latency_ms": latency_ms,
+        },
+        "results": results,
+    }
+
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf8") as f:
+        json.dump(report, f, indent=2)
+    click.echo(f"Results written to {output}")
+
+    if baseline_file:
+        with open(baseline_file, "r", encoding="utf8") as f:
+            regressions = compare_results(json.load(f), report, threshold)
+        for regression in regressions:
+            click.echo(f"REGRESSION: {regression}", err=True)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """CLI entry point for running the ETL pipeline."""
 
+import signal
 import sys
 from pathlib import Path
 
@@ -9,9 +10,12 @@ sys.path.insert(0, str(project_root))
 
 import click
 import yaml
+from loguru import logger
 
 from src.etl.pipeline import ETLPipeline
+from src.etl.watch import DEFAULT_WATCH_INTERVAL, PipelineWatcher
 from src.utils.logger import setup_logger
+from src.utils.profiling import PROFILE_MODES, PhaseProfiler
 
 
 @click.command()
@@ -27,8 +31,51 @@ from src.utils.logger import setup_logger
     help="Logging level (DEBUG, INFO, WARNING, ERROR)",
     type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"], case_sensitive=False),
 )
-@click.option("--dry-run", is_flag=True, help="Run pipeline without loading data into Cassandra")
-def main(config: str, log_level: str, dry_run: bool):
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Extract and transform fully, counting the writes instead of sending them to Cassandra",
+)
+@click.option(
+    "--full-refresh",
+    is_flag=True,
+    help="Reprocess every raw file, ignoring the processed-file manifest",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue an interrupted load from its per-table checkpoints",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep running and load new raw files as they land, over one warm connection",
+)
+@click.option(
+    "--interval",
+    default=None,
+    type=float,
+    help=f"Seconds between polls in watch mode (default: etl.watch_interval or "
+    f"{DEFAULT_WATCH_INTERVAL})",
+)
+@click.option(
+    "--profile",
+    "profile_mode",
+    default=None,
+    type=click.Choice(PROFILE_MODES, case_sensitive=False),
+    help="Write cProfile and/or tracemalloc results per phase to a timestamped folder "
+    "next to the log file",
+)
+def main(
+    config: str,
+    log_level: str,
+    dry_run: bool,
+    full_refresh: bool,
+    resume: bool,
+    watch: bool,
+    interval: float,
+    profile_mode: str,
+):
     """
     Run the Cassandra ETL Pipeline.
 
@@ -38,6 +85,11 @@ def main(config: str, log_level: str, dry_run: bool):
     Example:
         python scripts/run_pipeline.py
         python scripts/run_pipeline.py --config config/custom.yaml --log-level DEBUG
+        python scripts/run_pipeline.py --full-refresh
+        python scripts/run_pipeline.py --resume
+        python scripts/run_pipeline.py --dry-run
+        python scripts/run_pipeline.py --watch --interval 1
+        python scripts/run_pipeline.py --dry-run --profile cpu
     """
     # Load configuration
     with open(config, "r") as f:
@@ -50,14 +102,28 @@ def main(config: str, log_level: str, dry_run: bool):
     logger.info(f"Configuration loaded from: {config}")
 
     if dry_run:
-        logger.warning("DRY RUN MODE - Data will not be loaded into Cassandra")
+        logger.warning("DRY RUN MODE - Data will not be loaded into Cassandra, writes are counted")
+        if watch:
+            logger.warning("--watch is ignored for a dry run")
+    elif watch:
+        if profile_mode:
+            logger.warning("--profile is ignored in watch mode")
+        run_watcher(config_data, interval)
         return
 
+    profiler = PhaseProfiler.for_log_file(profile_mode.lower(), log_file) if profile_mode else None
+
     try:
         # Run pipeline
-        pipeline = ETLPipeline(config_data)
+        pipeline = ETLPipeline(
+            config_data,
+            full_refresh=full_refresh,
+            resume=resume,
+            dry_run=dry_run,
+            profiler=profiler,
+        )
 
-        pipeline.run()  # stats = pipeline.run()
+        run_profiled(pipeline, profiler)
 
         # Exit successfully
         sys.exit(0)
@@ -67,5 +133,47 @@ def main(config: str, log_level: str, dry_run: bool):
         sys.exit(1)
 
 
+def run_profiled(pipeline: ETLPipeline, profiler: PhaseProfiler = None):
+    """
+    Run the pipeline once, writing its phase profiles even if the run fails.
+
+    Args:
+        pipeline: Pipeline to run
+        profiler: Profiler attached to the pipeline, or None to run unprofiled
+    """
+    if profiler is None:
+        pipeline.run()
+        return
+
+    profiler.start()
+    try:
+        pipeline.run()
+    finally:
+        profiler.stop()
+
+
+def run_watcher(config_data: dict, interval: float):
+    """
+    Run the pipeline in watch mode until interrupted or terminated.
+
+    Args:
+        config_data: Configuration dictionary
+        interval: Seconds between polls, or None for the configured interval
+    """
+    if interval is None:
+        interval = config_data["etl"].get("watch_interval", DEFAULT_WATCH_INTERVAL)
+
+    watcher = PipelineWatcher(config_data, interval=interval)
+    signal.signal(signal.SIGTERM, lambda *_: watcher.stop())
+
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
+    except Exception as e:
+        logger.exception(f"Watch mode failed: {e}")
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,162 @@
+"""asyncio facade over the driver's callback-based ``ResponseFuture``."""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from cassandra.cluster import Session
+from loguru import logger
+
+from src.db.queries import SELECT_QUERIES, Listener, SessionSong, SongPlay, to_result
+from src.utils.cache import TTLCache
+
+
+def _resolve(future: asyncio.Future, rows: List[Any]):
+    """Complete an awaitable with result rows unless it was cancelled."""
+    if not future.done():
+        future.set_result(rows)
+
+
+def _reject(future: asyncio.Future, error: BaseException):
+    """Fail an awaitable unless it was cancelled."""
+    if not future.done():
+        future.set_exception(error)
+
+
+def execute(session: Session, statement, params: Optional[Any] = None) -> asyncio.Future:
+    """
+    Send a statement and get an awaitable for all of its result rows.
+
+    Driver callbacks run on the driver's event loop thread, so results are
+    handed to the asyncio loop with ``call_soon_threadsafe``. Further result
+    pages are fetched before the awaitable completes.
+
+    Args:
+        session: Active Cassandra session
+        statement: Prepared, bound, simple or batch statement
+        params: Values to bind to the statement
+
+    Returns:
+        Future resolving to the result rows, or raising the request's error
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    response = session.execute_async(statement, params)
+    rows: List[Any] = []
+
+    def on_page(page):
+        rows.extend(page or ())
+        if getattr(response, "has_more_pages", False):
+            response.start_fetching_next_page()
+        else:
+            loop.call_soon_threadsafe(_resolve, future, rows)
+
+    def on_error(error):
+        loop.call_soon_threadsafe(_reject, future, error)
+
+    response.add_callbacks(on_page, on_error)
+    return future
+
+
+async def prepare(session: Session, query: str):
+    """
+    Prepare a statement without blocking the event loop.
+
+    Args:
+        session: Active Cassandra session
+        query: CQL with ``?`` placeholders
+
+    Returns:
+        Prepared statement
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, session.prepare, query)
+
+
+class AsyncEventQueryService:
+    """
+    Awaitable reads for the three query tables behind an LRU cache with TTL.
+
+    Results and caching match ``EventQueryService``; concurrent calls run
+    their queries concurrently on the driver.
+
+    Usage:
+        queries = AsyncEventQueryService(session)
+        play, listeners = await asyncio.gather(
+            queries.song_in_session(338, 4),
+            queries.song_listeners("All Hands Against His Own"),
+        )
+    """
+
+    def __init__(self, session: Session, cache_size: int = 1024, ttl_seconds: float = 60.0):
+        """
+        Initialize query service.
+
+        Args:
+            session: Active Cassandra session using the project keyspace
+            cache_size: Maximum number of cached query results
+            ttl_seconds: Seconds a cached result stays valid
+        """
+        self.session = session
+        self.cache = TTLCache(max_size=cache_size, ttl_seconds=ttl_seconds)
+        self._prepared: Dict[str, Any] = {}
+
+    async def _cached(self, query: str, params: tuple) -> Any:
+        """Get a query result from the cache, fetching it on a miss."""
+        missing = object()
+        result = self.cache.get((query, params), missing)
+        if result is not missing:
+            return result
+
+        if query not in self._prepared:
+            self._prepared[query] = await prepare(self.session, SELECT_QUERIES[query])
+
+        try:
+            rows = await execute(self.session, self._prepared[query], params)
+        except Exception as e:
+            logger.error(f"Query {query} failed for {params}: {e}")
+            raise
+
+        result = to_result(query, rows)
+        self.cache.put((query, params), result)
+        return result
+
+    async def song_in_session(self, session_id: int, item_in_session: int) -> Optional[SongPlay]:
+        """
+        Query 1: Get song details by sessionId and itemInSession.
+
+        Args:
+            session_id: Session identifier
+            item_in_session: Position of the item in the session
+
+        Returns:
+            Song details, or None if no such item exists
+        """
+        return await self._cached("song_in_session", (session_id, item_in_session))
+
+    async def user_session_history(self, session_id: int, user_id: int) -> List[SessionSong]:
+        """
+        Query 2: Get a user's session history sorted by itemInSession.
+
+        Args:
+            session_id: Session identifier
+            user_id: User identifier
+
+        Returns:
+            Songs played in the session, in order
+        """
+        return await self._cached("user_session_history", (session_id, user_id))
+
+    async def song_listeners(self, song: str) -> List[Listener]:
+        """
+        Query 3: Get all users who listened to a specific song.
+
+        Args:
+            song: Song title
+
+        Returns:
+            Users who listened to the song
+        """
+        return await self._cached("song_listeners", (song,))
+
+    def invalidate(self):
+        """Drop every cached result, e.g. after new data is loaded."""
+        self.cache.invalidate()
@@ -1,10 +1,103 @@
 """Cassandra connection management."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from cassandra.cluster import Cluster, Session
+from cassandra import ConsistencyLevel
+from cassandra.cluster import EXEC_PROFILE_DEFAULT, Cluster, ExecutionProfile, Session
+from cassandra.connection import locally_supported_compressions
+from cassandra.policies import DCAwareRoundRobinPolicy, HostDistance, TokenAwarePolicy
 from loguru import logger
 
+# Driver defaults applied when config/config.yaml has no cassandra.driver entry
+DEFAULT_DRIVER_SETTINGS: Dict[str, Any] = {
+    "local_dc": None,
+    "used_hosts_per_remote_dc": 0,
+    "token_aware": True,
+    "shuffle_replicas": True,
+    "compression": "lz4",
+    "protocol_version": None,
+    "request_timeout": 10.0,
+    "connect_timeout": 5.0,
+    "consistency": "LOCAL_ONE",
+    "executor_threads": 2,
+    "pool": {},
+}
+
+# Pool setters of the driver; they only apply to protocol versions 1 and 2
+_POOL_SETTERS = {
+    "core_connections_per_host": "set_core_connections_per_host",
+    "max_connections_per_host": "set_max_connections_per_host",
+    "max_requests_per_connection": "set_max_requests_per_connection",
+}
+
+
+def _compression(setting: Any) -> Any:
+    """Resolve the compression setting against the codecs installed locally."""
+    if setting in (None, False):
+        return False
+    if setting is True or setting in locally_supported_compressions:
+        return setting
+
+    logger.warning(
+        f"Compression '{setting}' is not installed (pip install {setting}); "
+        f"using the best available of {list(locally_supported_compressions) or 'none'}"
+    )
+    return True
+
+
+def cluster_options(settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build ``Cluster`` keyword arguments from driver settings.
+
+    The default execution profile routes each request to a replica of its
+    partition (token-aware) within the local data center (DC-aware), with
+    the configured consistency level and request timeout.
+
+    Args:
+        settings: ``cassandra.driver`` configuration, merged over
+            ``DEFAULT_DRIVER_SETTINGS``
+
+    Returns:
+        Keyword arguments for ``cassandra.cluster.Cluster``
+
+    Raises:
+        ValueError: If the consistency level is unknown
+    """
+    settings = {**DEFAULT_DRIVER_SETTINGS, **(settings or {})}
+
+    consistency = str(settings["consistency"]).upper()
+    if consistency not in ConsistencyLevel.name_to_value:
+        logger.error(f"Unknown consistency level: {settings['consistency']}")
+        raise ValueError(
+            f"Unknown consistency level '{settings['consistency']}', "
+            f"expected one of {list(ConsistencyLevel.name_to_value)}"
+        )
+
+    load_balancing = DCAwareRoundRobinPolicy(
+        local_dc=settings["local_dc"],
+        used_hosts_per_remote_dc=settings["used_hosts_per_remote_dc"],
+    )
+    if settings["token_aware"]:
+        load_balancing = TokenAwarePolicy(
+            load_balancing, shuffle_replicas=settings["shuffle_replicas"]
+        )
+
+    profile = ExecutionProfile(
+        load_balancing_policy=load_balancing,
+        consistency_level=ConsistencyLevel.name_to_value[consistency],
+        request_timeout=settings["request_timeout"],
+    )
+
+    options: Dict[str, Any] = {
+        "execution_profiles": {EXEC_PROFILE_DEFAULT: profile},
+        "compression": _compression(settings["compression"]),
+        "connect_timeout": settings["connect_timeout"],
+        "executor_threads": settings["executor_threads"],
+    }
+    if settings["protocol_version"]:
+        options["protocol_version"] = settings["protocol_version"]
+    return options
+
 
 class CassandraConnection:
     """
@@ -15,7 +108,13 @@ class CassandraConnection:
             session.execute("SELECT * FROM table")
     """
 
-    def __init__(self, hosts: List[str], port: int = 9042, keyspace: Optional[str] = None):
+    def __init__(
+        self,
+        hosts: List[str],
+        port: int = 9042,
+        keyspace: Optional[str] = None,
+        driver: Optional[Dict[str, Any]] = None,
+    ):
         """
         Initialize Cassandra connection.
 
@@ -23,10 +122,13 @@ class CassandraConnection:
             hosts: List of Cassandra host addresses
             port: Cassandra port (default: 9042)
             keyspace: Keyspace to use (optional)
+            driver: Load balancing, compression, protocol, timeout, consistency
+                and pool settings (see ``DEFAULT_DRIVER_SETTINGS``)
         """
         self.hosts = hosts
         self.port = port
         self.keyspace = keyspace
+        self.driver = driver or {}
         self.cluster: Optional[Cluster] = None
         self.session: Optional[Session] = None
 
@@ -42,7 +144,8 @@ class CassandraConnection:
         """
         try:
             logger.info(f"Connecting to Cassandra at {self.hosts}:{self.port}")
-            self.cluster = Cluster(self.hosts, port=self.port)
+            self.cluster = Cluster(self.hosts, port=self.port, **cluster_options(self.driver))
+            self._configure_pool(self.cluster)
             self.session = self.cluster.connect()
 
             if self.keyspace:
@@ -56,6 +159,37 @@ class CassandraConnection:
             logger.error(f"Failed to connect to Cassandra: {e}")
             raise
 
+    def _configure_pool(self, cluster: Cluster):
+        """
+        Apply per-host connection pool limits for local hosts.
+
+        Protocol v3 and later multiplex up to 32768 requests over one
+        connection per host, so the limits only apply to versions 1 and 2.
+
+        Args:
+            cluster: Cluster not yet connected
+        """
+        pool = self.driver.get("pool") or {}
+        if not pool:
+            return
+
+        if cluster.protocol_version >= 3:
+            logger.info(
+                f"Ignoring connection pool settings {pool}: "
+                f"protocol v{cluster.protocol_version} uses one connection per host"
+            )
+            return
+
+        unknown = set(pool) - set(_POOL_SETTERS)
+        if unknown:
+            logger.error(f"Unknown connection pool settings: {sorted(unknown)}")
+            raise ValueError(
+                f"Unknown pool settings {sorted(unknown)}, expected {list(_POOL_SETTERS)}"
+            )
+
+        for key, value in pool.items():
+            getattr(cluster, _POOL_SETTERS[key])(HostDistance.LOCAL, value)
+
     def close(self):
         """Close Cassandra connections gracefully."""
         if self.session:
@@ -0,0 +1,696 @@
+"""In-process stand-in for a Cassandra cluster with latency and failure injection."""
+
+import heapq
+import itertools
+import random
+import re
+import threading
+import time
+from collections import namedtuple
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from cassandra import InvalidRequest, OperationTimedOut
+from cassandra.protocol import OverloadedErrorMessage
+from cassandra.query import BatchStatement, SimpleStatement
+from loguru import logger
+
+# Seconds of latency for one request, drawn from the session's random source
+LatencyModel = Callable[[random.Random], float]
+
+
+def constant_latency(ms: float) -> LatencyModel:
+    """
+    Latency model returning the same delay for every request.
+
+    Args:
+        ms: Delay in milliseconds
+
+    Returns:
+        Latency model
+    """
+    return lambda rng: ms / 1000
+
+
+def uniform_latency(low_ms: float, high_ms: float) -> LatencyModel:
+    """
+    Latency model drawing delays uniformly between two bounds.
+
+    Args:
+        low_ms: Smallest delay in milliseconds
+        high_ms: Largest delay in milliseconds
+
+    Returns:
+        Latency model
+    """
+    return lambda rng: rng.uniform(low_ms, high_ms) / 1000
+
+
+def lognormal_latency(median_ms: float, sigma: float = 0.5) -> LatencyModel:
+    """
+    Latency model with a long right tail, like real coordinator latencies.
+
+    Args:
+        median_ms: Median delay in milliseconds
+        sigma: Spread of the underlying normal distribution
+
+    Returns:
+        Latency model
+    """
+    return lambda rng: median_ms * rng.lognormvariate(0, sigma) / 1000
+
+
+class FakePreparedStatement(SimpleStatement):
+    """
+    Prepared statement of a fake session.
+
+    Placeholders are rewritten to ``%s`` so the statement can also be added to
+    a real ``BatchStatement``, which then binds the values as CQL literals.
+    """
+
+    def __init__(self, query_string: str):
+        super().__init__(query_string.replace("?", "%s"))
+        self.prepared_query = query_string
+        self.plan: Optional["_Plan"] = None
+
+
+class FakeTable:
+    """Rows of one table, keyed by partition key and then clustering key."""
+
+    def __init__(
+        self,
+        name: str,
+        columns: List[str],
+        partition_key: List[str],
+        clustering_key: List[str],
+        descending: Sequence[str] = (),
+    ):
+        self.name = name
+        self.columns = columns
+        self.partition_key = partition_key
+        self.clustering_key = clustering_key
+        self.descending = set(descending)
+        self.partitions: Dict[Tuple[Any, ...], Dict[Tuple[Any, ...], Dict[str, Any]]] = {}
+
+    def upsert(self, values: Dict[str, Any]):
+        """Insert a row or update the columns of an existing one."""
+        missing = [c for c in self.partition_key + self.clustering_key if values.get(c) is None]
+        if missing:
+            raise InvalidRequest(f"Missing primary key column(s) {missing} for {self.name}")
+
+        unknown = set(values) - set(self.columns)
+        if unknown:
+            raise InvalidRequest(f"Undefined column name(s) {sorted(unknown)} in {self.name}")
+
+        partition = self.partitions.setdefault(tuple(values[c] for c in self.partition_key), {})
+        partition.setdefault(tuple(values[c] for c in self.clustering_key), {}).update(values)
+
+    def select(self, conditions: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Get rows matching equality conditions, in clustering order."""
+        if all(c in conditions for c in self.partition_key):
+            key = tuple(conditions[c] for c in self.partition_key)
+            partitions = [self.partitions.get(key, {})]
+        else:
+            partitions = list(self.partitions.values())
+
+        rows = []
+        for partition in partitions:
+            matching = [
+                row
+                for row in partition.values()
+                if all(row.get(c) == v for c, v in conditions.items())
+            ]
+            for column in reversed(self.clustering_key):
+                matching.sort(key=lambda row: row[column], reverse=column in self.descending)
+            rows.extend(matching)
+        return rows
+
+    def __len__(self) -> int:
+        return sum(len(partition) for partition in self.partitions.values())
+
+
+class _Plan(NamedTuple):
+    """Parsed form of a statement."""
+
+    kind: str
+    table: Optional[str] = None
+    columns: Tuple[str, ...] = ()
+    values: Tuple[str, ...] = ()
+    conditions: Tuple[Tuple[str, str], ...] = ()
+    limit: Optional[str] = None
+    definition: Optional[FakeTable] = None
+
+
+_INSERT = re.compile(
+    r"^\s*INSERT\s+INTO\s+([\w.]+)\s*\(([^)]*)\)\s*VALUES\s*\((.*)\)[^)]*$", re.I | re.S
+)
+_SELECT = re.compile(
+    r"^\s*SELECT\s+(.+?)\s+FROM\s+([\w.]+)(?:\s+WHERE\s+(.+?))?"
+    r"(?:\s+LIMIT\s+(\S+))?(?:\s+ALLOW\s+FILTERING)?\s*;?\s*$",
+    re.I | re.S,
+)
+_CREATE_TABLE = re.compile(
+    r"^\s*CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?([\w.]+)\s*\((.*?)\)"
+    r"\s*(?:WITH\s+(.*?))?\s*;?\s*$",
+    re.I | re.S,
+)
+_CLUSTERING_ORDER = re.compile(r"CLUSTERING\s+ORDER\s+BY\s*\(([^)]*)\)", re.I)
+_DROP_TABLE = re.compile(r"^\s*DROP\s+TABLE\s+(IF\s+EXISTS\s+)?([\w.]+)\s*;?\s*$", re.I)
+_TRUNCATE = re.compile(r"^\s*TRUNCATE\s+(?:TABLE\s+)?([\w.]+)\s*;?\s*$", re.I)
+_USE = re.compile(r"^\s*USE\s+(\w+)\s*;?\s*$", re.I)
+_KEYSPACE = re.compile(r"^\s*(CREATE|ALTER|DROP)\s+KEYSPACE\b", re.I)
+_LITERAL = re.compile(r"\s*('(?:[^']|'')*'|[^,\s]+)\s*(?:,|$)")
+_PLACEHOLDERS = {"?", "%s"}
+
+
+def _identifier(name: str) -> str:
+    """Lower-case an unquoted identifier and drop any keyspace prefix."""
+    return name.strip().split(".")[-1].lower()
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split on commas outside parentheses."""
+    parts, depth, current = [], 0, []
+    for char in text:
+        if char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        current.append(char)
+    parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+
+def _parse_literal(token: str) -> Any:
+    """Convert a CQL literal into a Python value."""
+    if token.startswith("'"):
+        return token[1:-1].replace("''", "'")
+    lowered = token.lower()
+    if lowered == "null":
+        return None
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+
+def _parse_create_table(match: "re.Match") -> FakeTable:
+    """Build a table definition from a CREATE TABLE statement."""
+    columns, partition_key, clustering_key = [], [], []
+
+    for part in _split_top_level(match.group(2)):
+        primary = re.match(r"PRIMARY\s+KEY\s*\((.*)\)$", part, re.I | re.S)
+        if primary:
+            keys = _split_top_level(primary.group(1))
+            if keys[0].startswith("("):
+                partition_key = [_identifier(c) for c in keys[0].strip("()").split(",")]
+            else:
+                partition_key = [_identifier(keys[0])]
+            clustering_key = [_identifier(c) for c in keys[1:]]
+            continue
+
+        name = _identifier(part.split()[0])
+        columns.append(name)
+        if re.search(r"\bPRIMARY\s+KEY\b", part, re.I):
+            partition_key = [name]
+
+    descending = []
+    order = _CLUSTERING_ORDER.search(match.group(3) or "")
+    if order:
+        for clause in order.group(1).split(","):
+            column, _, direction = clause.strip().partition(" ")
+            if direction.strip().upper() == "DESC":
+                descending.append(_identifier(column))
+
+    return FakeTable(
+        _identifier(match.group(1)), columns, partition_key, clustering_key, descending
+    )
+
+
+def _parse_insert(match: "re.Match") -> _Plan:
+    """Build the plan of an INSERT statement."""
+    columns = tuple(_identifier(c) for c in match.group(2).split(","))
+    values = tuple(_LITERAL.findall(match.group(3)))
+    if len(values) != len(columns):
+        raise InvalidRequest(
+            f"Expected {len(columns)} values, got {len(values)}: {match.string.strip()}"
+        )
+    return _Plan("insert", _identifier(match.group(1)), columns, values)
+
+
+def _parse_select(match: "re.Match") -> _Plan:
+    """Build the plan of a SELECT statement with equality conditions."""
+    selected = match.group(1).strip()
+    columns = () if selected == "*" else tuple(_identifier(c) for c in selected.split(","))
+
+    conditions = []
+    for condition in re.split(r"\s+AND\s+", match.group(3) or "", flags=re.I):
+        if condition:
+            column, _, value = condition.partition("=")
+            conditions.append((_identifier(column), value.strip()))
+
+    return _Plan(
+        "select", _identifier(match.group(2)), columns, (), tuple(conditions), match.group(4)
+    )
+
+
+def _parse_table_definition(match: "re.Match") -> _Plan:
+    """Build the plan of a CREATE TABLE statement."""
+    definition = _parse_create_table(match)
+    return _Plan("create_table", definition.name, definition=definition)
+
+
+# Statement patterns and the functions turning their matches into plans
+_PARSERS: List[Tuple["re.Pattern", Callable[["re.Match"], _Plan]]] = [
+    (_INSERT, _parse_insert),
+    (_SELECT, _parse_select),
+    (_CREATE_TABLE, _parse_table_definition),
+    (_DROP_TABLE, lambda match: _Plan("drop_table", _identifier(match.group(2)))),
+    (_TRUNCATE, lambda match: _Plan("truncate", _identifier(match.group(1)))),
+    (_USE, lambda match: _Plan("use", match.group(1))),
+    (_KEYSPACE, lambda match: _Plan("keyspace")),
+]
+
+
+def _parse(query: str) -> _Plan:
+    """
+    Parse the subset of CQL used by the project.
+
+    Args:
+        query: CQL statement
+
+    Returns:
+        Parsed statement
+
+    Raises:
+        InvalidRequest: If the statement isn't supported
+    """
+    for pattern, build in _PARSERS:
+        match = pattern.match(query)
+        if match:
+            return build(match)
+
+    raise InvalidRequest(f"Statement not supported by the fake session: {query.strip()}")
+
+
+class FakeResponseFuture:
+    """Asynchronous result of a fake request, mirroring ``ResponseFuture``."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._rows: List[Any] = []
+        self._error: Optional[BaseException] = None
+        self._callbacks: List[Tuple[Callable, tuple, dict]] = []
+        self._errbacks: List[Tuple[Callable, tuple, dict]] = []
+
+    def result(self, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Wait for the request to complete.
+
+        Returns:
+            Result rows
+
+        Raises:
+            Exception: Error the request completed with
+        """
+        if not self._done.wait(timeout):
+            raise OperationTimedOut("Timed out waiting for the fake response")
+        if self._error is not None:
+            raise self._error
+        return self._rows
+
+    def add_callback(self, fn: Callable, *args, **kwargs):
+        """Call ``fn(rows, *args, **kwargs)`` once the request succeeds."""
+        self._add(self._callbacks, fn, args, kwargs, success=True)
+
+    def add_errback(self, fn: Callable, *args, **kwargs):
+        """Call ``fn(error, *args, **kwargs)`` once the request fails."""
+        self._add(self._errbacks, fn, args, kwargs, success=False)
+
+    def add_callbacks(
+        self,
+        callback: Callable,
+        errback: Callable,
+        callback_args: tuple = (),
+        callback_kwargs: Optional[dict] = None,
+        errback_args: tuple = (),
+        errback_kwargs: Optional[dict] = None,
+    ):
+        """Register a success and an error callback at once."""
+        self.add_callback(callback, *callback_args, **(callback_kwargs or {}))
+        self.add_errback(errback, *errback_args, **(errback_kwargs or {}))
+
+    def _add(self, callbacks: list, fn: Callable, args: tuple, kwargs: dict, success: bool):
+        """Register a callback, running it right away if the request already completed."""
+        with self._lock:
+            if not self._done.is_set():
+                callbacks.append((fn, args, kwargs))
+                return
+        if success and self._error is None:
+            fn(self._rows, *args, **kwargs)
+        elif not success and self._error is not None:
+            fn(self._error, *args, **kwargs)
+
+    def _complete(self, rows: List[Any], error: Optional[BaseException]):
+        """Store the outcome and run the matching callbacks."""
+        with self._lock:
+            self._rows, self._error = rows, error
+            self._done.set()
+            callbacks = self._callbacks if error is None else self._errbacks
+        outcome = rows if error is None else error
+        for fn, args, kwargs in callbacks:
+            fn(outcome, *args, **kwargs)
+
+
+class FakeSession:
+    """
+    In-memory session implementing the subset of the driver API the project uses.
+
+    ``execute``, ``execute_async``, ``prepare``, ``set_keyspace`` and UNLOGGED
+    batches work against in-memory tables keyed by each table's primary key.
+    Requests complete on a background thread after a delay drawn from
+    ``latency``, like responses arriving on the driver's event loop. Requests
+    beyond ``max_in_flight`` are rejected as overloaded, and timeouts or
+    overloads can be injected at random rates or one by one with
+    ``inject_error``. Failed requests aren't applied. Keyspaces only affect
+    name resolution: every table lives in one namespace.
+
+    Usage:
+        session = FakeSession(latency=lognormal_latency(2), max_in_flight=256)
+        loader = EventDataLoader(session, "events.csv", batch_size=100)
+    """
+
+    def __init__(
+        self,
+        latency: Optional[LatencyModel] = None,
+        max_in_flight: Optional[int] = None,
+        timeout_rate: float = 0.0,
+        overload_rate: float = 0.0,
+        seed: int = 0,
+        tables: Optional[Dict[str, FakeTable]] = None,
+    ):
+        """
+        Initialize fake session.
+
+        Args:
+            latency: Latency model of a request (default: complete immediately)
+            max_in_flight: Requests in flight above which new ones are rejected (optional)
+            timeout_rate: Probability of a request failing with OperationTimedOut
+            overload_rate: Probability of a request failing with OverloadedErrorMessage
+            seed: Seed of the random source for latencies and injected failures
+            tables: Table storage shared with other sessions of a FakeCluster (optional)
+        """
+        self.latency = latency
+        self.max_in_flight = max_in_flight
+        self.timeout_rate = timeout_rate
+        self.overload_rate = overload_rate
+        self.tables: Dict[str, FakeTable] = {} if tables is None else tables
+        self.keyspace: Optional[str] = None
+        self.counters: Dict[str, int] = {
+            "requests": 0,
+            "statements": 0,
+            "batches": 0,
+            "timeouts": 0,
+            "overloads": 0,
+            "rejected": 0,
+            "peak_in_flight": 0,
+        }
+
+        self._random = random.Random(seed)
+        self._injected: List[BaseException] = []
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._data_lock = threading.RLock()
+        self._pending: List[Tuple[float, int, FakeResponseFuture, Callable, Any]] = []
+        self._sequence = itertools.count()
+        self._wakeup = threading.Condition(self._lock)
+        self._reactor: Optional[threading.Thread] = None
+        self._shutdown = False
+
+    def prepare(self, query: str) -> FakePreparedStatement:
+        """
+        Prepare a statement, validating that it can be executed.
+
+        Args:
+            query: CQL with ``?`` placeholders
+
+        Returns:
+            Prepared statement
+        """
+        statement = FakePreparedStatement(query)
+        statement.plan = _parse(query)
+        return statement
+
+    def set_keyspace(self, keyspace: str):
+        """Set the default keyspace."""
+        self.keyspace = keyspace
+
+    def execute(self, query, parameters: Optional[Sequence[Any]] = None, **kwargs) -> List[Any]:
+        """
+        Execute a statement and wait for its rows.
+
+        Args:
+            query: CQL string, simple, prepared or batch statement
+            parameters: Values bound to the placeholders
+
+        Returns:
+            Result rows
+        """
+        return self.execute_async(query, parameters).result()
+
+    def execute_async(
+        self, query, parameters: Optional[Sequence[Any]] = None, **kwargs
+    ) -> FakeResponseFuture:
+        """
+        Start a statement, completing it after the modelled latency.
+
+        Args:
+            query: CQL string, simple, prepared or batch statement
+            parameters: Values bound to the placeholders
+
+        Returns:
+            Future of the result rows
+        """
+        future = FakeResponseFuture()
+        work, statements = self._work(query, parameters)
+
+        with self._lock:
+            self.counters["requests"] += 1
+            self.counters["statements"] += statements
+            self.counters["batches"] += isinstance(query, BatchStatement)
+            error = self._draw_error()
+            if error is None and self.max_in_flight and self._in_flight >= self.max_in_flight:
+                self.counters["rejected"] += 1
+                future._complete([], OverloadedErrorMessage(0x1001, "Too many requests", {}))
+                return future
+
+            delay = self.latency(self._random) if self.latency else 0.0
+            self._in_flight += 1
+            self.counters["peak_in_flight"] = max(self.counters["peak_in_flight"], self._in_flight)
+
+            if delay > 0:
+                self._start_reactor()
+                due = time.perf_counter() + delay
+                heapq.heappush(self._pending, (due, next(self._sequence), future, work, error))
+                self._wakeup.notify()
+                return future
+
+        self._finish(future, work, error)
+        return future
+
+    def inject_error(self, error: BaseException, count: int = 1):
+        """
+        Fail the next ``count`` requests with ``error``.
+
+        Args:
+            error: Exception the requests complete with
+            count: Number of requests to fail
+        """
+        with self._lock:
+            self._injected.extend([error] * count)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get request counters.
+
+        Returns:
+            Requests, statements, batches, injected failures and peak in-flight requests
+        """
+        return {**self.counters, "in_flight": self._in_flight}
+
+    def shutdown(self):
+        """Stop the background thread, failing requests still pending."""
+        with self._lock:
+            self._shutdown = True
+            pending, self._pending = self._pending, []
+            self._wakeup.notify()
+
+        for _, _, future, _, _ in pending:
+            future._complete([], OperationTimedOut("Session shut down"))
+
+    def _draw_error(self) -> Optional[BaseException]:
+        """Pick the injected failure of a request, if any. Caller holds the lock."""
+        if self._injected:
+            error = self._injected.pop(0)
+        elif self.timeout_rate and self._random.random() < self.timeout_rate:
+            error = OperationTimedOut("Injected timeout")
+        elif self.overload_rate and self._random.random() < self.overload_rate:
+            error = OverloadedErrorMessage(0x1001, "Injected overload", {})
+        else:
+            return None
+
+        kind = "overloads" if isinstance(error, OverloadedErrorMessage) else "timeouts"
+        self.counters[kind] += 1
+        return error
+
+    def _work(
+        self, query, parameters: Optional[Sequence[Any]]
+    ) -> Tuple[Callable[[], List[Any]], int]:
+        """Resolve a statement into the function applying it and its statement count."""
+        if isinstance(query, BatchStatement):
+            statements = [
+                (_parse(statement), params)
+                for _, statement, params in query._statements_and_parameters
+            ]
+            return (lambda: self._run_batch(statements)), len(statements)
+
+        if isinstance(query, FakePreparedStatement):
+            plan = query.plan or _parse(query.prepared_query)
+        else:
+            plan = _parse(getattr(query, "query_string", query))
+
+        return (lambda: self._run(plan, parameters or ())), 1
+
+    def _run_batch(self, statements: List[Tuple[_Plan, Sequence[Any]]]) -> List[Any]:
+        """Apply every statement of a batch under one lock."""
+        with self._data_lock:
+            for plan, params in statements:
+                self._run(plan, params)
+        return []
+
+    def _run(self, plan: _Plan, parameters: Sequence[Any]) -> List[Any]:
+        """Apply one parsed statement."""
+        params = iter(parameters)
+
+        def value(token: str) -> Any:
+            return next(params) if token in _PLACEHOLDERS else _parse_literal(token)
+
+        with self._data_lock:
+            if plan.kind == "insert":
+                row = {
+                    column: value(token)
+                    for column, token in zip(plan.columns, plan.values, strict=True)
+                }
+                self._table(plan.table).upsert(row)
+            elif plan.kind == "select":
+                conditions = {column: value(token) for column, token in plan.conditions}
+                table = self._table(plan.table)
+                rows = table.select(conditions)
+                if plan.limit is not None:
+                    rows = rows[: int(value(plan.limit))]
+                columns = plan.columns or tuple(table.columns)
+                row_type = namedtuple("Row", columns)
+                return [row_type(*(row.get(c) for c in columns)) for row in rows]
+            elif plan.kind == "create_table":
+                self.tables.setdefault(plan.table, plan.definition)
+            elif plan.kind == "drop_table":
+                self.tables.pop(plan.table, None)
+            elif plan.kind == "truncate":
+                self._table(plan.table).partitions.clear()
+            elif plan.kind == "use":
+                self.keyspace = plan.table
+        return []
+
+    def _table(self, name: str) -> FakeTable:
+        """Get a table definition, failing like Cassandra when it doesn't exist."""
+        if name not in self.tables:
+            raise InvalidRequest(f"Table '{name}' does not exist")
+        return self.tables[name]
+
+    def _finish(self, future: FakeResponseFuture, work: Callable, error: Optional[BaseException]):
+        """Apply a request and complete its future."""
+        rows: List[Any] = []
+        if error is None:
+            try:
+                rows = work()
+            except Exception as e:
+                error = e
+
+        with self._lock:
+            self._in_flight -= 1
+        future._complete(rows, error)
+
+    def _start_reactor(self):
+        """Start the completion thread on first use. Caller holds the lock."""
+        if self._reactor is None:
+            self._reactor = threading.Thread(
+                target=self._run_reactor, name="fake-cassandra", daemon=True
+            )
+            self._reactor.start()
+
+    def _run_reactor(self):
+        """Complete pending requests as their latency elapses."""
+        while True:
+            with self._lock:
+                while not self._shutdown:
+                    if self._pending:
+                        wait = self._pending[0][0] - time.perf_counter()
+                        if wait <= 0:
+                            break
+                        self._wakeup.wait(wait)
+                    else:
+                        self._wakeup.wait()
+                if self._shutdown:
+                    return
+                _, _, future, work, error = heapq.heappop(self._pending)
+
+            self._finish(future, work, error)
+
+
+class FakeCluster:
+    """
+    Cluster handing out fake sessions that share their tables.
+
+    Usage:
+        cluster = FakeCluster(latency=constant_latency(1))
+        session = cluster.connect("sparkify")
+    """
+
+    def __init__(self, contact_points: Optional[List[str]] = None, **session_options: Any):
+        """
+        Initialize fake cluster.
+
+        Args:
+            contact_points: Ignored, accepted for compatibility with ``Cluster``
+            **session_options: Options of every FakeSession created by ``connect``
+        """
+        self.contact_points = contact_points or ["127.0.0.1"]
+        self.session_options = session_options
+        self.tables: Dict[str, FakeTable] = {}
+        self.sessions: List[FakeSession] = []
+
+    def connect(self, keyspace: Optional[str] = None) -> FakeSession:
+        """
+        Create a session.
+
+        Args:
+            keyspace: Default keyspace of the session (optional)
+
+        Returns:
+            Fake session
+        """
+        session = FakeSession(tables=self.tables, **self.session_options)
+        if keyspace:
+            session.set_keyspace(keyspace)
+        self.sessions.append(session)
+        logger.debug(f"Fake Cassandra session created ({len(self.sessions)} open)")
+        return session
+
+    def shutdown(self):
+        """Shut down every session."""
+        for session in self.sessions:
+            session.shutdown()
+        self.sessions.clear()
@@ -0,0 +1,154 @@
+"""Session stand-in that counts writes without sending them anywhere."""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class NullPreparedStatement:
+    """
+    Prepared statement of a null session.
+
+    Placeholders are rewritten to ``%s`` like ``FakePreparedStatement``, so
+    the statement can also be added to a real ``BatchStatement``.
+    """
+
+    # Statement attributes BatchStatement.add reads
+    keyspace = None
+    routing_key = None
+    custom_payload = None
+
+    def __init__(self, query_string: str):
+        self.query_string = query_string.replace("?", "%s")
+        self.prepared_query = query_string
+
+
+class NullBatchStatement:
+    """
+    Batch of a null session, built instead of a driver ``BatchStatement``.
+
+    It only keeps what ``NullSession`` counts, so dry runs with batching on
+    don't import the driver.
+    """
+
+    batch_type = "UNLOGGED"
+
+    def __init__(self):
+        self._statements: List[Tuple[Any, Sequence[Any]]] = []
+
+    def add(self, statement, parameters: Optional[Sequence[Any]] = None):
+        """
+        Add a statement to the batch.
+
+        Args:
+            statement: Prepared statement
+            parameters: Values bound to its placeholders
+        """
+        self._statements.append((statement, parameters))
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+
+class _DoneFuture:
+    """Response of a null request, already completed without rows."""
+
+    __slots__ = ()
+
+    def result(self, timeout: Optional[float] = None) -> List[Any]:
+        """Get the (empty) result rows."""
+        return []
+
+    def add_callbacks(
+        self,
+        callback: Callable,
+        errback: Callable,
+        callback_args: tuple = (),
+        callback_kwargs: Optional[dict] = None,
+        errback_args: tuple = (),
+        errback_kwargs: Optional[dict] = None,
+    ):
+        """Run the success callback right away."""
+        callback([], *callback_args, **(callback_kwargs or {}))
+
+
+_DONE = _DoneFuture()
+
+
+class NullSession:
+    """
+    Accept every statement and count it, like writing to ``/dev/null``.
+
+    Used by dry runs: the loader prepares, batches and submits its writes as
+    usual, so extraction, transformation and statement building cost what
+    they cost in a real run, while no cluster or driver connection is needed.
+
+    Usage:
+        session = NullSession()
+        loader = EventDataLoader(session, "data/events.csv", batch_size=1000)
+        loader.load_all_tables()
+        session.stats()  # {"requests": ..., "statements": ..., "batches": ...}
+    """
+
+    def __init__(self):
+        """Initialize session."""
+        self.keyspace: Optional[str] = None
+        self.counters: Dict[str, int] = {"requests": 0, "statements": 0, "batches": 0}
+
+    def prepare(self, query: str) -> NullPreparedStatement:
+        """
+        Prepare a statement without contacting a cluster.
+
+        Args:
+            query: CQL with ``?`` placeholders
+
+        Returns:
+            Prepared statement
+        """
+        return NullPreparedStatement(query)
+
+    def set_keyspace(self, keyspace: str):
+        """Set the default keyspace."""
+        self.keyspace = keyspace
+
+    def execute(self, query, parameters: Optional[Sequence[Any]] = None, **kwargs) -> List[Any]:
+        """
+        Count a statement and return no rows.
+
+        Args:
+            query: CQL string, simple, prepared or batch statement
+            parameters: Values bound to the placeholders
+
+        Returns:
+            Empty result rows
+        """
+        return self.execute_async(query, parameters).result()
+
+    def execute_async(self, query, parameters: Optional[Sequence[Any]] = None, **kwargs):
+        """
+        Count a statement and complete it immediately.
+
+        Args:
+            query: CQL string, simple, prepared or batch statement
+            parameters: Values bound to the placeholders
+
+        Returns:
+            Completed future without rows
+        """
+        self.counters["requests"] += 1
+        if getattr(query, "batch_type", None) is not None:
+            self.counters["batches"] += 1
+            self.counters["statements"] += len(query)
+        else:
+            self.counters["statements"] += 1
+        return _DONE
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get request counters.
+
+        Returns:
+            Requests sent, statements they held and batches among them
+        """
+        return dict(self.counters)
+
+    def shutdown(self):
+        """Nothing to release."""
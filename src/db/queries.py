@@ -0,0 +1,191 @@
+"""Cached, prepared reads for the three query access patterns."""
+
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from cassandra.cluster import Session
+from loguru import logger
+
+from src.utils.cache import TTLCache
+
+
+class SongPlay(NamedTuple):
+    """Query 1 result: song played at an item of a session."""
+
+    artist: str
+    song: str
+    length: float
+
+
+class SessionSong(NamedTuple):
+    """Query 2 result: song in a user's session, ordered by itemInSession."""
+
+    artist: str
+    song: str
+    firstName: str
+    lastName: str
+
+
+class Listener(NamedTuple):
+    """Query 3 result: user who listened to a song."""
+
+    firstName: str
+    lastName: str
+
+
+# SELECT statements per access pattern, prepared once per session
+SELECT_QUERIES = {
+    "song_in_session": """
+        SELECT artist, song, length FROM session_item
+        WHERE sessionId = ? AND itemInSession = ?
+    """,
+    "user_session_history": """
+        SELECT artist, song, firstName, lastName FROM user_session
+        WHERE sessionId = ? AND userId = ?
+    """,
+    "song_listeners": """
+        SELECT firstName, lastName FROM user_song
+        WHERE song = ?
+    """,
+}
+
+
+def to_result(query: str, rows: List[tuple]) -> Any:
+    """
+    Convert result rows to the result type of a query.
+
+    Args:
+        query: Name of the query in ``SELECT_QUERIES``
+        rows: Result rows
+
+    Returns:
+        A ``SongPlay`` or None for query 1, otherwise a list of typed rows
+    """
+    if query == "song_in_session":
+        return SongPlay(*rows[0]) if rows else None
+    if query == "user_session_history":
+        return [SessionSong(*row) for row in rows]
+    return [Listener(*row) for row in rows]
+
+
+class EventQueryService:
+    """
+    Typed reads for the three query tables behind an LRU cache with TTL.
+
+    Usage:
+        queries = EventQueryService(session)
+        play = queries.song_in_session(338, 4)
+        history = queries.user_session_history(182, 10)
+        listeners = queries.song_listeners("All Hands Against His Own")
+    """
+
+    def __init__(self, session: Session, cache_size: int = 1024, ttl_seconds: float = 60.0):
+        """
+        Initialize query service.
+
+        Args:
+            session: Active Cassandra session using the project keyspace
+            cache_size: Maximum number of cached query results
+            ttl_seconds: Seconds a cached result stays valid
+        """
+        self.session = session
+        self.cache = TTLCache(max_size=cache_size, ttl_seconds=ttl_seconds)
+        self._prepared: Dict[str, Any] = {}
+
+    def _execute(self, query: str, params: tuple) -> List[tuple]:
+        """
+        Run a prepared SELECT, preparing it on first use.
+
+        Args:
+            query: Name of the query in ``SELECT_QUERIES``
+            params: Values bound to the query
+
+        Returns:
+            Result rows
+        """
+        if query not in self._prepared:
+            self._prepared[query] = self.session.prepare(SELECT_QUERIES[query])
+
+        try:
+            return list(self.session.execute(self._prepared[query], params))
+        except Exception as e:
+            logger.error(f"Query {query} failed for {params}: {e}")
+            raise
+
+    def _fetch(self, query: str, params: tuple) -> Any:
+        """Run a query uncached and convert rows to its result type."""
+        return to_result(query, self._execute(query, params))
+
+    def _cached(self, query: str, params: tuple) -> Any:
+        """Get a query result from the cache, fetching it on a miss."""
+        return self.cache.get_or_load((query, params), lambda: self._fetch(query, params))
+
+    def song_in_session(self, session_id: int, item_in_session: int) -> Optional[SongPlay]:
+        """
+        Query 1: Get song details by sessionId and itemInSession.
+
+        Args:
+            session_id: Session identifier
+            item_in_session: Position of the item in the session
+
+        Returns:
+            Song details, or None if no such item exists
+        """
+        return self._cached("song_in_session", (session_id, item_in_session))
+
+    def user_session_history(self, session_id: int, user_id: int) -> List[SessionSong]:
+        """
+        Query 2: Get a user's session history sorted by itemInSession.
+
+        Args:
+            session_id: Session identifier
+            user_id: User identifier
+
+        Returns:
+            Songs played in the session, in order
+        """
+        return self._cached("user_session_history", (session_id, user_id))
+
+    def song_listeners(self, song: str) -> List[Listener]:
+        """
+        Query 3: Get all users who listened to a specific song.
+
+        Args:
+            song: Song title
+
+        Returns:
+            Users who listened to the song
+        """
+        return self._cached("song_listeners", (song,))
+
+    def invalidate(self):
+        """Drop every cached result, e.g. after new data is loaded."""
+        self.cache.invalidate()
+        logger.info("Query cache invalidated")
+
+    def prewarm_songs(self, songs: List[str]) -> int:
+        """
+        Fetch listeners of the given songs into the cache.
+
+        Args:
+            songs: Song titles expected to be queried
+
+        Returns:
+            Number of songs fetched
+        """
+        for song in songs:
+            self.cache.put(("song_listeners", (song,)), self._fetch("song_listeners", (song,)))
+        return len(songs)
+
+    def refresh(self) -> int:
+        """
+        Re-fetch every cached result so hot keys stay warm after a load.
+
+        Returns:
+            Number of results refreshed
+        """
+        keys = self.cache.keys()
+        for query, params in keys:
+            self.cache.put((query, params), self._fetch(query, params))
+
+        logger.info(f"Query cache refreshed: {len(keys)} results re-fetched")
+        return len(keys)
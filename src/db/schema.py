@@ -1,8 +1,86 @@
 """Cassandra schema definitions and table creation."""
 
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
 from cassandra.cluster import Session
+from cassandra.metadata import Metadata, TableMetadata
 from loguru import logger
 
+from src.db.tables import TABLE_SPECS, TableSpec
+
+# CREATE TABLE statements per table
+TABLE_QUERIES: Dict[str, str] = {table: spec.create_query() for table, spec in TABLE_SPECS.items()}
+
+
+class TableLayout(NamedTuple):
+    """Expected definition of a table, with names as cluster metadata reports them."""
+
+    columns: Dict[str, str]
+    partition_key: Tuple[str, ...]
+    clustering_key: Tuple[str, ...]
+    descending: Tuple[str, ...] = ()
+
+
+def spec_layout(spec: TableSpec) -> TableLayout:
+    """
+    Get the layout cluster metadata reports for a table spec.
+
+    Args:
+        spec: Table definition
+
+    Returns:
+        Expected columns and keys, with unquoted names lowercased
+    """
+    return TableLayout(
+        {column.name.lower(): column.cql_type for column in spec.columns},
+        partition_key=tuple(name.lower() for name in spec.partition_key),
+        clustering_key=tuple(name.lower() for name in spec.clustering_key),
+        descending=tuple(name.lower() for name in spec.descending),
+    )
+
+
+# Expected layout of each table in TABLE_QUERIES
+TABLE_LAYOUTS: Dict[str, TableLayout] = {
+    table: spec_layout(spec) for table, spec in TABLE_SPECS.items()
+}
+
+
+def table_drift(table: TableMetadata, layout: TableLayout) -> List[str]:
+    """
+    Compare a table's cluster metadata with its expected layout.
+
+    Args:
+        table: Table metadata from the driver
+        layout: Expected columns and keys
+
+    Returns:
+        Human-readable differences; empty when the table matches
+    """
+    problems = []
+    actual = {name: column.cql_type for name, column in table.columns.items()}
+
+    for name, cql_type in layout.columns.items():
+        if name not in actual:
+            problems.append(f"missing column {name} {cql_type}")
+        elif actual[name] != cql_type:
+            problems.append(f"column {name} is {actual[name]}, expected {cql_type}")
+    for name in sorted(actual.keys() - layout.columns.keys()):
+        problems.append(f"unexpected column {name} {actual[name]}")
+
+    keys = {
+        "partition key": (tuple(c.name for c in table.partition_key), layout.partition_key),
+        "clustering key": (tuple(c.name for c in table.clustering_key), layout.clustering_key),
+        "descending clustering columns": (
+            tuple(c.name for c in table.clustering_key if c.is_reversed),
+            layout.descending,
+        ),
+    }
+    for label, (found, expected) in keys.items():
+        if found != expected:
+            problems.append(f"{label} is {found}, expected {expected}")
+
+    return problems
+
 
 class CassandraSchema:
     """Manages Cassandra keyspace and table schemas."""
@@ -36,6 +114,20 @@ class CassandraSchema:
             logger.error(f"Failed to create keyspace '{keyspace}': {e}")
             raise
 
+    def _create_table(self, table: str):
+        """
+        Create a table from ``TABLE_QUERIES`` if it doesn't exist.
+
+        Args:
+            table: Table name
+        """
+        try:
+            self.session.execute(TABLE_QUERIES[table])
+            logger.info(f"Table '{table}' created/verified")
+        except Exception as e:
+            logger.error(f"Failed to create table '{table}': {e}")
+            raise
+
     def create_session_item_table(self):
         """
         Create session_item table for Query 1.
@@ -43,23 +135,7 @@ class CassandraSchema:
         Query: Get song details by sessionId and itemInSession
         Primary Key: (sessionId, itemInSession)
         """
-        query = """
-            CREATE TABLE IF NOT EXISTS session_item (
-                sessionId int,
-                itemInSession int,
-                artist text,
-                song text,
-                length float,
-                PRIMARY KEY (sessionId, itemInSession)
-            )
-        """
-
-        try:
-            self.session.execute(query)
-            logger.info("Table 'session_item' created/verified")
-        except Exception as e:
-            logger.error(f"Failed to create table 'session_item': {e}")
-            raise
+        self._create_table("session_item")
 
     def create_user_session_table(self):
         """
@@ -68,25 +144,7 @@ class CassandraSchema:
         Query: Get user's session history sorted by itemInSession
         Primary Key: ((sessionId, userId), itemInSession)
         """
-        query = """
-            CREATE TABLE IF NOT EXISTS user_session (
-                sessionId int,
-                userId int,
-                itemInSession int,
-                artist text,
-                song text,
-                firstName text,
-                lastName text,
-                PRIMARY KEY ((sessionId, userId), itemInSession)
-            ) WITH CLUSTERING ORDER BY (itemInSession ASC)
-        """
-
-        try:
-            self.session.execute(query)
-            logger.info("Table 'user_session' created/verified")
-        except Exception as e:
-            logger.error(f"Failed to create table 'user_session': {e}")
-            raise
+        self._create_table("user_session")
 
     def create_user_song_table(self):
         """
@@ -95,22 +153,7 @@ class CassandraSchema:
         Query: Get all users who listened to a specific song
         Primary Key: (song, userId)
         """
-        query = """
-            CREATE TABLE IF NOT EXISTS user_song (
-                song text,
-                userId int,
-                firstName text,
-                lastName text,
-                PRIMARY KEY (song, userId)
-            )
-        """
-
-        try:
-            self.session.execute(query)
-            logger.info("Table 'user_song' created/verified")
-        except Exception as e:
-            logger.error(f"Failed to create table 'user_song': {e}")
-            raise
+        self._create_table("user_song")
 
     def create_all_tables(self):
         """Create all required tables for the ETL pipeline."""
@@ -120,11 +163,101 @@ class CassandraSchema:
         self.create_user_song_table()
         logger.success("All tables created successfully")
 
+    def _metadata(self) -> Optional[Metadata]:
+        """Get the driver's cached schema metadata, if the session has a cluster."""
+        metadata = getattr(getattr(self.session, "cluster", None), "metadata", None)
+        return metadata if isinstance(metadata, Metadata) else None
+
+    def _create_tables_together(self, tables: List[str]):
+        """
+        Send CREATE TABLE statements concurrently and wait for schema agreement once.
+
+        The driver normally waits for every node to agree on the schema after
+        each DDL statement; that wait is skipped per statement and done once
+        for all of them while refreshing the cached metadata.
+
+        Args:
+            tables: Names of the tables to create
+        """
+        cluster = self.session.cluster
+        agreement_wait = cluster.max_schema_agreement_wait
+        cluster.max_schema_agreement_wait = 0
+        try:
+            futures = [
+                (table, self.session.execute_async(TABLE_QUERIES[table])) for table in tables
+            ]
+            for table, future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Failed to create table '{table}': {e}")
+                    raise
+        finally:
+            cluster.max_schema_agreement_wait = agreement_wait
+
+        try:
+            cluster.refresh_schema_metadata(max_schema_agreement_wait=agreement_wait)
+        except Exception as e:
+            logger.error(f"Schema agreement not reached after creating {tables}: {e}")
+            raise
+        logger.info(f"Tables created: {', '.join(tables)}")
+
+    def bootstrap(
+        self, keyspace: str, replication_class: str = "SimpleStrategy", replication_factor: int = 1
+    ) -> Dict[str, List[str]]:
+        """
+        Create what is missing from the keyspace and check existing tables for drift.
+
+        The driver's cached cluster metadata tells which objects exist, so a
+        run against a ready cluster sends no DDL at all. Missing tables are
+        created together with a single schema agreement wait. Without cluster
+        metadata (e.g. a fake session) every statement is sent. The session
+        is switched to the keyspace.
+
+        Args:
+            keyspace: Keyspace name
+            replication_class: Replication strategy class
+            replication_factor: Number of replicas
+
+        Returns:
+            Differences from the expected layout per existing table; empty
+            when every table matches
+        """
+        metadata = self._metadata()
+        if metadata is None:
+            self.create_keyspace(keyspace, replication_class, replication_factor)
+            self.session.set_keyspace(keyspace)
+            self.create_all_tables()
+            return {}
+
+        if keyspace in metadata.keyspaces:
+            logger.info(f"Keyspace '{keyspace}' found in cluster metadata")
+        else:
+            self.create_keyspace(keyspace, replication_class, replication_factor)
+        self.session.set_keyspace(keyspace)
+
+        keyspace_metadata = metadata.keyspaces.get(keyspace)
+        existing = dict(keyspace_metadata.tables) if keyspace_metadata else {}
+        missing = [table for table in TABLE_QUERIES if table not in existing]
+        if missing:
+            self._create_tables_together(missing)
+
+        drift = {}
+        for table, layout in TABLE_LAYOUTS.items():
+            problems = table_drift(existing[table], layout) if table in existing else []
+            if problems:
+                logger.warning(f"Table '{table}' differs from the expected schema: {problems}")
+                drift[table] = problems
+
+        logger.success(
+            f"Schema ready: {len(TABLE_QUERIES) - len(missing)} tables verified, "
+            f"{len(missing)} created"
+        )
+        return drift
+
     def drop_all_tables(self):
         """Drop all tables (useful for cleanup)."""
-        tables = ["session_item", "user_session", "user_song"]
-
-        for table in tables:
+        for table in TABLE_SPECS:
             try:
                 self.session.execute(f"DROP TABLE IF EXISTS {table}")
                 logger.info(f"Table '{table}' dropped")
@@ -0,0 +1,201 @@
+"""Declarative definitions of the query tables, and what is generated from them."""
+
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.etl.records import EventRecord
+
+# Python types of the CQL types used by the tables, for parsing text values
+CQL_TYPES: Dict[str, Callable[[str], Any]] = {
+    "int": int,
+    "bigint": int,
+    "float": float,
+    "double": float,
+    "text": str,
+}
+
+
+class ColumnSpec(NamedTuple):
+    """A table column and the event record field it is filled from."""
+
+    name: str
+    cql_type: str
+    source: Optional[str] = None
+
+    @property
+    def field(self) -> str:
+        """Event record field holding the column's value (default: the column name)."""
+        return self.source or self.name
+
+
+class TableSpec(NamedTuple):
+    """
+    A query table: columns, CQL types, primary key and source record fields.
+
+    The DDL, the prepared INSERT, the record-to-parameters converter and the
+    key layouts used by batching, deduplication, sorting and schema drift
+    checks are all generated from it. Columns are listed with the primary
+    key first, in key order.
+
+    Usage:
+        spec = TABLE_SPECS["user_song"]
+        session.execute(spec.create_query())
+        prepared = session.prepare(spec.insert_query())
+        to_params = spec.converter()
+    """
+
+    name: str
+    columns: Tuple[ColumnSpec, ...]
+    partition_key: Tuple[str, ...]
+    clustering_key: Tuple[str, ...] = ()
+    descending: Tuple[str, ...] = ()
+    description: str = ""
+
+    @property
+    def column_names(self) -> Tuple[str, ...]:
+        """Column names in INSERT parameter order."""
+        return tuple(column.name for column in self.columns)
+
+    @property
+    def primary_key(self) -> Tuple[str, ...]:
+        """Partition key columns followed by clustering columns."""
+        return self.partition_key + self.clustering_key
+
+    def create_query(self) -> str:
+        """
+        Generate the ``CREATE TABLE IF NOT EXISTS`` statement.
+
+        Returns:
+            CQL statement
+        """
+        partition = ", ".join(self.partition_key)
+        if len(self.partition_key) > 1:
+            partition = f"({partition})"
+        primary_key = ", ".join((partition, *self.clustering_key))
+
+        lines = [f"{column.name} {column.cql_type}," for column in self.columns]
+        lines.append(f"PRIMARY KEY ({primary_key})")
+        body = "\n".join(f"    {line}" for line in lines)
+
+        query = f"CREATE TABLE IF NOT EXISTS {self.name} (\n{body}\n)"
+        if self.clustering_key:
+            order = ", ".join(
+                f"{column} {'DESC' if column in self.descending else 'ASC'}"
+                for column in self.clustering_key
+            )
+            query += f" WITH CLUSTERING ORDER BY ({order})"
+        return query
+
+    def insert_query(self, placeholder: str = "?") -> str:
+        """
+        Generate the INSERT statement binding every column.
+
+        Args:
+            placeholder: "?" for prepared statements, "%s" for simple statements
+
+        Returns:
+            CQL statement
+        """
+        columns = ", ".join(self.column_names)
+        values = ", ".join([placeholder] * len(self.columns))
+        return f"INSERT INTO {self.name} ({columns}) VALUES ({values})"
+
+    def converter(self) -> Callable[[EventRecord], Tuple[Any, ...]]:
+        """
+        Compile the conversion of a typed record into INSERT parameters.
+
+        Returns:
+            ``attrgetter`` reading the source fields in column order, so the
+            per-row cost is one C call per table
+        """
+        fields = [column.field for column in self.columns]
+        if len(fields) == 1:
+            get = attrgetter(fields[0])
+            return lambda record: (get(record),)
+        return attrgetter(*fields)
+
+    def row_converter(
+        self, header: Sequence[str] = EventRecord._fields
+    ) -> Callable[[List[str]], Tuple[Any, ...]]:
+        """
+        Compile the conversion of a raw CSV row into typed INSERT parameters.
+
+        The function is generated with each column's index and cast inlined,
+        e.g. ``lambda row: (int(row[8]), row[9])``.
+
+        Args:
+            header: Column names of the CSV rows (default: consolidated file layout)
+
+        Returns:
+            Function building the parameter tuple from a row of strings
+        """
+        positions = {name: index for index, name in enumerate(header)}
+        casts: Dict[str, Callable] = {}
+        values = []
+        for column in self.columns:
+            value = f"row[{positions[column.field]}]"
+            cast = CQL_TYPES[column.cql_type]
+            if cast is not str:
+                casts[cast.__name__] = cast
+                value = f"{cast.__name__}({value})"
+            values.append(value)
+
+        source = f"lambda row: ({', '.join(values)},)"
+        return eval(compile(source, f"<{self.name} row converter>", "eval"), casts)
+
+    def key_getter(self) -> Callable[[EventRecord], Tuple[Any, ...]]:
+        """
+        Get the primary key of a typed record.
+
+        Returns:
+            ``attrgetter`` of the primary key's source fields
+        """
+        fields = {column.name: column.field for column in self.columns}
+        return attrgetter(*(fields[name] for name in self.primary_key))
+
+
+TABLE_SPECS: Dict[str, TableSpec] = {
+    spec.name: spec
+    for spec in (
+        TableSpec(
+            "session_item",
+            (
+                ColumnSpec("sessionId", "int"),
+                ColumnSpec("itemInSession", "int"),
+                ColumnSpec("artist", "text"),
+                ColumnSpec("song", "text"),
+                ColumnSpec("length", "float"),
+            ),
+            partition_key=("sessionId",),
+            clustering_key=("itemInSession",),
+            description="Query 1: Get song details by sessionId and itemInSession",
+        ),
+        TableSpec(
+            "user_session",
+            (
+                ColumnSpec("sessionId", "int"),
+                ColumnSpec("userId", "int"),
+                ColumnSpec("itemInSession", "int"),
+                ColumnSpec("artist", "text"),
+                ColumnSpec("song", "text"),
+                ColumnSpec("firstName", "text"),
+                ColumnSpec("lastName", "text"),
+            ),
+            partition_key=("sessionId", "userId"),
+            clustering_key=("itemInSession",),
+            description="Query 2: Get user's session history sorted by itemInSession",
+        ),
+        TableSpec(
+            "user_song",
+            (
+                ColumnSpec("song", "text"),
+                ColumnSpec("userId", "int"),
+                ColumnSpec("firstName", "text"),
+                ColumnSpec("lastName", "text"),
+            ),
+            partition_key=("song",),
+            clustering_key=("userId",),
+            description="Query 3: Get all users who listened to a specific song",
+        ),
+    )
+}
@@ -0,0 +1,162 @@
+"""Loading records into Cassandra from an asyncio event loop."""
+
+import asyncio
+from functools import partial
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Set, Union
+
+from cassandra.cluster import Session
+from loguru import logger
+
+from src.db.aio import execute, prepare
+from src.etl.load import PREPARED_INSERTS
+from src.etl.records import EventRecord
+from src.utils.metrics import PipelineMetrics
+
+Records = Union[AsyncIterable[EventRecord], Iterable[EventRecord]]
+
+
+async def _iterate(records: Records) -> AsyncIterator[EventRecord]:
+    """Iterate over an async or a plain iterable of records."""
+    if hasattr(records, "__aiter__"):
+        async for record in records:
+            yield record
+    else:
+        for record in records:
+            yield record
+
+
+class AsyncEventLoader:
+    """
+    Write records to every query table from a single event loop.
+
+    Each record is written to all tables with prepared statements, keeping
+    at most ``concurrency`` requests in flight; the loop waits for a free
+    slot instead of buffering records. Writes are counted as they are
+    acknowledged, in any order. After the first failed write no more
+    records are read, requests in flight are awaited and the error is
+    raised. Checkpoints, batching and throttling remain features of the
+    blocking ``EventDataLoader``.
+
+    Usage:
+        loader = AsyncEventLoader(session, concurrency=2000)
+        counts = await loader.load(records)
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        concurrency: int = 1000,
+        tables: Optional[List[str]] = None,
+        metrics: Optional[PipelineMetrics] = None,
+    ):
+        """
+        Initialize loader.
+
+        Args:
+            session: Active Cassandra session using the project keyspace
+            concurrency: Maximum number of writes in flight
+            tables: Tables to write (default: all query tables)
+            metrics: Collector for per-table write latencies and errors (optional)
+
+        Raises:
+            ValueError: If concurrency is lower than 1
+        """
+        if concurrency < 1:
+            raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+
+        self.session = session
+        self.concurrency = concurrency
+        self.tables = list(tables or PREPARED_INSERTS)
+        self.metrics = metrics
+        self.rows_written: Dict[str, int] = {}
+        self._prepared: Dict[str, Any] = {}
+
+    async def _prepare_all(self):
+        """Prepare the INSERT of every table once per loader."""
+        for table in self.tables:
+            if table not in self._prepared:
+                self._prepared[table] = await prepare(self.session, PREPARED_INSERTS[table][0])
+
+    async def load(self, records: Records) -> Dict[str, int]:
+        """
+        Write records to every table.
+
+        Args:
+            records: Typed event records, from an async or a plain iterable
+
+        Returns:
+            Dictionary with row counts written for each table in this call
+
+        Raises:
+            Exception: The first write error
+        """
+        await self._prepare_all()
+        window = _WriteWindow(self.session, self.concurrency, self.tables, self.metrics)
+        writes = [
+            (table, self._prepared[table], PREPARED_INSERTS[table][1]) for table in self.tables
+        ]
+
+        async for record in _iterate(records):
+            for table, statement, to_params in writes:
+                await window.send(table, statement, to_params(record))
+            if window.errors:
+                break
+        await window.drain()
+
+        for table, count in window.written.items():
+            self.rows_written[table] = self.rows_written.get(table, 0) + count
+
+        if window.errors:
+            logger.error(f"Async load failed after {window.written}: {window.errors[0]}")
+            raise window.errors[0]
+
+        logger.info(f"Async load completed: {window.written}")
+        return window.written
+
+
+class _WriteWindow:
+    """Writes in flight for one ``AsyncEventLoader.load`` call."""
+
+    def __init__(
+        self,
+        session: Session,
+        concurrency: int,
+        tables: List[str],
+        metrics: Optional[PipelineMetrics],
+    ):
+        self.session = session
+        self.metrics = metrics
+        self.loop = asyncio.get_running_loop()
+        self.slots = asyncio.Semaphore(concurrency)
+        self.in_flight: Set[asyncio.Future] = set()
+        self.errors: List[BaseException] = []
+        self.written = dict.fromkeys(tables, 0)
+
+    async def send(self, table: str, statement, params: tuple):
+        """Send a write once a slot is free."""
+        await self.slots.acquire()
+        future = execute(self.session, statement, params)
+        self.in_flight.add(future)
+        future.add_done_callback(partial(self._done, table, self.loop.time()))
+
+    def _done(self, table: str, started: float, future: asyncio.Future):
+        """Free the write's slot and record its outcome."""
+        self.in_flight.discard(future)
+        self.slots.release()
+        if future.cancelled():
+            return
+
+        if future.exception() is not None:
+            self.errors.append(future.exception())
+            if self.metrics:
+                self.metrics.increment("write_errors")
+            return
+
+        self.written[table] += 1
+        if self.metrics:
+            self.metrics.observe_latency(table, self.loop.time() - started)
+
+    async def drain(self):
+        """Wait for every write in flight."""
+        if self.in_flight:
+            await asyncio.gather(*self.in_flight, return_exceptions=True)
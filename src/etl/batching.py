@@ -0,0 +1,132 @@
+"""Partition-aware grouping of writes into single-partition UNLOGGED batches."""
+
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from src.etl.writer import ConcurrentWriter
+
+# Cassandra's default batch_size_warn_threshold is 5 KiB
+DEFAULT_MAX_BATCH_BYTES = 5 * 1024
+
+
+def unlogged_batch():
+    """
+    Create an empty driver UNLOGGED batch.
+
+    The driver is imported on first use, so loaders that never batch, or
+    batch with another factory, don't load it.
+
+    Returns:
+        Driver ``BatchStatement``
+    """
+    from cassandra.query import BatchStatement, BatchType
+
+    return BatchStatement(batch_type=BatchType.UNLOGGED)
+
+
+def estimate_size(params: Sequence[Any]) -> int:
+    """
+    Estimate the serialized size of bound values in bytes.
+
+    Args:
+        params: Values bound to a statement
+
+    Returns:
+        Approximate size of the values on the wire, counting strings as UTF-8
+    """
+    size = 0
+    for value in params:
+        if isinstance(value, str):
+            # ASCII text is one byte per character, so only other text is encoded
+            size += (len(value) if value.isascii() else len(value.encode("utf8"))) + 4
+        else:
+            size += 8
+    return size
+
+
+class PartitionBatcher:
+    """
+    Group consecutive writes for the same partition into UNLOGGED batches.
+
+    A batch is sent through the writer whenever the partition key changes or
+    the row or byte cap is reached, so every batch targets exactly one
+    partition. Partition key columns must come first in the bound values.
+
+    Usage:
+        batcher = PartitionBatcher(writer, prepared, "user_song", key_columns=1)
+        for params in rows:
+            batcher.add(params)
+        batcher.flush()
+    """
+
+    def __init__(
+        self,
+        writer: ConcurrentWriter,
+        statement,
+        table: str,
+        key_columns: int,
+        max_rows: int = 100,
+        max_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        batch_factory: Callable[[], Any] = unlogged_batch,
+    ):
+        """
+        Initialize batcher.
+
+        Args:
+            writer: Writer used to send the batches
+            statement: Prepared INSERT statement for the table
+            table: Table name used for per-table write counts
+            key_columns: Number of leading bound values forming the partition key
+            max_rows: Maximum number of rows per batch
+            max_bytes: Maximum estimated size of a batch in bytes
+            batch_factory: Creates the empty batches (default: driver UNLOGGED batch)
+        """
+        self.writer = writer
+        self.statement = statement
+        self.table = table
+        self.key_columns = key_columns
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.batch_factory = batch_factory
+        self.batches_sent = 0
+        self._key: Optional[Tuple[Any, ...]] = None
+        self._rows: List[Sequence[Any]] = []
+        self._bytes = 0
+
+    def add(self, params: Sequence[Any]):
+        """
+        Add a row, sending the pending batch first if it can't take the row.
+
+        Args:
+            params: Values to bind to the INSERT statement
+        """
+        key = tuple(params[: self.key_columns])
+        size = estimate_size(params)
+
+        if self._rows and (
+            key != self._key
+            or len(self._rows) >= self.max_rows
+            or self._bytes + size > self.max_bytes
+        ):
+            self.flush()
+
+        self._key = key
+        self._rows.append(params)
+        self._bytes += size
+
+    def flush(self):
+        """Send the pending batch, if any."""
+        if not self._rows:
+            return
+
+        if len(self._rows) == 1:
+            self.writer.submit(self.statement, self._rows[0], table=self.table)
+        else:
+            batch = self.batch_factory()
+            for params in self._rows:
+                batch.add(self.statement, params)
+            self.writer.submit(batch, table=self.table, rows=len(self._rows))
+
+        self.batches_sent += 1
+        self._key = None
+        self._rows = []
+        self._bytes = 0
@@ -0,0 +1,107 @@
+"""Durable per-table load checkpoints for resuming interrupted loads."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable
+
+from loguru import logger
+
+
+def source_fingerprint(file_paths: Iterable[Path]) -> str:
+    """
+    Identify a load source by its files' paths, sizes and mtimes, in order.
+
+    Args:
+        file_paths: Files the loaded records are read from
+
+    Returns:
+        Hex digest that changes whenever the input changes
+    """
+    digest = hashlib.sha256()
+    for file_path in file_paths:
+        stat = Path(file_path).stat()
+        digest.update(f"{file_path}|{stat.st_size}|{stat.st_mtime_ns}\n".encode("utf8"))
+    return digest.hexdigest()
+
+
+class LoadCheckpoint:
+    """
+    Record, per table, how many leading rows are acknowledged by Cassandra.
+
+    Writes are acknowledged in submission order, so every row before the
+    recorded position is stored and a resumed load can skip it. All tables
+    use idempotent primary-key upserts, so rows after the position that
+    were already written are simply overwritten on resume.
+
+    Usage:
+        checkpoint = LoadCheckpoint("data/checkpoint.json", source, resume=True)
+        start = checkpoint.position("session_item")
+        ...
+        checkpoint.update("session_item", start + acknowledged)
+        checkpoint.save()
+    """
+
+    def __init__(self, checkpoint_file: str, source: str, resume: bool = False):
+        """
+        Initialize checkpoint, loading saved positions when resuming.
+
+        Args:
+            checkpoint_file: Path to checkpoint JSON file
+            source: Fingerprint of the input being loaded
+            resume: Whether to continue from saved positions for the same source
+        """
+        self.checkpoint_file = Path(checkpoint_file)
+        self.source = source
+        self.positions: Dict[str, int] = {}
+
+        if resume and self.checkpoint_file.exists():
+            with open(self.checkpoint_file, "r", encoding="utf8") as f:
+                saved = json.load(f)
+
+            if saved.get("source") == source:
+                self.positions = saved.get("tables", {})
+                logger.info(f"Resuming load from checkpoint: {self.positions}")
+            else:
+                logger.warning("Checkpoint is for a different input - starting from the beginning")
+
+    def position(self, table: str) -> int:
+        """
+        Get the number of leading rows already acknowledged for a table.
+
+        Args:
+            table: Table name
+
+        Returns:
+            Rows to skip when resuming
+        """
+        return self.positions.get(table, 0)
+
+    def update(self, table: str, position: int):
+        """
+        Record the acknowledged position of a table (call ``save`` to persist).
+
+        Args:
+            table: Table name
+            position: Number of leading rows acknowledged
+        """
+        self.positions[table] = position
+
+    def save(self):
+        """Persist positions durably, replacing the checkpoint file atomically."""
+        self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.checkpoint_file.with_suffix(self.checkpoint_file.suffix + ".tmp")
+
+        with open(temp_file, "w", encoding="utf8") as f:
+            json.dump({"source": self.source, "tables": self.positions}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.checkpoint_file)
+
+        logger.debug(f"Checkpoint saved: {self.positions}")
+
+    def clear(self):
+        """Remove the checkpoint after a completed load."""
+        self.positions = {}
+        self.checkpoint_file.unlink(missing_ok=True)
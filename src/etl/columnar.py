@@ -0,0 +1,232 @@
+"""Vectorized column-oriented transformation built on pandas."""
+
+import csv
+from pathlib import Path
+from typing import Iterable, Iterator, List
+
+import pandas as pd
+from loguru import logger
+
+from src.etl.eventfile import EventFileWriter, is_event_file
+from src.etl.records import EventRecord
+from src.etl.transform import (
+    BackgroundCsvWriter,
+    BackgroundEventFileWriter,
+    EventDataTransformer,
+)
+
+# Numeric output columns and the dtype they are cast to once per file
+NUMERIC_COLUMNS = {
+    "itemInSession": "int64",
+    "length": "float64",
+    "sessionId": "int64",
+    "userId": "int64",
+}
+
+
+class ColumnarEventTransformer:
+    """
+    Transform raw event files column by column instead of row by row.
+
+    Each raw file is read into typed column arrays holding only the
+    ``COLUMN_MAPPING`` columns, the empty-artist filter is applied as a
+    boolean mask, and the result matches ``EventDataTransformer`` output.
+    """
+
+    OUTPUT_COLUMNS = EventDataTransformer.OUTPUT_COLUMNS
+
+    def __init__(self, output_file: str, skip_empty_artist: bool = True):
+        """
+        Initialize transformer.
+
+        Args:
+            output_file: Path to output file. A ``.evc`` extension selects the
+                typed column-block format instead of CSV.
+            skip_empty_artist: Whether to skip rows with empty artist field
+        """
+        self.output_file = Path(output_file)
+        self.skip_empty_artist = skip_empty_artist
+        self.rows_extracted = 0
+        self.rows_skipped = 0
+        self.files_processed = 0
+
+        # Create output directory if it doesn't exist
+        self.output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        logger.info(f"Initialized columnar transformer - Output: {self.output_file}")
+
+    def read_file(self, file_path: Path) -> pd.DataFrame:
+        """
+        Read the projected columns of a raw file and drop skipped rows.
+
+        Args:
+            file_path: Raw CSV file path
+
+        Returns:
+            Frame with ``OUTPUT_COLUMNS`` as strings, in output order
+        """
+        try:
+            frame = pd.read_csv(
+                file_path,
+                usecols=self.OUTPUT_COLUMNS,
+                dtype=str,
+                keep_default_na=False,
+                encoding="utf8",
+            )
+        except Exception as e:
+            logger.error(f"Failed to read {file_path}: {e}")
+            raise
+
+        self.rows_extracted += len(frame)
+        self.files_processed += 1
+
+        if self.skip_empty_artist:
+            keep = frame["artist"] != ""
+            self.rows_skipped += int((~keep).sum())
+            frame = frame[keep]
+
+        logger.debug(f"Processed {Path(file_path).name}: {len(frame)} rows kept")
+        return frame[self.OUTPUT_COLUMNS]
+
+    def to_columns(self, frame: pd.DataFrame) -> List[list]:
+        """
+        Get the typed values of each output column, casting numeric columns once.
+
+        Args:
+            frame: Frame returned by ``read_file``
+
+        Returns:
+            One list of values per column, in ``OUTPUT_COLUMNS`` order
+        """
+        return [
+            (
+                frame[column].astype(NUMERIC_COLUMNS[column])
+                if column in NUMERIC_COLUMNS
+                else frame[column]
+            ).tolist()
+            for column in self.OUTPUT_COLUMNS
+        ]
+
+    def to_records(self, frame: pd.DataFrame) -> List[EventRecord]:
+        """
+        Convert a projected frame into typed records, casting numeric columns once.
+
+        Args:
+            frame: Frame returned by ``read_file``
+
+        Returns:
+            Typed event records
+        """
+        return list(map(EventRecord._make, zip(*self.to_columns(frame), strict=True)))
+
+    def write_event_file(self, file_paths: Iterable[Path]) -> int:
+        """
+        Write transformed data to a typed ``.evc`` file, one block per raw file.
+
+        Columns go straight from the frame into the file without building records.
+
+        Args:
+            file_paths: Raw CSV file paths
+
+        Returns:
+            Number of rows written
+        """
+        with EventFileWriter(self.output_file) as writer:
+            for file_path in file_paths:
+                frame = self.read_file(file_path)
+                if len(frame):
+                    writer.write_columns(self.to_columns(frame))
+
+        logger.info(f"Wrote {writer.rows_written} rows to {self.output_file}")
+        if self.rows_skipped > 0:
+            logger.info(f"Skipped {self.rows_skipped} rows (empty artist)")
+
+        return writer.rows_written
+
+    def write_consolidated_csv(self, file_paths: Iterable[Path]) -> int:
+        """
+        Write transformed data to consolidated CSV file.
+
+        Args:
+            file_paths: Raw CSV file paths
+
+        Returns:
+            Number of rows written
+        """
+        rows_written = 0
+
+        with open(self.output_file, "w", encoding="utf8", newline="") as f:
+            csv.writer(f, quoting=csv.QUOTE_ALL).writerow(self.OUTPUT_COLUMNS)
+
+            for file_path in file_paths:
+                frame = self.read_file(file_path)
+                frame.to_csv(
+                    f, header=False, index=False, quoting=csv.QUOTE_ALL, lineterminator="\r\n"
+                )
+                rows_written += len(frame)
+
+        logger.info(f"Wrote {rows_written} rows to {self.output_file}")
+        if self.rows_skipped > 0:
+            logger.info(f"Skipped {self.rows_skipped} rows (empty artist)")
+
+        return rows_written
+
+    def transform(self, file_paths: Iterable[Path]) -> str:
+        """
+        Execute the complete transformation process.
+
+        Args:
+            file_paths: Raw CSV file paths
+
+        Returns:
+            Path to output file
+        """
+        logger.info("Starting columnar data transformation...")
+        if is_event_file(self.output_file):
+            rows_written = self.write_event_file(file_paths)
+        else:
+            rows_written = self.write_consolidated_csv(file_paths)
+        logger.success(f"Transformation completed: {rows_written} rows written")
+        return str(self.output_file)
+
+    def iter_records(
+        self, file_paths: Iterable[Path], write_file: bool = False
+    ) -> Iterator[EventRecord]:
+        """
+        Transform raw files into typed records for direct hand-off to the loader.
+
+        Args:
+            file_paths: Raw CSV file paths
+            write_file: Whether to also write the consolidated file from a
+                background thread as an audit artifact
+
+        Yields:
+            Typed records for rows that are not skipped
+        """
+        logger.info("Starting in-memory columnar data transformation...")
+        event_file = is_event_file(self.output_file)
+        audit_writer = None
+        if write_file:
+            audit_writer = (
+                BackgroundEventFileWriter(self.output_file)
+                if event_file
+                else BackgroundCsvWriter(self.output_file, self.OUTPUT_COLUMNS)
+            )
+        rows_transformed = 0
+
+        try:
+            for file_path in file_paths:
+                frame = self.read_file(file_path)
+                records = self.to_records(frame)
+                if audit_writer:
+                    audit_writer.write(records if event_file else frame.values.tolist())
+
+                rows_transformed += len(records)
+                yield from records
+        finally:
+            if audit_writer:
+                audit_writer.close()
+
+        if self.rows_skipped > 0:
+            logger.info(f"Skipped {self.rows_skipped} rows (empty artist)")
+        logger.success(f"Transformation completed: {rows_transformed} rows handed off")
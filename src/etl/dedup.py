@@ -0,0 +1,189 @@
+"""Primary-key deduplication of records before they are written."""
+
+from array import array
+from bisect import bisect_left
+from itertools import count, islice
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src.db.tables import TABLE_SPECS
+from src.etl.records import EventRecord
+
+# Record fields forming each table's primary key
+PRIMARY_KEYS: Dict[str, Callable[[EventRecord], tuple]] = {
+    table: spec.key_getter() for table, spec in TABLE_SPECS.items()
+}
+
+# Minimum number of records hashed before they are merged into the key index
+MERGE_BLOCK_ROWS = 1 << 20
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def _merge_last(
+    index: Tuple[np.ndarray, np.ndarray], hashes: array, first_position: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge a block of key hashes into an index of the last position per hash.
+
+    Args:
+        index: Distinct hashes (sorted) and the last position of each
+        hashes: Hashes of consecutive records, the first at ``first_position``
+        first_position: Position of the block's first record
+
+    Returns:
+        Updated distinct hashes and last positions
+    """
+    block = np.frombuffer(hashes, dtype=np.int64)
+    keys = np.concatenate((index[0], block))
+    positions = np.concatenate(
+        (index[1], np.arange(first_position, first_position + len(block), dtype=np.int64))
+    )
+
+    # Positions grow along the concatenation: the last occurrence of a hash is its final write
+    distinct, first_in_reversed = np.unique(keys[::-1], return_index=True)
+    return distinct, positions[len(keys) - 1 - first_in_reversed]
+
+
+class LastWriteFilter:
+    """
+    Per-table positions of the records holding the final value of each primary key.
+
+    Cassandra resolves repeated writes to a primary key by keeping the last
+    one, so every earlier write is wasted work for the cluster. A first pass
+    over the records hashes each table's primary key to 64 bits; blocks of
+    hashes are merged with a vectorized sort into an index holding each
+    distinct hash once with its last position. Memory is 16 bytes per
+    distinct key and table plus one block of at least ``MERGE_BLOCK_ROWS``
+    hashes (the block grows with the index so merging stays O(n log n));
+    once the scan ends only the sorted kept positions remain, 8 bytes per
+    distinct key. The scan is a second sequential read of the consolidated
+    file; the partition sort deduplicates without it.
+
+    Distinct keys sharing a 64-bit hash would be merged; with n distinct keys
+    that happens with probability of roughly n² / 2^65 (about 3e-6 for ten
+    million keys). Hashes are only compared within one process.
+
+    Usage:
+        dedup = LastWriteFilter(["user_song"])
+        dedup.scan(read_records())
+        write = dedup.wrap("user_song", write)
+    """
+
+    def __init__(self, tables: List[str]):
+        """
+        Initialize filter.
+
+        Args:
+            tables: Target table names
+        """
+        self.tables = list(tables)
+        # Sorted positions of the records written to each table
+        self.kept: Dict[str, array] = {}
+        self.rows_scanned = 0
+        self.rows_unique: Dict[str, int] = {}
+
+    def scan(self, records: Iterable[EventRecord]) -> int:
+        """
+        Read every record once and find the last write of each primary key.
+
+        Args:
+            records: Typed event records, in the order they will be written
+
+        Returns:
+            Number of records scanned
+        """
+        index = dict.fromkeys(self.tables, (_EMPTY, _EMPTY))
+        hashes = {table: array("q") for table in self.tables}
+        keys = [(hashes[table].append, PRIMARY_KEYS[table]) for table in self.tables]
+
+        rows = block_start = 0
+        merge_at = MERGE_BLOCK_ROWS
+        for record in records:
+            for append, key in keys:
+                append(hash(key(record)))
+            rows += 1
+
+            if rows == merge_at:
+                for table in self.tables:
+                    index[table] = _merge_last(index[table], hashes[table], block_start)
+                    hashes[table] = array("q")
+                keys = [(hashes[table].append, PRIMARY_KEYS[table]) for table in self.tables]
+                block_start = rows
+                largest = max((len(distinct) for distinct, _ in index.values()), default=0)
+                merge_at = rows + max(MERGE_BLOCK_ROWS, largest)
+
+        for table in self.tables:
+            _, positions = _merge_last(index[table], hashes[table], block_start)
+            self.kept[table] = array("q", np.sort(positions).tobytes())
+            self.rows_unique[table] = len(positions)
+
+        self.rows_scanned = rows
+        logger.info(
+            f"Deduplicated {rows} records by primary key: "
+            f"{self.rows_unique} final writes per table"
+        )
+        return rows
+
+    @property
+    def duplicates(self) -> Dict[str, int]:
+        """Writes dropped per table because a later record replaces them."""
+        return {table: self.rows_scanned - unique for table, unique in self.rows_unique.items()}
+
+    def write_amplification(self) -> Dict[str, float]:
+        """
+        Get the writes the records would have caused per final row.
+
+        Returns:
+            Records per distinct primary key for each table
+        """
+        return {
+            table: round(self.rows_scanned / unique, 3) if unique else 1.0
+            for table, unique in self.rows_unique.items()
+        }
+
+    def record_position(self, table: str, writes: int) -> int:
+        """
+        Convert a number of deduplicated writes into a record position.
+
+        Args:
+            table: Table name
+            writes: Writes already acknowledged for the table
+
+        Returns:
+            Number of records covering the first ``writes`` kept writes
+        """
+        if not writes:
+            return 0
+
+        return self.kept[table][writes - 1] + 1
+
+    def wrap(self, table: str, write: Callable, start: int = 0) -> Callable:
+        """
+        Wrap a write function so it only sends the final write of each key.
+
+        The wrapped function must be called once per record, in scan order,
+        starting at record ``start``.
+
+        Args:
+            table: Table name
+            write: Function sending one row's parameters
+            start: Record position of the first call
+
+        Returns:
+            Write function dropping superseded rows
+        """
+        kept = self.kept[table]
+        upcoming = islice(kept, bisect_left(kept, start), None)
+        positions = count(start)
+        next_kept = next(upcoming, None)
+
+        def write_last(params):
+            nonlocal next_kept
+            if next(positions) == next_kept:
+                write(params)
+                next_kept = next(upcoming, None)
+
+        return write_last
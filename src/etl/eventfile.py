@@ -0,0 +1,289 @@
+"""
+Typed, column-oriented intermediate file for consolidated events (``.evc``).
+
+Layout (all integers little-endian)::
+
+    header   magic "EVC1" | uint16 version | uint16 column count
+             per column: uint8 type ("s" text, "i" int32, "d" float64)
+                         | uint8 name length | UTF-8 name
+    blocks   repeated until end of file:
+             uint32 row count | uint32 payload bytes | payload
+
+Each block payload holds the block's columns in header order:
+
+- ``i``: row count int32 values
+- ``d``: row count float64 values
+- ``s``: dictionary-encoded text: uint32 distinct values | uint32 text
+  bytes | distinct uint32 end offsets | UTF-8 text | uint8 index width
+  (1, 2 or 4) | row count indices of that width
+
+Numeric columns are read back with ``array.frombytes`` and text columns
+decode each distinct value once per block, so reading needs no per-field
+parsing. Repeated values (gender, level, location, names, artists) are
+stored once per block, which keeps the file far smaller than the quoted CSV.
+"""
+
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, Sequence, Tuple, Union
+
+from loguru import logger
+
+from src.etl.records import EventRecord
+
+EVENT_FILE_SUFFIX = ".evc"
+MAGIC = b"EVC1"
+VERSION = 1
+DEFAULT_BLOCK_ROWS = 10000
+
+# Column type codes per EventRecord field, in record order
+COLUMN_TYPES = {
+    "artist": "s",
+    "firstName": "s",
+    "gender": "s",
+    "itemInSession": "i",
+    "lastName": "s",
+    "length": "d",
+    "level": "s",
+    "location": "s",
+    "sessionId": "i",
+    "song": "s",
+    "userId": "i",
+}
+
+_HEADER = struct.Struct("<4sHH")
+_COLUMN = struct.Struct("<BB")
+_BLOCK = struct.Struct("<II")
+_TEXT = struct.Struct("<II")
+_INDEX_TYPES = {1: "B", 2: "H", 4: "I"}
+_SWAP = sys.byteorder != "little"
+
+
+def is_event_file(path: Union[str, Path]) -> bool:
+    """
+    Check whether a path names a typed event file rather than a CSV file.
+
+    Args:
+        path: File path
+
+    Returns:
+        True if the extension is ``.evc``
+    """
+    return Path(path).suffix.lower() == EVENT_FILE_SUFFIX
+
+
+def _to_bytes(values: array) -> bytes:
+    """Serialize an array little-endian."""
+    if _SWAP:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode: str, data: bytes) -> array:
+    """Deserialize a little-endian array."""
+    values = array(typecode)
+    values.frombytes(data)
+    if _SWAP:
+        values.byteswap()
+    return values
+
+
+def _encode_text(values: Sequence[str]) -> bytes:
+    """Dictionary-encode a text column."""
+    codes = {}
+    indices = array("I", [codes.setdefault(value, len(codes)) for value in values])
+
+    encoded = [value.encode("utf8") for value in codes]
+    offsets, end = array("I"), 0
+    for text in encoded:
+        end += len(text)
+        offsets.append(end)
+
+    width = 1 if len(codes) <= 0xFF else 2 if len(codes) <= 0xFFFF else 4
+    return b"".join(
+        [
+            _TEXT.pack(len(codes), end),
+            _to_bytes(offsets),
+            b"".join(encoded),
+            bytes([width]),
+            _to_bytes(array(_INDEX_TYPES[width], indices)),
+        ]
+    )
+
+
+def _decode_text(payload: memoryview, position: int, rows: int) -> Tuple[List[str], int]:
+    """Decode a dictionary-encoded text column, returning it and the next position."""
+    distinct, text_bytes = _TEXT.unpack_from(payload, position)
+    position += _TEXT.size
+
+    offsets = _from_bytes("I", payload[position : position + 4 * distinct])
+    position += 4 * distinct
+    text = bytes(payload[position : position + text_bytes])
+    position += text_bytes
+
+    values, start = [], 0
+    for end in offsets:
+        values.append(text[start:end].decode("utf8"))
+        start = end
+
+    width = payload[position]
+    position += 1
+    indices = _from_bytes(_INDEX_TYPES[width], payload[position : position + width * rows])
+    position += width * rows
+
+    return list(map(values.__getitem__, indices)), position
+
+
+class EventFileWriter:
+    """
+    Write typed event records to an ``.evc`` file, one block per call.
+
+    Usage:
+        with EventFileWriter("data/events.evc") as writer:
+            writer.write(records)
+    """
+
+    def __init__(self, output_file: Union[str, Path]):
+        """
+        Initialize writer and write the file header.
+
+        Args:
+            output_file: Path to the output file
+        """
+        self.output_file = Path(output_file)
+        self.rows_written = 0
+        self._file: BinaryIO = open(self.output_file, "wb")
+
+        self._file.write(_HEADER.pack(MAGIC, VERSION, len(COLUMN_TYPES)))
+        for name, kind in COLUMN_TYPES.items():
+            encoded = name.encode("utf8")
+            self._file.write(_COLUMN.pack(ord(kind), len(encoded)) + encoded)
+
+    def write(self, records: Sequence[EventRecord]):
+        """
+        Write records as one block.
+
+        Args:
+            records: Typed event records
+        """
+        if records:
+            self.write_columns(list(zip(*records, strict=True)))
+
+    def write_columns(self, columns: Sequence[Sequence]):
+        """
+        Write one block from column values in ``COLUMN_TYPES`` order.
+
+        Args:
+            columns: One sequence of values per column, all of the same length
+        """
+        rows = len(columns[0])
+        parts = []
+        for kind, values in zip(COLUMN_TYPES.values(), columns, strict=True):
+            parts.append(_encode_text(values) if kind == "s" else _to_bytes(array(kind, values)))
+
+        payload = b"".join(parts)
+        self._file.write(_BLOCK.pack(rows, len(payload)))
+        self._file.write(payload)
+        self.rows_written += rows
+
+    def close(self):
+        """Close the file."""
+        self._file.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+        return False
+
+
+def write_event_file(
+    output_file: Union[str, Path],
+    records: Iterable[EventRecord],
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+) -> int:
+    """
+    Write records to an ``.evc`` file in blocks of ``block_rows``.
+
+    Args:
+        output_file: Path to the output file
+        records: Typed event records
+        block_rows: Rows per block
+
+    Returns:
+        Number of rows written
+    """
+    with EventFileWriter(output_file) as writer:
+        block: List[EventRecord] = []
+        for record in records:
+            block.append(record)
+            if len(block) >= block_rows:
+                writer.write(block)
+                block = []
+        writer.write(block)
+
+    return writer.rows_written
+
+
+def iter_event_blocks(input_file: Union[str, Path]) -> Iterator[List[EventRecord]]:
+    """
+    Read an ``.evc`` file block by block.
+
+    Args:
+        input_file: Path to the file
+
+    Yields:
+        Typed records of one block
+
+    Raises:
+        ValueError: If the file isn't a supported event file
+    """
+    with open(input_file, "rb") as f:
+        magic, version, column_count = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            logger.error(f"Unsupported event file {input_file}: {magic!r} v{version}")
+            raise ValueError(f"Not a version {VERSION} event file: {input_file}")
+
+        kinds = []
+        for _ in range(column_count):
+            kind, name_length = _COLUMN.unpack(f.read(_COLUMN.size))
+            f.read(name_length)
+            kinds.append(chr(kind))
+        if kinds != list(COLUMN_TYPES.values()):
+            raise ValueError(f"Unexpected column layout in {input_file}: {kinds}")
+
+        while header := f.read(_BLOCK.size):
+            rows, payload_bytes = _BLOCK.unpack(header)
+            payload = memoryview(f.read(payload_bytes))
+
+            columns, position = [], 0
+            for kind in kinds:
+                if kind == "s":
+                    values, position = _decode_text(payload, position, rows)
+                else:
+                    size = array(kind).itemsize * rows
+                    values = _from_bytes(kind, payload[position : position + size])
+                    position += size
+                columns.append(values)
+
+            yield list(map(EventRecord._make, zip(*columns, strict=True)))
+
+
+def read_event_file(input_file: Union[str, Path]) -> Iterator[EventRecord]:
+    """
+    Read every record of an ``.evc`` file.
+
+    Args:
+        input_file: Path to the file
+
+    Yields:
+        Typed event records
+    """
+    for block in iter_event_blocks(input_file):
+        yield from block
@@ -1,26 +1,215 @@
 """Data extraction from CSV files."""
 
 import csv
+import io
+import mmap
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
 from loguru import logger
 
+EXTRACT_ENGINES = ("csv", "mmap")
+
+# Bytes of a memory-mapped file decoded and parsed at a time
+MAPPED_BLOCK_BYTES = 1 << 20
+
+
+class FileExtraction(NamedTuple):
+    """A chunk of rows read from one CSV file by an extraction worker."""
+
+    path: Path
+    rows: List[List[str]]
+    error: Optional[str] = None
+    # Byte offset of the file's next chunk; None once the file is read
+    next_offset: Optional[int] = None
+
+
+def _iter_mapped_lines(mapped: mmap.mmap) -> Iterator[str]:
+    """
+    Decode a mapped file block by block and stream its lines.
+
+    Blocks of ``MAPPED_BLOCK_BYTES`` are extended to the end of their last
+    line, so no line or UTF-8 sequence is split, and only one block is
+    decoded at a time.
+
+    Args:
+        mapped: Memory-mapped file positioned at the start
+
+    Yields:
+        Lines with their line endings, as ``open(..., newline="")`` yields them
+    """
+    while block := mapped.read(MAPPED_BLOCK_BYTES):
+        block += mapped.readline()
+        yield from io.StringIO(block.decode("utf8"), newline="")
+
+
+def iter_mapped_rows(
+    file_path: Path, columns: Optional[Sequence[str]] = None
+) -> Iterator[Sequence[str]]:
+    """
+    Memory-map a CSV file and stream its data rows, keeping only some columns.
+
+    The mapping is decoded in blocks of ``MAPPED_BLOCK_BYTES`` and the lines
+    fed to the C ``csv`` parser, which reads them the same way it reads the
+    file, so quoted fields containing commas or newlines
+    (``"San Francisco-Oakland-Hayward, CA"``) stay intact. Memory used while
+    parsing is bounded by the block size, not the file size. The parser still
+    builds every field of a row; columns are located by name in the header
+    and picked with one ``itemgetter`` call per row, so dropped fields are
+    released immediately instead of being held in the extracted chunks.
+
+    Args:
+        file_path: CSV file path
+        columns: Names of the columns to keep, in output order (default: all)
+
+    Yields:
+        Data rows as tuples of the kept columns (lists when keeping all)
+
+    Raises:
+        ValueError: If a requested column is missing from the header
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            csv_reader = csv.reader(_iter_mapped_lines(mapped))
+            header = next(csv_reader, [])
+
+            if columns is None:
+                yield from filter(None, csv_reader)
+                return
+
+            missing = [column for column in columns if column not in header]
+            if missing:
+                raise ValueError(f"Columns {missing} not found in {file_path}")
+
+            project = itemgetter(*(header.index(column) for column in columns))
+            yield from map(project, filter(None, csv_reader))
+
+
+def _iter_source_lines(source) -> Iterator[str]:
+    """Decode the lines of a binary file or memory map from its current position."""
+    while line := source.readline():
+        yield line.decode("utf8")
+
+
+def _read_chunk(
+    file_path: Path,
+    source,
+    offset: int,
+    chunk_size: int,
+    mapped: bool,
+    columns: Optional[Sequence[str]] = None,
+) -> Tuple[List[Sequence[str]], Optional[int]]:
+    """
+    Parse up to ``chunk_size`` data rows of a binary file or memory map.
+
+    Lines are pulled one at a time, so the position after the last row is
+    exactly where the next chunk starts, even with quoted newlines. Like the
+    serial readers, the ``mmap`` engine drops blank rows and projects columns.
+
+    Returns:
+        Rows and the offset of the next chunk (None at the end of the file)
+
+    Raises:
+        ValueError: If a requested column is missing from the header
+    """
+    header = next(csv.reader(_iter_source_lines(source)), [])
+    if offset:
+        source.seek(offset)
+    rows: Iterator[Sequence[str]] = csv.reader(_iter_source_lines(source))
+
+    if mapped:
+        rows = filter(None, rows)
+    if mapped and columns is not None:
+        missing = [column for column in columns if column not in header]
+        if missing:
+            raise ValueError(f"Columns {missing} not found in {file_path}")
+        rows = map(itemgetter(*(header.index(column) for column in columns)), rows)
+
+    chunk = list(islice(rows, chunk_size))
+    position = source.tell()
+    at_end = len(chunk) < chunk_size or not source.read(1)
+    return chunk, None if at_end else position
+
+
+def read_csv_chunk(
+    file_path: Path,
+    offset: int = 0,
+    chunk_size: int = 10000,
+    engine: str = "csv",
+    columns: Optional[Sequence[str]] = None,
+) -> FileExtraction:
+    """
+    Read up to ``chunk_size`` data rows of a CSV file, starting at a byte offset.
+
+    Runs inside worker processes, so failures are returned rather than raised.
+    The result holds the offset of the following rows, so a large file is
+    read by several bounded tasks instead of being returned whole.
+
+    Args:
+        file_path: CSV file path
+        offset: Byte offset of the first row to read; 0 starts after the header
+        chunk_size: Maximum number of rows to read
+        engine: ``csv`` reads lines from the file, ``mmap`` from its memory map
+        columns: Columns kept by the ``mmap`` engine (default: all)
+
+    Returns:
+        Extracted rows and the next offset, or the error message for the file
+    """
+    try:
+        with open(file_path, "rb") as f:
+            if engine != "mmap":
+                rows, next_offset = _read_chunk(file_path, f, offset, chunk_size, mapped=False)
+            elif os.fstat(f.fileno()).st_size == 0:
+                rows, next_offset = [], None
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as file_map:
+                    rows, next_offset = _read_chunk(
+                        file_path, file_map, offset, chunk_size, mapped=True, columns=columns
+                    )
+        return FileExtraction(file_path, rows, next_offset=next_offset)
+    except Exception as e:
+        return FileExtraction(file_path, [], f"{type(e).__name__}: {e}")
+
 
 class EventDataExtractor:
     """Extract event data from multiple CSV files."""
 
-    def __init__(self, data_folder: str):
+    def __init__(
+        self, data_folder: str, engine: str = "csv", columns: Optional[Sequence[str]] = None
+    ):
         """
         Initialize extractor.
 
         Args:
             data_folder: Path to folder containing CSV files
+            engine: ``csv`` reads every column with ``csv.reader``; ``mmap``
+                memory-maps each file and keeps only ``columns``
+            columns: Column names kept by the ``mmap`` engine, in output order.
+                Rows then hold these columns instead of the raw layout.
 
         Raises:
             FileNotFoundError: If data folder doesn't exist
+            ValueError: If the engine is unknown
         """
+        if engine not in EXTRACT_ENGINES:
+            raise ValueError(
+                f"Unknown extract engine '{engine}', expected one of {EXTRACT_ENGINES}"
+            )
+
         self.data_folder = Path(data_folder)
+        self.engine = engine
+        # Layout of extracted rows: None = raw file columns
+        self.columns = list(columns) if engine == "mmap" and columns else None
+        self.rows_extracted = 0
+        self.files_processed = 0
+        self.file_stats: Dict[str, Dict[str, Optional[object]]] = {}
 
         if not self.data_folder.exists():
             raise FileNotFoundError(f"Data folder not found: {data_folder}")
@@ -42,41 +231,206 @@ class EventDataExtractor:
 
         return file_paths
 
-    def extract_rows(self, file_paths: List[Path]) -> List[List[str]]:
+    def iter_rows(self, file_paths: Iterable[Path]) -> Iterator[List[str]]:
         """
-        Extract all data rows from CSV files.
+        Stream data rows from CSV files one at a time.
+
+        Row and file counts are accumulated in ``rows_extracted`` and
+        ``files_processed`` as the iterator is consumed.
 
         Args:
-            file_paths: List of CSV file paths
+            file_paths: CSV file paths
 
-        Returns:
-            List of data rows (each row is a list of strings)
+        Yields:
+            Data rows (each row is a list of strings)
 
         Raises:
             Exception: If file reading fails
         """
-        data_rows = []
-        files_processed = 0
-
         for file_path in file_paths:
             try:
-                with open(file_path, "r", encoding="utf8", newline="") as csv_file:
-                    csv_reader = csv.reader(csv_file)
-                    next(csv_reader)  # Skip header
-
-                    file_row_count = 0
-                    for line in csv_reader:
-                        data_rows.append(line)
-                        file_row_count += 1
+                file_row_count = 0
+                for line in self._read_file(file_path):
+                    yield line
+                    file_row_count += 1
 
-                    files_processed += 1
-                    logger.debug(f"Processed {file_path.name}: {file_row_count} rows")
+                self.rows_extracted += file_row_count
+                self.files_processed += 1
+                logger.debug(f"Processed {file_path.name}: {file_row_count} rows")
 
             except Exception as e:
                 logger.error(f"Failed to read {file_path}: {e}")
                 raise
 
-        logger.info(f"Extracted {len(data_rows)} total rows from {files_processed} files")
+    def _read_file(self, file_path: Path) -> Iterator[Sequence[str]]:
+        """Stream the data rows of one file with the configured engine."""
+        if self.engine == "mmap":
+            yield from iter_mapped_rows(file_path, self.columns)
+            return
+
+        with open(file_path, "r", encoding="utf8", newline="") as csv_file:
+            csv_reader = csv.reader(csv_file)
+            next(csv_reader)  # Skip header
+            yield from csv_reader
+
+    def iter_chunks(
+        self, file_paths: Iterable[Path], chunk_size: int = 10000
+    ) -> Iterator[List[List[str]]]:
+        """
+        Stream data rows from CSV files in bounded chunks.
+
+        At most ``chunk_size`` rows are held in memory at a time.
+
+        Args:
+            file_paths: CSV file paths
+            chunk_size: Maximum number of rows per chunk
+
+        Yields:
+            Lists of up to ``chunk_size`` data rows
+        """
+        chunk = []
+
+        for line in self.iter_rows(file_paths):
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+        logger.info(f"Extracted {self.rows_extracted} total rows from {self.files_processed} files")
+
+    def iter_files_parallel(
+        self,
+        file_paths: Iterable[Path],
+        workers: int = 4,
+        ordered: bool = True,
+        chunk_size: int = 10000,
+    ) -> Iterator[FileExtraction]:
+        """
+        Read CSV files concurrently in a pool of worker processes, in bounded chunks.
+
+        Each task reads up to ``chunk_size`` rows of one file and returns the
+        offset where the next chunk starts; the file's next task is submitted
+        when its chunk comes back. Up to ``2 * workers`` files are read side by
+        side, each with one chunk in flight or waiting to be yielded, so at
+        most ``2 * workers + 1`` chunks are held whatever the file sizes.
+        Per-file row counts and errors are recorded in ``file_stats``.
+
+        Args:
+            file_paths: CSV file paths
+            workers: Number of worker processes
+            ordered: Yield files sorted by path, each file's chunks in order, if
+                True; otherwise yield chunks as soon as they are read
+            chunk_size: Maximum number of rows per chunk
+
+        Yields:
+            Extraction results per chunk; a file that failed yields its error
+            and no further chunks
+        """
+        paths = iter(sorted(file_paths) if ordered else file_paths)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+
+            def read(path: Path, offset: int = 0):
+                return executor.submit(
+                    read_csv_chunk, path, offset, chunk_size, self.engine, self.columns
+                )
+
+            pending = deque(read(path) for path in islice(paths, 2 * workers))
+
+            while pending:
+                if ordered:
+                    future = pending[0]
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    future = done.pop()
+                result = future.result()
+
+                # Keep the file's slot: read its next chunk or start the next file
+                index = pending.index(future)
+                if result.next_offset is not None and not result.error:
+                    pending[index] = read(result.path, result.next_offset)
+                else:
+                    del pending[index]
+                    for path in islice(paths, 1):
+                        pending.append(read(path))
+
+                self._record_chunk(result)
+                yield result
+
+    def iter_chunks_parallel(
+        self,
+        file_paths: Iterable[Path],
+        workers: int = 4,
+        ordered: bool = True,
+        chunk_size: int = 10000,
+    ) -> Iterator[List[List[str]]]:
+        """
+        Stream data rows read by worker processes in chunks of at most ``chunk_size`` rows.
+
+        Args:
+            file_paths: CSV file paths
+            workers: Number of worker processes
+            ordered: Yield files sorted by path if True, otherwise fastest first
+            chunk_size: Maximum number of rows per chunk
+
+        Yields:
+            Chunks of data rows of successfully read files
+
+        Raises:
+            RuntimeError: If any file failed to read, after all files are processed
+        """
+        failed = []
+
+        for result in self.iter_files_parallel(
+            file_paths, workers=workers, ordered=ordered, chunk_size=chunk_size
+        ):
+            if result.error:
+                failed.append(result.path.name)
+            elif result.rows:
+                yield result.rows
+
+        logger.info(
+            f"Extracted {self.rows_extracted} total rows from {self.files_processed} files "
+            f"using {workers} workers"
+        )
+
+        if failed:
+            raise RuntimeError(f"Failed to read {len(failed)} files: {', '.join(failed)}")
+
+    def _record_chunk(self, result: FileExtraction):
+        """Record the rows or error of a chunk read by a worker."""
+        stats = self.file_stats.setdefault(result.path.name, {"rows": 0, "error": None})
+
+        if result.error:
+            stats["error"] = result.error
+            logger.error(f"Failed to read {result.path}: {result.error}")
+            return
+
+        stats["rows"] += len(result.rows)
+        self.rows_extracted += len(result.rows)
+        if result.next_offset is None:
+            self.files_processed += 1
+            logger.debug(f"Processed {result.path.name}: {stats['rows']} rows")
+
+    def extract_rows(self, file_paths: List[Path]) -> List[List[str]]:
+        """
+        Extract all data rows from CSV files.
+
+        Args:
+            file_paths: List of CSV file paths
+
+        Returns:
+            List of data rows (each row is a list of strings)
+
+        Raises:
+            Exception: If file reading fails
+        """
+        data_rows = list(self.iter_rows(file_paths))
+
+        logger.info(f"Extracted {len(data_rows)} total rows from {self.files_processed} files")
         return data_rows
 
     def extract(self) -> List[List[str]]:
@@ -1,81 +1,369 @@
 """Data loading into Cassandra tables."""
 
 import csv
+from collections import deque
+from contextlib import nullcontext
+from functools import partial
+from itertools import islice
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from cassandra.cluster import Session
 from loguru import logger
 
+from src.db.null import NullBatchStatement, NullSession
+from src.db.tables import TABLE_SPECS
+from src.etl.batching import DEFAULT_MAX_BATCH_BYTES, PartitionBatcher, unlogged_batch
+from src.etl.checkpoint import LoadCheckpoint
+from src.etl.eventfile import is_event_file, read_event_file
+from src.etl.records import EventRecord
+from src.etl.sort import read_sorted_table
+from src.etl.throttle import AdaptiveThrottle
+from src.etl.writer import ConcurrentWriter
+from src.utils.metrics import PipelineMetrics
+
+if TYPE_CHECKING:
+    from cassandra.cluster import Session
+
+    from src.etl.dedup import LastWriteFilter
+
+# Prepared INSERT statements and the converters binding record fields, per table
+PREPARED_INSERTS: Dict[str, Tuple[str, Callable[[EventRecord], Tuple[Any, ...]]]] = {
+    table: (spec.insert_query(), spec.converter()) for table, spec in TABLE_SPECS.items()
+}
+
+# Number of leading bound values in each INSERT that form the partition key
+PARTITION_KEY_COLUMNS: Dict[str, int] = {
+    table: len(spec.partition_key) for table, spec in TABLE_SPECS.items()
+}
+
+
+def read_records(data_file: Path) -> Iterator[EventRecord]:
+    """
+    Read a consolidated CSV or typed ``.evc`` file into typed records.
+
+    Args:
+        data_file: Path to the consolidated file
+
+    Yields:
+        One record per data row
+    """
+    if is_event_file(data_file):
+        yield from read_event_file(data_file)
+        return
+
+    with open(data_file, encoding="utf8") as f:
+        csv_reader = csv.reader(f)
+        next(csv_reader)  # Skip header
+
+        for line in csv_reader:
+            yield EventRecord.from_row(line)
+
 
 class EventDataLoader:
     """Load event data into Cassandra tables."""
 
-    def __init__(self, session: Session, data_file: str):
+    def __init__(
+        self,
+        session: "Session",
+        data_file: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        fan_out: bool = False,
+        batch_rows: Optional[int] = None,
+        batch_max_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        checkpoint: Optional[LoadCheckpoint] = None,
+        checkpoint_interval: int = 10000,
+        throttle: Optional[AdaptiveThrottle] = None,
+        metrics: Optional[PipelineMetrics] = None,
+        dedup: bool = False,
+        prepared: Optional[Dict[str, Any]] = None,
+    ):
         """
         Initialize loader.
 
         Args:
             session: Active Cassandra session
-            data_file: Path to consolidated CSV file
+            data_file: Path to consolidated CSV or typed ``.evc`` file. Optional
+                when records are handed over in memory with ``load_records``
+            batch_size: Number of prepared inserts kept in flight concurrently.
+                When not set, rows are inserted one at a time with ``session.execute``.
+            fan_out: Whether ``load_all_tables`` reads the file once and writes
+                every table from each parsed record
+            batch_rows: Maximum rows per single-partition UNLOGGED batch.
+                When not set, each row is sent as its own statement.
+            batch_max_bytes: Maximum estimated size of a batch in bytes, kept
+                under the cluster's ``batch_size_warn_threshold``
+            checkpoint: Per-table checkpoint to resume from and save to. Only
+                used by the prepared-statement paths.
+            checkpoint_interval: Records submitted between checkpoint saves
+            throttle: Adaptive controller for writes in flight and send rate.
+                Replaces the fixed ``batch_size`` window when set.
+            metrics: Collector for per-table write latencies, retries and errors.
+                Only used by the prepared-statement paths.
+            dedup: Whether to read the file twice and send only the last row
+                per primary key of each table. Needs a data file; selects the
+                prepared-statement paths.
+            prepared: Prepared statements by table, shared by loaders using the
+                same long-lived session (default: prepared per loader)
 
         Raises:
             FileNotFoundError: If data file doesn't exist
         """
         self.session = session
-        self.data_file = Path(data_file)
+        self.data_file = Path(data_file) if data_file else None
+        self.batch_size = batch_size
+        self.fan_out = fan_out
+        self.batch_rows = batch_rows
+        self.batch_max_bytes = batch_max_bytes
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.throttle = throttle
+        self.metrics = metrics
+        self.dedup = dedup
+        self.batches_sent: Dict[str, int] = {}
+        self.rows_resumed: Dict[str, int] = {}
+        self.rows_deduplicated: Dict[str, int] = {}
+        self.write_amplification: Dict[str, float] = {}
+        self._prepared: Dict[str, Any] = prepared if prepared is not None else {}
+
+        if self.data_file is None:
+            logger.info("Initialized loader for in-memory records")
+            return
 
         if not self.data_file.exists():
             raise FileNotFoundError(f"Data file not found: {data_file}")
 
         logger.info(f"Initialized loader for file: {self.data_file}")
 
-    def load_session_item_table(self) -> int:
+    def _prepare(self, table: str):
         """
-        Load data into session_item table.
+        Prepare the INSERT statement for a table once per loader.
 
-        Table supports Query 1: Get song details by sessionId and itemInSession
+        Args:
+            table: Target table name
 
         Returns:
-            Number of rows inserted
+            Prepared statement
         """
-        insert_query = """
-            INSERT INTO session_item (sessionId, itemInSession, artist, song, length)
-            VALUES (%s, %s, %s, %s, %s)
+        if table not in self._prepared:
+            self._prepared[table] = self.session.prepare(PREPARED_INSERTS[table][0])
+        return self._prepared[table]
+
+    def _profiled(self, table: str):
+        """Profile loading one table as its own section when a profiler is attached."""
+        return self.metrics.profiled(f"load.{table}") if self.metrics else nullcontext()
+
+    def _batch_factory(self) -> Callable[[], Any]:
+        """Get the batch type the session sends: light batches for a dry run."""
+        return NullBatchStatement if isinstance(self.session, NullSession) else unlogged_batch
+
+    def _iter_records(self) -> Iterator[EventRecord]:
         """
+        Read the consolidated file into typed records.
 
-        rows_inserted = 0
+        Yields:
+            One record per data row
+        """
+        return read_records(self.data_file)
 
-        with open(self.data_file, encoding="utf8") as f:
-            csv_reader = csv.reader(f)
-            next(csv_reader)  # Skip header
+    def _scan_duplicates(self, tables: List[str]) -> Optional["LastWriteFilter"]:
+        """
+        Find the last record per primary key of each table with a first read of the file.
 
-            for line in csv_reader:
-                try:
-                    self.session.execute(
-                        insert_query, (int(line[8]), int(line[3]), line[0], line[9], float(line[5]))
+        Args:
+            tables: Target table names
+
+        Returns:
+            Filter for the write pass, or None when deduplication is off
+        """
+        if not self.dedup:
+            return None
+
+        from src.etl.dedup import LastWriteFilter  # numpy is only needed for deduplication
+
+        dedup = LastWriteFilter(tables)
+        dedup.scan(self._iter_records())
+        self.rows_deduplicated.update(dedup.duplicates)
+        self.write_amplification.update(dedup.write_amplification())
+        return dedup
+
+    def _write_records(
+        self,
+        tables: List[str],
+        records: Iterable[EventRecord],
+        dedup: Optional["LastWriteFilter"] = None,
+        convert: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Write records to tables with prepared statements and concurrent async inserts.
+
+        Consecutive rows for the same partition are grouped into UNLOGGED
+        batches when ``batch_rows`` is set. With a checkpoint, rows already
+        acknowledged for a table are skipped and positions are saved every
+        ``checkpoint_interval`` records and on failure. With a dedup filter,
+        rows superseded by a later record with the same primary key are
+        dropped; checkpoints then count the rows actually written.
+
+        Args:
+            tables: Target table names
+            records: Typed event records
+            dedup: Filter scanned over the same records (optional)
+            convert: Whether records are converted to each table's parameters.
+                When False, ``records`` already are one table's parameter tuples.
+
+        Returns:
+            Dictionary with row counts written for each table in this call
+        """
+        skip = {
+            table: self.checkpoint.position(table) if self.checkpoint else 0 for table in tables
+        }
+        self.rows_resumed.update({table: count for table, count in skip.items() if count})
+        record_skip = (
+            {table: dedup.record_position(table, count) for table, count in skip.items()}
+            if dedup
+            else skip
+        )
+
+        with ConcurrentWriter(
+            self.session,
+            concurrency=self.batch_size or 1,
+            throttle=self.throttle,
+            metrics=self.metrics,
+        ) as writer:
+            batchers = []
+            writes = []
+
+            for table in tables:
+                statement = self._prepare(table)
+                if self.batch_rows:
+                    batcher = PartitionBatcher(
+                        writer,
+                        statement,
+                        table,
+                        key_columns=PARTITION_KEY_COLUMNS[table],
+                        max_rows=self.batch_rows,
+                        max_bytes=self.batch_max_bytes,
+                        batch_factory=self._batch_factory(),
                     )
-                    rows_inserted += 1
-                except Exception as e:
-                    logger.error(f"Failed to insert row into session_item: {e}")
-                    raise
+                    batchers.append(batcher)
+                    write = batcher.add
+                else:
+                    write = partial(writer.submit, statement, table=table)
+                if dedup:
+                    write = dedup.wrap(table, write, start=record_skip[table])
+                to_params = PREPARED_INSERTS[table][1] if convert else tuple
+                writes.append((table, write, to_params))
+
+            try:
+                self._submit_records(writer, writes, iter(records), record_skip)
+
+                for batcher in batchers:
+                    batcher.flush()
+                    self.batches_sent[batcher.table] = batcher.batches_sent
+
+                writer.flush()
+            finally:
+                self._save_checkpoint(writer, skip)
+
+        return {table: writer.rows_written.get(table, 0) for table in tables}
+
+    def _submit_records(
+        self,
+        writer: ConcurrentWriter,
+        writes: List[Tuple[str, Callable, Callable]],
+        records: Iterator[EventRecord],
+        skip: Dict[str, int],
+    ):
+        """
+        Submit writes for every record, skipping rows covered by the checkpoint.
 
-        logger.info(f"Loaded {rows_inserted} rows into session_item table")
-        return rows_inserted
+        Args:
+            writer: Writer sending the statements
+            writes: (table, write function, record converter) per table
+            records: Typed event records
+            skip: Leading rows to skip per table
+        """
+        # Records every table already has are dropped without converting them
+        position = min(skip.values())
+        deque(islice(records, position), maxlen=0)
+
+        # Catch up tables whose checkpoints are further ahead
+        for record in islice(records, max(skip.values()) - position):
+            for table, write, to_params in writes:
+                if position >= skip[table]:
+                    write(to_params(record))
+            position += 1
+
+        while True:
+            submitted = 0
+            for record in islice(records, self.checkpoint_interval):
+                for _, write, to_params in writes:
+                    write(to_params(record))
+                submitted += 1
+
+            if not submitted:
+                return
+            self._save_checkpoint(writer, skip)
+
+    def _save_checkpoint(self, writer: ConcurrentWriter, skip: Dict[str, int]):
+        """Save the acknowledged position of each table written by the writer."""
+        if not self.checkpoint:
+            return
+
+        for table, start in skip.items():
+            self.checkpoint.update(table, start + writer.rows_written.get(table, 0))
+        self.checkpoint.save()
+
+    def _use_prepared(self) -> bool:
+        """
+        Check whether per-table loads use prepared statements.
 
-    def load_user_session_table(self) -> int:
+        Typed ``.evc`` files and deduplication are only handled by the
+        prepared-statement path; with no concurrency settings it keeps one
+        request in flight.
+
+        Returns:
+            True unless the original row-by-row CSV path applies
         """
-        Load data into user_session table.
+        return bool(
+            self.batch_size
+            or self.batch_rows
+            or self.throttle
+            or self.dedup
+            or is_event_file(self.data_file)
+        )
+
+    def _load_table_concurrent(self, table: str) -> int:
+        """
+        Load a table with prepared statements and concurrent async inserts.
 
-        Table supports Query 2: Get user's session history sorted by itemInSession
+        Args:
+            table: Target table name
 
         Returns:
             Number of rows inserted
         """
-        insert_query = """
-            INSERT INTO user_session
-                (sessionId, userId, itemInSession, artist, song, firstName, lastName)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        rows_inserted = self._write_records(
+            [table], self._iter_records(), self._scan_duplicates([table])
+        )[table]
+        logger.info(f"Loaded {rows_inserted} rows into {table} table")
+        return rows_inserted
+
+    def _load_table_rows(self, table: str) -> int:
+        """
+        Load a table row by row with simple statements.
+
+        Each CSV row is turned into the INSERT's parameters by the converter
+        compiled from the table's spec.
+
+        Args:
+            table: Target table name
+
+        Returns:
+            Number of rows inserted
         """
+        spec = TABLE_SPECS[table]
+        insert_query = spec.insert_query("%s")
+        to_params = spec.row_converter()
 
         rows_inserted = 0
 
@@ -85,26 +373,51 @@ class EventDataLoader:
 
             for line in csv_reader:
                 try:
-                    self.session.execute(
-                        insert_query,
-                        (
-                            int(line[8]),
-                            int(line[10]),
-                            int(line[3]),
-                            line[0],
-                            line[9],
-                            line[1],
-                            line[4],
-                        ),
-                    )
+                    self.session.execute(insert_query, to_params(line))
                     rows_inserted += 1
                 except Exception as e:
-                    logger.error(f"Failed to insert row into user_session: {e}")
+                    logger.error(f"Failed to insert row into {table}: {e}")
                     raise
 
-        logger.info(f"Loaded {rows_inserted} rows into user_session table")
+        logger.info(f"Loaded {rows_inserted} rows into {table} table")
         return rows_inserted
 
+    def load_table(self, table: str) -> int:
+        """
+        Load data into one table of ``TABLE_SPECS``.
+
+        Args:
+            table: Target table name
+
+        Returns:
+            Number of rows inserted
+        """
+        if self._use_prepared():
+            return self._load_table_concurrent(table)
+        return self._load_table_rows(table)
+
+    def load_session_item_table(self) -> int:
+        """
+        Load data into session_item table.
+
+        Table supports Query 1: Get song details by sessionId and itemInSession
+
+        Returns:
+            Number of rows inserted
+        """
+        return self.load_table("session_item")
+
+    def load_user_session_table(self) -> int:
+        """
+        Load data into user_session table.
+
+        Table supports Query 2: Get user's session history sorted by itemInSession
+
+        Returns:
+            Number of rows inserted
+        """
+        return self.load_table("user_session")
+
     def load_user_song_table(self) -> int:
         """
         Load data into user_song table.
@@ -114,27 +427,68 @@ class EventDataLoader:
         Returns:
             Number of rows inserted
         """
-        insert_query = """
-            INSERT INTO user_song (song, userId, firstName, lastName)
-            VALUES (%s, %s, %s, %s)
+        return self.load_table("user_song")
+
+    def load_all_tables_fan_out(self) -> dict:
         """
+        Load all tables from a single read of the consolidated file.
 
-        rows_inserted = 0
+        Each row is parsed and converted once, then written to every table.
 
-        with open(self.data_file, encoding="utf8") as f:
-            csv_reader = csv.reader(f)
-            next(csv_reader)  # Skip header
+        Returns:
+            Dictionary with row counts for each table
+        """
+        tables = list(PREPARED_INSERTS)
+        results = self._write_records(tables, self._iter_records(), self._scan_duplicates(tables))
+        for table, count in results.items():
+            logger.info(f"Loaded {count} rows into {table} table")
 
-            for line in csv_reader:
-                try:
-                    self.session.execute(insert_query, (line[9], int(line[10]), line[1], line[4]))
-                    rows_inserted += 1
-                except Exception as e:
-                    logger.error(f"Failed to insert row into user_song: {e}")
-                    raise
+        return results
 
-        logger.info(f"Loaded {rows_inserted} rows into user_song table")
-        return rows_inserted
+    def load_sorted_tables(self, files: Dict[str, Path]) -> dict:
+        """
+        Load per-table files written by ``PartitionSorter``.
+
+        Rows arrive grouped by partition and in clustering order, so batches
+        fill up to ``batch_rows``. Checkpoints count rows of each sorted file.
+
+        Args:
+            files: Sorted file path per table
+
+        Returns:
+            Dictionary with row counts for each table
+        """
+        logger.info("Starting sorted data load into Cassandra...")
+        results = {}
+        for table, path in files.items():
+            with self._profiled(table):
+                rows = read_sorted_table(path)
+                results.update(self._write_records([table], rows, convert=False))
+            logger.info(f"Loaded {results[table]} rows into {table} table from {path}")
+        logger.success(f"Data load completed: {sum(results.values())} total rows inserted")
+
+        return results
+
+    def load_records(self, records: Iterable[EventRecord]) -> dict:
+        """
+        Load records handed over in memory into all Cassandra tables.
+
+        Args:
+            records: Typed event records, e.g. from ``EventDataTransformer.iter_records``
+
+        Returns:
+            Dictionary with row counts for each table
+        """
+        logger.info("Starting in-memory data load into Cassandra...")
+        if self.dedup:
+            logger.warning("Deduplication needs a re-readable data file; in-memory load skips it")
+        results = self._write_records(list(PREPARED_INSERTS), records)
+
+        for table, count in results.items():
+            logger.info(f"Loaded {count} rows into {table} table")
+        logger.success(f"Data load completed: {sum(results.values())} total rows inserted")
+
+        return results
 
     def load_all_tables(self) -> dict:
         """
@@ -145,11 +499,13 @@ class EventDataLoader:
         """
         logger.info("Starting data load into Cassandra...")
 
-        results = {
-            "session_item": self.load_session_item_table(),
-            "user_session": self.load_user_session_table(),
-            "user_song": self.load_user_song_table(),
-        }
+        if self.fan_out:
+            results = self.load_all_tables_fan_out()
+        else:
+            results = {}
+            for table in TABLE_SPECS:
+                with self._profiled(table):
+                    results[table] = self.load_table(table)
 
         total_rows = sum(results.values())
         logger.success(f"Data load completed: {total_rows} total rows inserted")
@@ -0,0 +1,121 @@
+"""Manifest of processed raw files for incremental extraction."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from loguru import logger
+
+
+def file_sha256(file_path: Path, block_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 hash of a file's content.
+
+    Args:
+        file_path: File to hash
+        block_size: Bytes read per iteration
+
+    Returns:
+        Hex digest of the file content
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FileManifest:
+    """
+    Track processed raw files by path, size, mtime and content hash.
+
+    Files whose size and mtime are unchanged are skipped without reading
+    them. Otherwise the content hash decides, so a touched but identical file
+    is not reprocessed. New entries are only persisted by ``commit`` once the
+    run has succeeded.
+
+    Usage:
+        manifest = FileManifest("data/manifest.json")
+        new_files = manifest.filter_changed(file_paths)
+        ...  # extract, transform and load new_files
+        manifest.commit()
+    """
+
+    def __init__(self, manifest_file: str):
+        """
+        Initialize manifest, loading existing entries.
+
+        Args:
+            manifest_file: Path to manifest JSON file
+        """
+        self.manifest_file = Path(manifest_file)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+
+        if self.manifest_file.exists():
+            with open(self.manifest_file, "r", encoding="utf8") as f:
+                self.entries = json.load(f).get("files", {})
+
+        logger.info(f"Loaded manifest {self.manifest_file}: {len(self.entries)} files recorded")
+
+    def _is_unchanged(self, key: str, entry: Dict[str, Any], file_path: Path) -> bool:
+        """Check a file against its recorded entry, hashing only if metadata differs."""
+        recorded = self.entries.get(key)
+        if recorded is None:
+            return False
+
+        if recorded["size"] == entry["size"] and recorded["mtime"] == entry["mtime"]:
+            entry["sha256"] = recorded["sha256"]
+            return True
+
+        entry["sha256"] = file_sha256(file_path)
+        return recorded["sha256"] == entry["sha256"]
+
+    def filter_changed(self, file_paths: Iterable[Path], full_refresh: bool = False) -> List[Path]:
+        """
+        Select new or changed files and stage their manifest entries.
+
+        Args:
+            file_paths: Discovered raw file paths
+            full_refresh: Return every file regardless of the manifest
+
+        Returns:
+            Files that need processing
+        """
+        changed = []
+
+        for file_path in file_paths:
+            stat = file_path.stat()
+            key = str(file_path)
+            entry: Dict[str, Any] = {"size": stat.st_size, "mtime": stat.st_mtime}
+
+            if not full_refresh and self._is_unchanged(key, entry, file_path):
+                if entry["mtime"] != self.entries[key]["mtime"]:
+                    self._pending[key] = entry
+                continue
+
+            if "sha256" not in entry:
+                entry["sha256"] = file_sha256(file_path)
+            self._pending[key] = entry
+            changed.append(file_path)
+
+        logger.info(
+            f"Manifest: {len(changed)} new or changed files"
+            + (" (full refresh)" if full_refresh else "")
+        )
+        return changed
+
+    def commit(self):
+        """Persist staged entries, replacing the manifest file atomically."""
+        self.entries.update(self._pending)
+        self._pending = {}
+
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.manifest_file.with_suffix(self.manifest_file.suffix + ".tmp")
+        with open(temp_file, "w", encoding="utf8") as f:
+            json.dump({"files": self.entries}, f, indent=2, sort_keys=True)
+        os.replace(temp_file, self.manifest_file)
+
+        logger.info(f"Manifest saved: {len(self.entries)} files recorded")
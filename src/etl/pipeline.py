@@ -1,90 +1,197 @@
 """Complete ETL pipeline orchestration."""
 
 import time
-from typing import Any, Dict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from loguru import logger
 
-from src.db.connection import CassandraConnection
-from src.db.schema import CassandraSchema
+from src.db.null import NullSession
+from src.etl.batching import DEFAULT_MAX_BATCH_BYTES
+from src.etl.checkpoint import LoadCheckpoint, source_fingerprint
 from src.etl.extract import EventDataExtractor
-from src.etl.load import EventDataLoader
+from src.etl.load import EventDataLoader, read_records
+from src.etl.manifest import FileManifest
+from src.etl.sort import PartitionSorter
+from src.etl.throttle import AdaptiveThrottle
 from src.etl.transform import EventDataTransformer
+from src.utils.metrics import PipelineMetrics
+
+# The driver (src.db.connection, src.db.schema) and pandas (src.etl.columnar)
+# are imported where they are used, so dry runs and the python engine don't load them
+if TYPE_CHECKING:
+    from src.db.connection import CassandraConnection
+    from src.db.queries import EventQueryService
+    from src.utils.profiling import PhaseProfiler
+
+# How the query cache is refreshed after a load (``queries.refresh_after_load``)
+QUERY_REFRESH_MODES = ("prewarm", "invalidate")
 
 
 class ETLPipeline:
     """Orchestrates the complete ETL pipeline."""
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        full_refresh: bool = False,
+        resume: bool = False,
+        query_service: Optional["EventQueryService"] = None,
+        dry_run: bool = False,
+        profiler: Optional["PhaseProfiler"] = None,
+    ):
         """
         Initialize ETL pipeline.
 
         Args:
             config: Configuration dictionary
+            full_refresh: Process every raw file even if the manifest says it
+                was already loaded
+            resume: Continue an interrupted load from its saved checkpoint
+            query_service: Query service whose cache is refreshed after each load.
+                When omitted and the ``queries`` section is configured, ``open``
+                builds one on the kept session.
+            dry_run: Extract and transform as usual but send the loader's writes
+                to a counting ``NullSession`` instead of Cassandra. No checkpoint,
+                manifest, query cache or metrics file is updated.
+            profiler: Profiler collecting CPU or memory profiles per phase (optional)
+
+        Raises:
+            ValueError: If ``queries.refresh_after_load`` is unknown
         """
+        refresh_mode = (config.get("queries") or {}).get("refresh_after_load", "prewarm")
+        if refresh_mode not in QUERY_REFRESH_MODES:
+            logger.error(
+                f"Unknown query cache refresh mode '{refresh_mode}', "
+                f"expected one of {QUERY_REFRESH_MODES}"
+            )
+            raise ValueError(f"Unknown query cache refresh mode: {refresh_mode}")
+
         self.config = config
-        self.stats = {
+        self.full_refresh = full_refresh
+        self.resume = resume
+        self.query_service = query_service
+        self.query_refresh_mode = refresh_mode
+        self._owns_query_service = False
+        self.dry_run = dry_run
+        self.profiler = profiler
+        self._checkpoint: Optional[LoadCheckpoint] = None
+        self._connection: Optional["CassandraConnection"] = None
+        self.session = None
+        self._prepared: Dict[str, Any] = {}
+        self.schema_drift: Dict[str, List[str]] = {}
+        self.metrics = PipelineMetrics(profiler=self.profiler)
+        self.stats = self._new_stats()
+
+    @staticmethod
+    def _new_stats() -> Dict[str, Any]:
+        """Get the statistics of a run that hasn't started."""
+        return {
             "start_time": None,
             "end_time": None,
             "duration_seconds": None,
+            "files_processed": 0,
             "rows_extracted": 0,
+            "rows_skipped": 0,
             "rows_transformed": 0,
             "rows_loaded": {},
         }
 
+    def open(self):
+        """
+        Connect once and keep the session for every following run.
+
+        The keyspace and tables are created here instead of in each run, and
+        prepared statements are reused across runs, so a run only pays for
+        its own rows. When the ``queries`` section is configured and no query
+        service was passed in, one is built on this session so its cache is
+        refreshed after every run. Call ``close`` when done.
+
+        Returns:
+            The open Cassandra session
+        """
+        if self.session is None and self.dry_run:
+            self.session = NullSession()
+        elif self.session is None:
+            self._connection = self._connect()
+            self.session = self._connection.connect()
+            self._create_schema(self.session)
+            logger.info("Pipeline session kept open between runs")
+            if self.query_service is None and self.config.get("queries") is not None:
+                self.query_service = self._create_query_service(self.session)
+                self._owns_query_service = True
+        return self.session
+
+    def close(self):
+        """Close the session kept by ``open``."""
+        if self._connection:
+            self._connection.close()
+        self._connection = None
+        self.session = None
+        self._prepared = {}
+        if self._owns_query_service:
+            self.query_service = None
+            self._owns_query_service = False
+
+    @contextmanager
+    def _session(self):
+        """Use the open session, or connect and create the schema for this run only."""
+        if self.session is not None:
+            yield self.session
+            return
+
+        if self.dry_run:
+            session = NullSession()
+            yield session
+            self.stats["dry_run_requests"] = session.stats()
+            return
+
+        with self._connect() as session:
+            with self.metrics.phase("schema"):
+                self._create_schema(session)
+            yield session
+
     def run(self) -> Dict[str, Any]:
         """
         Execute the complete ETL pipeline.
 
+        Statistics and metrics cover one run; calling ``run`` again (e.g. from
+        a watcher) starts them afresh.
+
         Returns:
             Dictionary with pipeline execution statistics
         """
+        self.stats = self._new_stats()
+        self.metrics = PipelineMetrics(profiler=self.profiler)
         self.stats["start_time"] = time.time()
         logger.info("=" * 60)
         logger.info("STARTING ETL PIPELINE")
         logger.info("=" * 60)
 
         try:
-            # Extract
-            logger.info("PHASE 1: EXTRACTION")
-            extractor = EventDataExtractor(self.config["data"]["raw_folder"])
-            data_rows = extractor.extract()
-            self.stats["rows_extracted"] = len(data_rows)
-
-            # Transform
-            logger.info("PHASE 2: TRANSFORMATION")
-            transformer = EventDataTransformer(
-                self.config["data"]["processed_file"],
-                skip_empty_artist=self.config["etl"].get("skip_empty_artist", True),
-            )
-            output_file = transformer.transform(data_rows)
-            self.stats["rows_transformed"] = len(data_rows) - transformer.rows_skipped
-
-            # Load
-            logger.info("PHASE 3: LOADING INTO CASSANDRA")
+            with self.metrics.phase("discover"):
+                extractor = EventDataExtractor(
+                    self.config["data"]["raw_folder"],
+                    engine=self.config["etl"].get("extract_engine", "csv"),
+                    columns=EventDataTransformer.OUTPUT_COLUMNS,
+                )
+                # Sorted so a resumed run reads records in the same order
+                file_paths = sorted(extractor.get_file_paths())
 
-            # Connect to Cassandra
-            cassandra_config = self.config["cassandra"]
-            connection = CassandraConnection(
-                hosts=cassandra_config["hosts"], port=cassandra_config.get("port", 9042)
-            )
+                manifest = None
+                if self.config["etl"].get("incremental", False):
+                    manifest = FileManifest(self.config["data"]["manifest_file"])
+                    file_paths = manifest.filter_changed(file_paths, full_refresh=self.full_refresh)
+            self.stats["files_processed"] = len(file_paths)
 
-            with connection as session:
-                # Create keyspace and tables
-                logger.info("Creating keyspace and tables...")
-                schema = CassandraSchema(session)
-                schema.create_keyspace(
-                    keyspace=cassandra_config["keyspace"],
-                    replication_class=cassandra_config["replication"]["class"],
-                    replication_factor=cassandra_config["replication"]["replication_factor"],
-                )
-                session.set_keyspace(cassandra_config["keyspace"])
-                schema.create_all_tables()
+            if file_paths:
+                self._run_files(extractor, file_paths)
+            else:
+                logger.info("No new or changed files - nothing to load")
 
-                # Load data
-                loader = EventDataLoader(session, output_file)
-                load_results = loader.load_all_tables()
-                self.stats["rows_loaded"] = load_results
+            if manifest and not self.dry_run:
+                manifest.commit()
 
             # Calculate statistics
             self.stats["end_time"] = time.time()
@@ -92,6 +199,8 @@ class ETLPipeline:
                 self.stats["end_time"] - self.stats["start_time"], 2
             )
 
+            self._record_metrics(file_paths)
+
             # Log summary
             self._log_summary()
 
@@ -103,8 +212,354 @@ class ETLPipeline:
 
         except Exception as e:
             logger.error(f"Pipeline failed: {e}")
+            self.metrics.increment("pipeline_failures")
+            self._export_metrics()
             raise
 
+    def _run_files(self, extractor: EventDataExtractor, file_paths: List[Path]):
+        """
+        Extract, transform and load the given raw files.
+
+        Args:
+            extractor: Extractor for the raw data folder
+            file_paths: Raw files to process
+        """
+        processed_file = self.config["data"]["processed_file"]
+        skip_empty_artist = self.config["etl"].get("skip_empty_artist", True)
+
+        checkpoint_file = self.config["etl"].get("checkpoint_file")
+        if checkpoint_file and not self.dry_run:
+            self._checkpoint = LoadCheckpoint(
+                checkpoint_file, source_fingerprint(file_paths), resume=self.resume
+            )
+
+        if self._columnar():
+            from src.etl.columnar import ColumnarEventTransformer
+
+            # Columnar engine reads raw files itself and counts extracted rows
+            transformer = ColumnarEventTransformer(processed_file, skip_empty_artist)
+            reader, source = transformer, file_paths
+        else:
+            transformer = EventDataTransformer(
+                processed_file, skip_empty_artist, input_columns=extractor.columns
+            )
+            chunks = self._extract_chunks(extractor, file_paths)
+            reader, source = extractor, self.metrics.timed("extract", chunks, snapshot=True)
+
+        if self.config["etl"].get("handoff", "file") == "memory":
+            self._run_in_memory(reader, transformer, source)
+        else:
+            self._run_with_file(reader, transformer, source)
+
+    def _run_with_file(self, reader, transformer, source):
+        """
+        Transform into the consolidated CSV file, then load it into Cassandra.
+
+        Args:
+            reader: Object counting the raw rows read (``rows_extracted``)
+            transformer: Transformer writing the consolidated file
+            source: Raw row chunks, or raw file paths for the columnar engine
+        """
+        # Extract and transform, streaming rows in bounded chunks
+        logger.info("PHASE 1-2: EXTRACTION AND TRANSFORMATION")
+        with self.metrics.phase("transform"):
+            if self._columnar():
+                output_file = transformer.transform(source)
+            else:
+                output_file = transformer.transform_chunks(source)
+        self._record_transform_stats(reader, transformer)
+
+        # Load
+        logger.info("PHASE 3: LOADING INTO CASSANDRA")
+        files = self._sort(read_records(Path(output_file))) if self._sort_enabled() else None
+
+        with self._session() as session:
+            loader = self._create_loader(session, output_file)
+            with self.metrics.phase("load"):
+                if files:
+                    self.stats["rows_loaded"] = loader.load_sorted_tables(files)
+                else:
+                    self.stats["rows_loaded"] = loader.load_all_tables()
+            self._finish_load(loader)
+
+    def _run_in_memory(self, reader, transformer, source):
+        """
+        Stream transformed records straight into Cassandra without re-reading a file.
+
+        The consolidated CSV file is written from a background thread only
+        when ``etl.write_processed_file`` is enabled.
+
+        Args:
+            reader: Object counting the raw rows read (``rows_extracted``)
+            transformer: Transformer producing typed records
+            source: Raw row chunks, or raw file paths for the columnar engine
+        """
+        logger.info("PHASE 1-3: EXTRACTION, TRANSFORMATION AND LOADING (IN MEMORY)")
+        records = transformer.iter_records(
+            source, write_file=self.config["etl"].get("write_processed_file", False)
+        )
+        # Pulling records runs extraction and transformation inside the sort or load
+        records = self.metrics.timed("transform", records)
+        files = self._sort(records) if self._sort_enabled() else None
+
+        with self._session() as session:
+            loader = self._create_loader(session)
+            with self.metrics.phase("load"):
+                if files:
+                    self.stats["rows_loaded"] = loader.load_sorted_tables(files)
+                else:
+                    self.stats["rows_loaded"] = loader.load_records(records)
+            self._finish_load(loader)
+
+        self._record_transform_stats(reader, transformer)
+
+    def _sort_enabled(self) -> bool:
+        """Check whether records are sorted into per-table files before loading."""
+        return self.config["etl"].get("sort", {}).get("enabled", False)
+
+    def _sort(self, records) -> Dict[str, Path]:
+        """
+        Write records to per-table files sorted by primary key.
+
+        With ``etl.dedup`` the sort keeps only the last row per primary key,
+        so the loader doesn't need a second read of the data.
+
+        Args:
+            records: Typed event records
+
+        Returns:
+            Sorted file path per table
+        """
+        sort_config = self.config["etl"]["sort"]
+        logger.info("PHASE 2b: SORTING BY PARTITION AND CLUSTERING KEY")
+        sorter = PartitionSorter(
+            sort_config.get("output_folder", "data/sorted"),
+            memory_mb=sort_config.get("memory_mb", 256),
+            dedup=self.config["etl"].get("dedup", False),
+            temp_folder=sort_config.get("temp_folder"),
+        )
+        with self.metrics.phase("sort"):
+            files = sorter.sort(records)
+
+        self.stats["rows_sorted"] = sorter.rows_written
+        self.stats["sort_runs_spilled"] = sorter.runs_spilled
+        if sorter.dedup:
+            self.stats["rows_deduplicated"] = sorter.rows_deduplicated
+            self.metrics.increment("rows_deduplicated", sum(sorter.rows_deduplicated.values()))
+        return files
+
+    def _extract_chunks(self, extractor: EventDataExtractor, file_paths: List[Path]):
+        """
+        Start streaming raw rows, serially or with a process pool.
+
+        Args:
+            extractor: Extractor for the raw data folder
+            file_paths: Raw files to read
+
+        Returns:
+            Iterator of raw data row chunks
+        """
+        workers = self.config["etl"].get("extract_workers", 1)
+        chunk_size = self.config["etl"].get("chunk_size", 10000)
+        if workers > 1:
+            return extractor.iter_chunks_parallel(
+                file_paths,
+                workers=workers,
+                ordered=self.config["etl"].get("extract_ordered", True),
+                chunk_size=chunk_size,
+            )
+
+        return extractor.iter_chunks(file_paths, chunk_size=chunk_size)
+
+    def _record_transform_stats(self, reader, transformer):
+        """Record extraction and transformation row counts."""
+        self.stats["rows_extracted"] = reader.rows_extracted
+        self.stats["rows_skipped"] = transformer.rows_skipped
+        self.stats["rows_transformed"] = reader.rows_extracted - transformer.rows_skipped
+
+    def _columnar(self) -> bool:
+        """Check whether the pandas-based columnar transform engine is configured."""
+        return self.config["etl"].get("transform_engine", "python") == "columnar"
+
+    def _connect(self) -> "CassandraConnection":
+        """Create the Cassandra connection from configuration."""
+        from src.db.connection import CassandraConnection
+
+        cassandra_config = self.config["cassandra"]
+        return CassandraConnection(
+            hosts=cassandra_config["hosts"],
+            port=cassandra_config.get("port", 9042),
+            driver=cassandra_config.get("driver"),
+        )
+
+    def _create_query_service(self, session) -> "EventQueryService":
+        """
+        Create the query service from the ``queries`` configuration.
+
+        Args:
+            session: Active Cassandra session using the project keyspace
+
+        Returns:
+            Query service reading through the session
+        """
+        from src.db.queries import EventQueryService
+
+        queries_config = self.config["queries"] or {}
+        return EventQueryService(
+            session,
+            cache_size=queries_config.get("cache_size", 1024),
+            ttl_seconds=queries_config.get("ttl_seconds", 60.0),
+        )
+
+    def _create_schema(self, session):
+        """
+        Create the missing keyspace and tables, switch the session to the keyspace
+        and record any drift of existing tables from the expected schema.
+
+        Args:
+            session: Active Cassandra session
+        """
+        from src.db.schema import CassandraSchema
+
+        cassandra_config = self.config["cassandra"]
+
+        logger.info("Creating missing keyspace and tables...")
+        self.schema_drift = CassandraSchema(session).bootstrap(
+            keyspace=cassandra_config["keyspace"],
+            replication_class=cassandra_config["replication"]["class"],
+            replication_factor=cassandra_config["replication"]["replication_factor"],
+        )
+        if self.schema_drift:
+            self.stats["schema_drift"] = self.schema_drift
+
+    def _create_loader(self, session, data_file: Optional[str] = None) -> EventDataLoader:
+        """
+        Create the loader from ETL configuration.
+
+        Args:
+            session: Active Cassandra session
+            data_file: Consolidated CSV file, or None for in-memory records
+
+        Returns:
+            Configured loader
+        """
+        etl_config = self.config["etl"]
+        return EventDataLoader(
+            session,
+            data_file,
+            batch_size=etl_config.get("batch_size"),
+            fan_out=etl_config.get("fan_out", False),
+            batch_rows=etl_config.get("batch_rows"),
+            batch_max_bytes=etl_config.get("batch_max_bytes", DEFAULT_MAX_BATCH_BYTES),
+            checkpoint=self._checkpoint,
+            checkpoint_interval=etl_config.get("checkpoint_interval", 10000),
+            throttle=self._create_throttle(),
+            metrics=self.metrics,
+            # A sorted load is already deduplicated by the sort
+            dedup=etl_config.get("dedup", False) and not self._sort_enabled(),
+            prepared=self._prepared if self.session is not None else None,
+        )
+
+    def _create_throttle(self) -> Optional[AdaptiveThrottle]:
+        """
+        Create the adaptive write throttle from ``etl.throttle`` configuration.
+
+        Returns:
+            Throttle, or None when throttling is disabled
+        """
+        throttle_config = self.config["etl"].get("throttle", {})
+        if not throttle_config.get("enabled", False):
+            return None
+
+        return AdaptiveThrottle(
+            initial_window=self.config["etl"].get("batch_size") or 100,
+            min_window=throttle_config.get("min_window", 1),
+            max_window=throttle_config.get("max_window", 1000),
+            target_latency_ms=throttle_config.get("target_latency_ms", 50.0),
+            max_rows_per_second=throttle_config.get("max_rows_per_second"),
+            max_retries=throttle_config.get("max_retries", 5),
+        )
+
+    def _finish_load(self, loader: EventDataLoader):
+        """Record load statistics and drop the finished checkpoint."""
+        if loader.throttle:
+            self.stats["throttle"] = loader.throttle.stats()
+            logger.info(f"Throttle: {self.stats['throttle']}")
+            for counter in ("timeouts", "overloads"):
+                self.metrics.increment(f"write_{counter}", self.stats["throttle"][counter])
+
+        if loader.rows_deduplicated:
+            self.stats["rows_deduplicated"] = loader.rows_deduplicated
+            self.stats["write_amplification"] = loader.write_amplification
+            self.metrics.increment("rows_deduplicated", sum(loader.rows_deduplicated.values()))
+            logger.info(
+                f"Dropped superseded writes: {loader.rows_deduplicated} "
+                f"(write amplification avoided: {loader.write_amplification})"
+            )
+
+        if loader.rows_resumed:
+            self.stats["rows_resumed"] = loader.rows_resumed
+            logger.info(f"Resumed load skipped already acknowledged rows: {loader.rows_resumed}")
+
+        if self._checkpoint:
+            self._checkpoint.clear()
+
+        if self.query_service and not self.dry_run:
+            self._refresh_query_cache()
+
+    def _refresh_query_cache(self):
+        """Invalidate or re-warm the query cache so reads see the new data."""
+        if self.query_refresh_mode == "prewarm":
+            self.query_service.refresh()
+        else:
+            self.query_service.invalidate()
+
+        self.stats["query_cache"] = self.query_service.cache.stats()
+
+    def _record_metrics(self, file_paths: List[Path]):
+        """
+        Record stage volumes, add the metrics to the statistics and export them.
+
+        Args:
+            file_paths: Raw files processed in this run
+        """
+        etl_config = self.config["etl"]
+        processed_file = Path(self.config["data"]["processed_file"])
+        written = (
+            file_paths
+            and processed_file.exists()
+            and (
+                etl_config.get("handoff", "file") == "file"
+                or etl_config.get("write_processed_file")
+            )
+        )
+
+        self.metrics.record_stage(
+            "extract",
+            self.stats["rows_extracted"],
+            bytes=sum(path.stat().st_size for path in file_paths),
+        )
+        self.metrics.record_stage(
+            "transform",
+            self.stats["rows_transformed"],
+            bytes=processed_file.stat().st_size if written else None,
+        )
+        self.metrics.record_stage("load", sum(self.stats["rows_loaded"].values()))
+
+        self.stats["metrics"] = self.metrics.to_dict()
+        self._export_metrics()
+
+    def _export_metrics(self):
+        """Write metrics to the files configured under ``metrics``, except for dry runs."""
+        if self.dry_run:
+            return
+
+        metrics_config = self.config.get("metrics", {})
+        self.metrics.export(
+            json_file=metrics_config.get("json_file"),
+            prometheus_file=metrics_config.get("prometheus_file"),
+        )
+
     def _log_summary(self):
         """Log pipeline execution summary."""
         logger.info("")
@@ -112,15 +567,29 @@ class ETLPipeline:
         logger.info("PIPELINE EXECUTION SUMMARY")
         logger.info("=" * 60)
         logger.info(f"Duration: {self.stats['duration_seconds']} seconds")
+        logger.info(f"Files Processed: {self.stats['files_processed']}")
         logger.info(f"Rows Extracted: {self.stats['rows_extracted']}")
+        logger.info(f"Rows Skipped: {self.stats['rows_skipped']}")
         logger.info(f"Rows Transformed: {self.stats['rows_transformed']}")
-        logger.info("Rows Loaded:")
+        loaded = "Expected Writes (dry run)" if self.dry_run else "Rows Loaded"
+        logger.info(f"{loaded}:")
         for table, count in self.stats["rows_loaded"].items():
             logger.info(f"  - {table}: {count}")
-        logger.info(f"Total Rows Loaded: {sum(self.stats['rows_loaded'].values())}")
+        logger.info(f"Total {loaded}: {sum(self.stats['rows_loaded'].values())}")
+        if "dry_run_requests" in self.stats:
+            logger.info(f"Requests that would be sent: {self.stats['dry_run_requests']}")
+
+        logger.info("Phases:")
+        for phase, seconds in self.metrics.phases.items():
+            throughput = self.metrics.stage_throughput(phase).get("rows_per_second")
+            rate = f" ({throughput:,.0f} rows/second)" if throughput else ""
+            logger.info(f"  - {phase}: {seconds:.2f} seconds{rate}")
 
-        if self.stats["duration_seconds"] > 0:
-            throughput = self.stats["rows_transformed"] / self.stats["duration_seconds"]
-            logger.info(f"Throughput: {throughput:.2f} rows/second")
+        for table, latency in self.stats["metrics"]["insert_latency"].items():
+            if latency["count"]:
+                logger.info(
+                    f"Insert latency {table}: p50 {latency['p50_ms']}ms, "
+                    f"p95 {latency['p95_ms']}ms, p99 {latency['p99_ms']}ms"
+                )
 
         logger.info("=" * 60)
@@ -0,0 +1,44 @@
+"""Typed event record shared by the transform and load phases."""
+
+from typing import List, NamedTuple
+
+
+class EventRecord(NamedTuple):
+    """A consolidated event row with numeric columns already converted."""
+
+    artist: str
+    firstName: str
+    gender: str
+    itemInSession: int
+    lastName: str
+    length: float
+    level: str
+    location: str
+    sessionId: int
+    song: str
+    userId: int
+
+    @classmethod
+    def from_row(cls, row: List[str]) -> "EventRecord":
+        """
+        Build a record from a consolidated CSV row.
+
+        Args:
+            row: Row in ``EventDataTransformer.OUTPUT_COLUMNS`` order
+
+        Returns:
+            Typed event record
+        """
+        return cls(
+            row[0],
+            row[1],
+            row[2],
+            int(row[3]),
+            row[4],
+            float(row[5]),
+            row[6],
+            row[7],
+            int(row[8]),
+            row[9],
+            int(row[10]),
+        )
@@ -0,0 +1,358 @@
+"""Per-table output sorted by primary key, with an external merge sort."""
+
+import csv
+import heapq
+import pickle
+import sys
+import tempfile
+from contextlib import ExitStack
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from src.db.tables import CQL_TYPES, TABLE_SPECS, TableSpec
+from src.etl.records import EventRecord
+
+# Columns of each table in INSERT parameter order; the primary key comes first
+TABLE_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    table: spec.column_names for table, spec in TABLE_SPECS.items()
+}
+
+# Number of leading columns forming the primary key (partition + clustering)
+PRIMARY_KEY_COLUMNS: Dict[str, int] = {
+    table: len(spec.primary_key) for table, spec in TABLE_SPECS.items()
+}
+
+# Parsers of the non-text columns of every table
+COLUMN_TYPES: Dict[str, Callable[[str], Any]] = {
+    column.name: CQL_TYPES[column.cql_type]
+    for spec in TABLE_SPECS.values()
+    for column in spec.columns
+    if CQL_TYPES[column.cql_type] is not str
+}
+
+MAX_MERGE_FAN_IN = 64
+_SPILL_BLOCK_ROWS = 4096
+_SIZE_SAMPLE_ROWS = 1000
+
+
+def _write_run(rows: Iterable[tuple], temp_folder: Optional[str]) -> Path:
+    """Write sorted rows to a temporary run file as pickled blocks, removing it on failure."""
+    with tempfile.NamedTemporaryFile(
+        "wb", dir=temp_folder, prefix="sort-run-", suffix=".bin", delete=False
+    ) as f:
+        try:
+            iterator = iter(rows)
+            while block := list(islice(iterator, _SPILL_BLOCK_ROWS)):
+                pickle.dump(block, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except BaseException:
+            f.close()
+            Path(f.name).unlink(missing_ok=True)
+            raise
+    return Path(f.name)
+
+
+def _read_run(path: Path) -> Iterator[tuple]:
+    """Stream the rows of a run file, deleting it once read."""
+    try:
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    yield from pickle.load(f)
+                except EOFError:
+                    return
+    finally:
+        path.unlink(missing_ok=True)
+
+
+class _Descending:
+    """Sort key part ordering its value from high to low."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+def _sort_key(key_length: int, descending: Sequence[int] = ()) -> Callable[[tuple], Any]:
+    """
+    Build the key comparing the leading columns of a row.
+
+    Args:
+        key_length: Number of leading columns compared
+        descending: Positions of the columns ordered from high to low
+
+    Returns:
+        ``itemgetter`` when every column is ascending, else a function
+        wrapping the descending values
+    """
+    if not descending:
+        return itemgetter(*range(key_length))
+
+    reverse = [position in descending for position in range(key_length)]
+    return lambda row: tuple(
+        _Descending(value) if flip else value
+        for value, flip in zip(row[:key_length], reverse, strict=True)
+    )
+
+
+class ExternalSorter:
+    """
+    Sort rows by their leading key columns within a memory budget.
+
+    Rows are buffered until their estimated size reaches the budget, then
+    sorted and spilled to a temporary run file. Iterating merges the runs
+    and the in-memory remainder; runs beyond ``MAX_MERGE_FAN_IN`` are first
+    merged into larger runs so open files stay bounded. The sort is stable,
+    so rows with equal keys keep their input order. Run files are deleted as
+    they are read, and by ``close`` if the sort stops early or fails; the
+    iterator closes the sorter when it ends.
+
+    Usage:
+        with ExternalSorter(key_length=2, memory_bytes=64 << 20) as sorter:
+            for row in rows:
+                sorter.add(row)
+            for row in sorter:
+                ...
+    """
+
+    def __init__(
+        self,
+        key_length: int,
+        memory_bytes: int,
+        temp_folder: Optional[str] = None,
+        descending: Sequence[int] = (),
+    ):
+        """
+        Initialize sorter.
+
+        Args:
+            key_length: Number of leading columns compared
+            memory_bytes: Approximate memory allowed for buffered rows
+            temp_folder: Folder for run files (default: system temp folder)
+            descending: Positions of key columns sorted from high to low
+        """
+        self.key = _sort_key(key_length, descending)
+        self.memory_bytes = memory_bytes
+        self.temp_folder = temp_folder
+        self.runs: List[Path] = []
+        # Run files not deleted yet, including runs being merged
+        self._files: List[Path] = []
+        self.rows_added = 0
+        self._buffer: List[tuple] = []
+        self._max_rows: Optional[int] = None
+        self._sample_bytes = 0
+
+    def add(self, row: tuple):
+        """
+        Add a row, spilling a sorted run when the budget is reached.
+
+        Args:
+            row: Row whose leading columns are the sort key
+        """
+        self._buffer.append(row)
+        self.rows_added += 1
+
+        if self._max_rows is None:
+            self._sample_bytes += sys.getsizeof(row) + sum(map(sys.getsizeof, row))
+            if self.rows_added == _SIZE_SAMPLE_ROWS:
+                self._max_rows = max(1, self.memory_bytes * _SIZE_SAMPLE_ROWS // self._sample_bytes)
+        elif len(self._buffer) >= self._max_rows:
+            self._spill()
+
+    def _spill(self):
+        """Sort the buffer into a run file."""
+        self._buffer.sort(key=self.key)
+        self.runs.append(self._write_run(self._buffer))
+        logger.debug(f"Spilled sorted run {len(self.runs)}: {len(self._buffer)} rows")
+        self._buffer = []
+
+    def _merge(self, iterables: List[Iterable[tuple]]) -> Iterator[tuple]:
+        """Merge sorted iterables, earlier ones first among equal keys."""
+        return heapq.merge(*iterables, key=self.key)
+
+    def _write_run(self, rows: Iterable[tuple]) -> Path:
+        """Write a run file, tracking it until it is deleted."""
+        path = _write_run(rows, self.temp_folder)
+        self._files.append(path)
+        return path
+
+    def __iter__(self) -> Iterator[tuple]:
+        """Yield every added row in key order."""
+        try:
+            while len(self.runs) > MAX_MERGE_FAN_IN:
+                first, self.runs = self.runs[:MAX_MERGE_FAN_IN], self.runs[MAX_MERGE_FAN_IN:]
+                merged = self._write_run(self._merge([_read_run(run) for run in first]))
+                self.runs.insert(0, merged)
+
+            self._buffer.sort(key=self.key)
+            buffer, self._buffer = self._buffer, []
+            runs, self.runs = self.runs, []
+            yield from self._merge([*(_read_run(run) for run in runs), buffer])
+        finally:
+            self.close()
+
+    def close(self):
+        """Delete the run files left, e.g. after a failed sort or merge."""
+        for path in self._files:
+            path.unlink(missing_ok=True)
+        self._files = []
+        self.runs = []
+        self._buffer = []
+
+    def __enter__(self) -> "ExternalSorter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _keep_last(rows: Iterable[tuple], key: Callable) -> Iterator[tuple]:
+    """Drop all but the last of consecutive rows with equal keys."""
+    previous = None
+    for row in rows:
+        if previous is not None and key(row) != key(previous):
+            yield previous
+        previous = row
+    if previous is not None:
+        yield previous
+
+
+def read_sorted_table(path: Path) -> Iterator[tuple]:
+    """
+    Read a sorted table file back into typed INSERT parameters.
+
+    Args:
+        path: CSV file written by ``PartitionSorter``
+
+    Yields:
+        Rows in the table's ``TABLE_COLUMNS`` order
+    """
+    with open(path, "r", encoding="utf8", newline="") as f:
+        csv_reader = csv.reader(f)
+        header = next(csv_reader)
+        converters = [COLUMN_TYPES.get(column, str) for column in header]
+
+        for line in csv_reader:
+            yield tuple(convert(value) for convert, value in zip(converters, line, strict=True))
+
+
+class PartitionSorter:
+    """
+    Write one CSV file per query table, sorted by partition and clustering key.
+
+    Each file holds the table's columns with a header row, so it can be
+    loaded by ``EventDataLoader.load_sorted_tables`` or by bulk tools such
+    as ``cqlsh COPY FROM`` and DSBulk. Rows of a partition are contiguous
+    and in clustering order, which lets the loader fill single-partition
+    batches. Keys compare by value (ints numerically, text by code point),
+    not by token; clustering columns declared descending sort from high to
+    low. Spilled runs are removed even if the sort fails.
+
+    Usage:
+        sorter = PartitionSorter("data/sorted", memory_mb=256)
+        files = sorter.sort(records)
+    """
+
+    def __init__(
+        self,
+        output_folder: str,
+        memory_mb: float = 256,
+        dedup: bool = False,
+        temp_folder: Optional[str] = None,
+        specs: Optional[Dict[str, TableSpec]] = None,
+    ):
+        """
+        Initialize sorter.
+
+        Args:
+            output_folder: Folder for the ``<table>.csv`` files
+            memory_mb: Memory budget shared by the tables' sort buffers
+            dedup: Keep only the last row per primary key of each table
+            temp_folder: Folder for spilled runs (default: system temp folder)
+            specs: Tables to write (default: ``TABLE_SPECS``)
+        """
+        self.specs = TABLE_SPECS if specs is None else specs
+        self.output_folder = Path(output_folder)
+        self.memory_mb = memory_mb
+        self.dedup = dedup
+        self.temp_folder = temp_folder
+        self.rows_written: Dict[str, int] = {}
+        self.rows_deduplicated: Dict[str, int] = {}
+        self.runs_spilled: Dict[str, int] = {}
+
+        self.output_folder.mkdir(parents=True, exist_ok=True)
+
+    def sort(self, records: Iterable[EventRecord]) -> Dict[str, Path]:
+        """
+        Sort records into per-table files.
+
+        Args:
+            records: Typed event records
+
+        Returns:
+            Sorted file path per table
+        """
+        budget = int(self.memory_mb * (1 << 20)) // len(self.specs)
+        files = {}
+
+        with ExitStack() as stack:
+            sorters = {
+                table: stack.enter_context(
+                    ExternalSorter(
+                        len(spec.primary_key),
+                        budget,
+                        self.temp_folder,
+                        descending=[spec.column_names.index(c) for c in spec.descending],
+                    )
+                )
+                for table, spec in self.specs.items()
+            }
+            adds = [(sorters[table].add, spec.converter()) for table, spec in self.specs.items()]
+
+            for record in records:
+                for add, to_params in adds:
+                    add(to_params(record))
+
+            for table, sorter in sorters.items():
+                self.runs_spilled[table] = len(sorter.runs)
+                files[table] = self._write_table(table, sorter)
+        logger.info(
+            f"Sorted tables written to {self.output_folder}: {self.rows_written} "
+            f"(runs spilled: {self.runs_spilled})"
+        )
+        return files
+
+    def _write_table(self, table: str, sorter: ExternalSorter) -> Path:
+        """Merge a table's sorted rows into its CSV file."""
+        rows: Iterable[tuple] = iter(sorter)
+        if self.dedup:
+            rows = _keep_last(rows, sorter.key)
+
+        path = self.output_folder / f"{table}.csv"
+        temp = path.with_name(f"{path.name}.tmp")
+        count = 0
+        try:
+            with open(temp, "w", encoding="utf8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(self.specs[table].column_names)
+                for row in rows:
+                    writer.writerow(row)
+                    count += 1
+        except BaseException:
+            temp.unlink(missing_ok=True)
+            raise
+        temp.replace(path)
+
+        self.rows_written[table] = count
+        self.rows_deduplicated[table] = sorter.rows_added - count
+        return path
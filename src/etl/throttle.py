@@ -0,0 +1,164 @@
+"""Adaptive concurrency and rate limiting for Cassandra writes."""
+
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+
+@lru_cache(maxsize=None)
+def overload_errors() -> Tuple[type, ...]:
+    """
+    Get the errors signalling an overloaded cluster: back off and retry the write.
+
+    The driver is imported on first use, so importing the throttle (and the
+    writer) doesn't load it; an ``except overload_errors()`` clause is only
+    evaluated once an error is raised.
+
+    Returns:
+        Driver timeout and overload error types
+    """
+    from cassandra import OperationTimedOut, Timeout
+    from cassandra.protocol import OverloadedErrorMessage
+
+    return (Timeout, OperationTimedOut, OverloadedErrorMessage)
+
+
+class AdaptiveThrottle:
+    """
+    AIMD controller for the number of writes in flight, with an optional rate cap.
+
+    The window grows by ``increase`` after each full window of writes that
+    complete under ``target_latency_ms`` and is multiplied by ``decrease``
+    when latency exceeds the target or the cluster reports a timeout or
+    overload. Decreases are applied at most once per window of writes so a
+    burst of slow responses doesn't collapse it to the minimum.
+    """
+
+    def __init__(
+        self,
+        initial_window: int = 100,
+        min_window: int = 1,
+        max_window: int = 1000,
+        target_latency_ms: float = 50.0,
+        increase: int = 1,
+        decrease: float = 0.5,
+        max_rows_per_second: Optional[float] = None,
+        max_retries: int = 5,
+    ):
+        """
+        Initialize throttle.
+
+        Args:
+            initial_window: Writes in flight to start with
+            min_window: Lower bound of the window
+            max_window: Upper bound of the window
+            target_latency_ms: Write latency above which the window shrinks
+            increase: Additive increase per window of fast writes
+            decrease: Multiplicative decrease factor on slow or failed writes
+            max_rows_per_second: Hard ceiling on rows sent per second (optional)
+            max_retries: Retries of a write that failed with a timeout or overload
+        """
+        self.min_window = min_window
+        self.max_window = max_window
+        self.window = max(min_window, min(initial_window, max_window))
+        self.target_latency = target_latency_ms / 1000
+        self.increase = increase
+        self.decrease = decrease
+        self.max_rows_per_second = max_rows_per_second
+        self.max_retries = max_retries
+
+        self.counters: Dict[str, Any] = {
+            "increases": 0,
+            "decreases": 0,
+            "timeouts": 0,
+            "overloads": 0,
+            "retries": 0,
+            "throttled_seconds": 0.0,
+            "min_window_seen": self.window,
+            "max_window_seen": self.window,
+        }
+        self._acks_since_change = 0
+        self._next_send = time.perf_counter()
+
+    def acquire(self, rows: int = 1):
+        """
+        Wait until sending ``rows`` more rows stays under the rate ceiling.
+
+        Args:
+            rows: Number of rows about to be sent
+        """
+        if not self.max_rows_per_second:
+            return
+
+        now = time.perf_counter()
+        if self._next_send > now:
+            delay = self._next_send - now
+            time.sleep(delay)
+            self.counters["throttled_seconds"] += delay
+        else:
+            self._next_send = now
+
+        self._next_send += rows / self.max_rows_per_second
+
+    def on_success(self, latency: float):
+        """
+        Adjust the window after an acknowledged write.
+
+        Args:
+            latency: Observed write latency in seconds
+        """
+        self._acks_since_change += 1
+
+        if latency > self.target_latency:
+            self._shrink(f"latency {latency * 1000:.1f}ms above target")
+        elif self._acks_since_change >= self.window and self.window < self.max_window:
+            self._set_window(self.window + self.increase)
+            self.counters["increases"] += 1
+            logger.debug(f"Throttle window increased to {self.window}")
+
+    def on_error(self, error: Exception):
+        """
+        Shrink the window after a timeout or overload error.
+
+        Args:
+            error: Error raised by the write
+        """
+        overloaded = overload_errors()[-1]
+        kind = "overloads" if isinstance(error, overloaded) else "timeouts"
+        self.counters[kind] += 1
+        self.counters["retries"] += 1
+        self._shrink(f"{type(error).__name__}: {error}", force=True)
+
+    def _shrink(self, reason: str, force: bool = False):
+        """Apply a multiplicative decrease, at most once per window unless forced."""
+        if not force and self._acks_since_change < self.window:
+            return
+
+        new_window = max(self.min_window, int(self.window * self.decrease))
+        if new_window != self.window:
+            logger.info(f"Throttle window decreased {self.window} -> {new_window} ({reason})")
+            self._set_window(new_window)
+            self.counters["decreases"] += 1
+        self._acks_since_change = 0
+
+    def _set_window(self, window: int):
+        """Set the window within bounds and track its range."""
+        self.window = max(self.min_window, min(window, self.max_window))
+        self._acks_since_change = 0
+        self.counters["min_window_seen"] = min(self.counters["min_window_seen"], self.window)
+        self.counters["max_window_seen"] = max(self.counters["max_window_seen"], self.window)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get throttle decisions for pipeline statistics.
+
+        Returns:
+            Current window and decision counters
+        """
+        return {
+            "window": self.window,
+            **self.counters,
+            "throttled_seconds": round(self.counters["throttled_seconds"], 3),
+        }
@@ -1,11 +1,112 @@
 """Data transformation and consolidation."""
 
 import csv
+import queue
+import threading
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Sequence
 
 from loguru import logger
 
+from src.etl.eventfile import DEFAULT_BLOCK_ROWS, EventFileWriter, is_event_file
+from src.etl.records import EventRecord
+
+
+class BackgroundCsvWriter:
+    """
+    Write row chunks to a QUOTE_ALL CSV file from a background thread.
+
+    The queue is bounded, so a slow disk applies back-pressure instead of
+    buffering the whole dataset in memory.
+    """
+
+    _DONE = object()
+
+    def __init__(self, output_file: Path, header: List[str], max_pending_chunks: int = 8):
+        """
+        Initialize writer and start its thread.
+
+        Args:
+            output_file: Path to output CSV file
+            header: Header row written first
+            max_pending_chunks: Maximum number of chunks waiting to be written
+        """
+        self.output_file = output_file
+        self.header = header
+        self.rows_written = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending_chunks)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="csv-audit-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Drain the queue into the output file."""
+        try:
+            self._write_chunks()
+        except Exception as e:
+            self._error = e
+            # Keep draining so producers never block on a dead writer
+            while self._queue.get() is not self._DONE:
+                pass
+
+    def _write_chunks(self):
+        """Write queued chunks until the end marker."""
+        with open(self.output_file, "w", encoding="utf8", newline="") as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_ALL, skipinitialspace=True)
+            writer.writerow(self.header)
+
+            while (chunk := self._queue.get()) is not self._DONE:
+                writer.writerows(chunk)
+                self.rows_written += len(chunk)
+
+    def write(self, rows: List[List[str]]):
+        """
+        Queue a chunk of transformed rows for writing.
+
+        Args:
+            rows: Transformed rows
+        """
+        self._queue.put(rows)
+
+    def close(self):
+        """
+        Wait for all queued rows to be written.
+
+        Raises:
+            Exception: If writing the file failed
+        """
+        self._queue.put(self._DONE)
+        self._thread.join()
+
+        if self._error is not None:
+            logger.error(f"Failed to write {self.output_file}: {self._error}")
+            raise self._error
+
+        logger.info(f"Wrote {self.rows_written} rows to {self.output_file}")
+
+
+class BackgroundEventFileWriter(BackgroundCsvWriter):
+    """Write chunks of typed records to an ``.evc`` file from a background thread."""
+
+    def __init__(self, output_file: Path, max_pending_chunks: int = 8):
+        """
+        Initialize writer and start its thread.
+
+        Args:
+            output_file: Path to output ``.evc`` file
+            max_pending_chunks: Maximum number of chunks waiting to be written
+        """
+        super().__init__(output_file, [], max_pending_chunks)
+
+    def _write_chunks(self):
+        """Write each queued chunk of records as one block."""
+        with EventFileWriter(self.output_file) as writer:
+            while (chunk := self._queue.get()) is not self._DONE:
+                writer.write(chunk)
+                self.rows_written += len(chunk)
+
 
 class EventDataTransformer:
     """Transform and consolidate event data."""
@@ -39,18 +140,34 @@ class EventDataTransformer:
         "userId",
     ]
 
-    def __init__(self, output_file: str, skip_empty_artist: bool = True):
+    def __init__(
+        self,
+        output_file: str,
+        skip_empty_artist: bool = True,
+        input_columns: Optional[Sequence[str]] = None,
+    ):
         """
         Initialize transformer.
 
         Args:
-            output_file: Path to output CSV file
+            output_file: Path to output file. A ``.evc`` extension selects the
+                typed column-block format instead of CSV.
             skip_empty_artist: Whether to skip rows with empty artist field
+            input_columns: Column names of incoming rows when the extractor
+                already projected them (default: raw file layout)
         """
         self.output_file = Path(output_file)
         self.skip_empty_artist = skip_empty_artist
         self.rows_skipped = 0
 
+        mapping = (
+            {column: input_columns.index(column) for column in self.OUTPUT_COLUMNS}
+            if input_columns
+            else self.COLUMN_MAPPING
+        )
+        self._artist_index = mapping["artist"]
+        self._project = itemgetter(*(mapping[column] for column in self.OUTPUT_COLUMNS))
+
         # Create output directory if it doesn't exist
         self.output_file.parent.mkdir(parents=True, exist_ok=True)
 
@@ -66,19 +183,7 @@ class EventDataTransformer:
         Returns:
             Transformed row
         """
-        return [
-            row[self.COLUMN_MAPPING["artist"]],
-            row[self.COLUMN_MAPPING["firstName"]],
-            row[self.COLUMN_MAPPING["gender"]],
-            row[self.COLUMN_MAPPING["itemInSession"]],
-            row[self.COLUMN_MAPPING["lastName"]],
-            row[self.COLUMN_MAPPING["length"]],
-            row[self.COLUMN_MAPPING["level"]],
-            row[self.COLUMN_MAPPING["location"]],
-            row[self.COLUMN_MAPPING["sessionId"]],
-            row[self.COLUMN_MAPPING["song"]],
-            row[self.COLUMN_MAPPING["userId"]],
-        ]
+        return list(self._project(row))
 
     def should_skip_row(self, row: List[str]) -> bool:
         """
@@ -90,16 +195,72 @@ class EventDataTransformer:
         Returns:
             True if row should be skipped, False otherwise
         """
-        if self.skip_empty_artist and row[self.COLUMN_MAPPING["artist"]] == "":
+        if self.skip_empty_artist and row[self._artist_index] == "":
             return True
         return False
 
-    def write_consolidated_csv(self, data_rows: List[List[str]]) -> int:
+    def _write_rows(self, writer, data_rows: Iterable[List[str]]) -> int:
+        """
+        Transform and write rows, counting skipped rows.
+
+        Args:
+            writer: CSV writer for the output file
+            data_rows: Raw data rows
+
+        Returns:
+            Number of rows written
+        """
+        rows_written = 0
+
+        for row in data_rows:
+            if self.should_skip_row(row):
+                self.rows_skipped += 1
+                continue
+
+            transformed_row = self.transform_row(row)
+            writer.writerow(transformed_row)
+            rows_written += 1
+
+        return rows_written
+
+    def _log_written(self, rows_written: int):
+        """Log the write summary for the output file."""
+        logger.info(f"Wrote {rows_written} rows to {self.output_file}")
+        if self.rows_skipped > 0:
+            logger.info(f"Skipped {self.rows_skipped} rows (empty artist)")
+
+    def write_consolidated_csv(self, data_rows: Iterable[List[str]]) -> int:
         """
         Write transformed data to consolidated CSV file.
 
         Args:
-            data_rows: List of raw data rows
+            data_rows: Raw data rows (a list or any iterator)
+
+        Returns:
+            Number of rows written
+        """
+        csv.register_dialect("myDialect", quoting=csv.QUOTE_ALL, skipinitialspace=True)
+
+        with open(self.output_file, "w", encoding="utf8", newline="") as f:
+            writer = csv.writer(f, dialect="myDialect")
+
+            # Write header
+            writer.writerow(self.OUTPUT_COLUMNS)
+
+            # Write data rows
+            rows_written = self._write_rows(writer, data_rows)
+
+        self._log_written(rows_written)
+        return rows_written
+
+    def write_consolidated_csv_chunks(self, chunks: Iterable[List[List[str]]]) -> int:
+        """
+        Write transformed data to consolidated CSV file chunk by chunk.
+
+        Only the chunk being written is held in memory.
+
+        Args:
+            chunks: Iterator of raw data row chunks
 
         Returns:
             Number of rows written
@@ -115,22 +276,43 @@ class EventDataTransformer:
             writer.writerow(self.OUTPUT_COLUMNS)
 
             # Write data rows
-            for row in data_rows:
+            for chunk in chunks:
+                rows_written += self._write_rows(writer, chunk)
+
+        self._log_written(rows_written)
+        return rows_written
+
+    def _iter_transformed_chunks(
+        self, chunks: Iterable[List[List[str]]]
+    ) -> Iterator[List[List[str]]]:
+        """Transform row chunks, dropping and counting skipped rows."""
+        for chunk in chunks:
+            transformed_rows = []
+            for row in chunk:
                 if self.should_skip_row(row):
                     self.rows_skipped += 1
                     continue
+                transformed_rows.append(self.transform_row(row))
+            yield transformed_rows
 
-                transformed_row = self.transform_row(row)
-                writer.writerow(transformed_row)
-                rows_written += 1
+    def write_event_file_chunks(self, chunks: Iterable[List[List[str]]]) -> int:
+        """
+        Write transformed data to a typed ``.evc`` file, one block per chunk.
 
-        logger.info(f"Wrote {rows_written} rows to {self.output_file}")
-        if self.rows_skipped > 0:
-            logger.info(f"Skipped {self.rows_skipped} rows (empty artist)")
+        Args:
+            chunks: Iterator of raw data row chunks
 
-        return rows_written
+        Returns:
+            Number of rows written
+        """
+        with EventFileWriter(self.output_file) as writer:
+            for transformed_rows in self._iter_transformed_chunks(chunks):
+                writer.write([EventRecord.from_row(row) for row in transformed_rows])
+
+        self._log_written(writer.rows_written)
+        return writer.rows_written
 
-    def transform(self, data_rows: List[List[str]]) -> str:
+    def transform(self, data_rows: Iterable[List[str]]) -> str:
         """
         Execute the complete transformation process.
 
@@ -141,6 +323,73 @@ class EventDataTransformer:
             Path to output file
         """
         logger.info("Starting data transformation...")
-        rows_written = self.write_consolidated_csv(data_rows)
+        if is_event_file(self.output_file):
+            data_rows = iter(data_rows)
+            rows_written = self.write_event_file_chunks(
+                iter(lambda: list(islice(data_rows, DEFAULT_BLOCK_ROWS)), [])
+            )
+        else:
+            rows_written = self.write_consolidated_csv(data_rows)
+        logger.success(f"Transformation completed: {rows_written} rows written")
+        return str(self.output_file)
+
+    def transform_chunks(self, chunks: Iterable[List[List[str]]]) -> str:
+        """
+        Execute the transformation process over a stream of row chunks.
+
+        Args:
+            chunks: Iterator of raw data row chunks
+
+        Returns:
+            Path to output file
+        """
+        logger.info("Starting streaming data transformation...")
+        if is_event_file(self.output_file):
+            rows_written = self.write_event_file_chunks(chunks)
+        else:
+            rows_written = self.write_consolidated_csv_chunks(chunks)
         logger.success(f"Transformation completed: {rows_written} rows written")
         return str(self.output_file)
+
+    def _audit_writer(self) -> BackgroundCsvWriter:
+        """Start the background writer matching the output file format."""
+        if is_event_file(self.output_file):
+            return BackgroundEventFileWriter(self.output_file)
+        return BackgroundCsvWriter(self.output_file, self.OUTPUT_COLUMNS)
+
+    def iter_records(
+        self, chunks: Iterable[List[List[str]]], write_file: bool = False
+    ) -> Iterator[EventRecord]:
+        """
+        Transform row chunks into typed records for direct hand-off to the loader.
+
+        Args:
+            chunks: Iterator of raw data row chunks
+            write_file: Whether to also write the consolidated file from a
+                background thread as an audit artifact
+
+        Yields:
+            Typed records for rows that are not skipped
+        """
+        logger.info("Starting in-memory data transformation...")
+        audit_writer = self._audit_writer() if write_file else None
+        rows_transformed = 0
+
+        try:
+            for transformed_rows in self._iter_transformed_chunks(chunks):
+                records = [EventRecord.from_row(row) for row in transformed_rows]
+
+                if isinstance(audit_writer, BackgroundEventFileWriter):
+                    audit_writer.write(records)
+                elif audit_writer:
+                    audit_writer.write(transformed_rows)
+
+                rows_transformed += len(records)
+                yield from records
+        finally:
+            if audit_writer:
+                audit_writer.close()
+
+        if self.rows_skipped > 0:
+            logger.info(f"Skipped {self.rows_skipped} rows (empty artist)")
+        logger.success(f"Transformation completed: {rows_transformed} rows handed off")
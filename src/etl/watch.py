@@ -0,0 +1,130 @@
+"""Long-running ingestion of raw files as they land in the raw folder."""
+
+import copy
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from src.etl.pipeline import ETLPipeline
+
+if TYPE_CHECKING:
+    from src.db.queries import EventQueryService
+
+DEFAULT_WATCH_INTERVAL = 2.0
+
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+class PipelineWatcher:
+    """
+    Poll the raw folder and run the pipeline on new files over one warm session.
+
+    The pipeline keeps its Cassandra session, schema and prepared statements
+    between runs, and runs incrementally so only files missing from the
+    manifest are processed. A change is picked up once the folder looks the
+    same on two consecutive polls, so a file still being written isn't read
+    half-way. A failed run is logged and retried on the next poll; its
+    files stay out of the manifest until a run succeeds.
+
+    Usage:
+        watcher = PipelineWatcher(config, interval=2.0)
+        watcher.run()  # Until stop() is called, e.g. from a signal handler
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        interval: float = DEFAULT_WATCH_INTERVAL,
+        query_service: Optional["EventQueryService"] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize watcher.
+
+        Args:
+            config: Configuration dictionary; ``etl.incremental`` is forced on
+            interval: Seconds between polls of the raw folder
+            query_service: Query service whose cache is refreshed after each load
+            clock: Time source for run durations (replaceable in tests)
+        """
+        self.config = copy.deepcopy(config)
+        if not self.config["etl"].get("incremental", False):
+            logger.info("Watch mode enables etl.incremental so each run only loads new files")
+            self.config["etl"]["incremental"] = True
+
+        self.raw_folder = Path(self.config["data"]["raw_folder"])
+        self.interval = interval
+        self.clock = clock
+        self.pipeline = ETLPipeline(self.config, query_service=query_service)
+        self.runs: List[Dict[str, Any]] = []
+        self.failures = 0
+        self._stop = threading.Event()
+        self._seen: Optional[Snapshot] = None
+        self._loaded: Optional[Snapshot] = None
+
+    def _snapshot(self) -> Snapshot:
+        """Get the size and mtime of every raw file without reading it."""
+        snapshot = {}
+        for path in self.raw_folder.rglob("*.csv"):
+            stat = path.stat()
+            snapshot[str(path)] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """
+        Check the raw folder once and run the pipeline if it settled on new content.
+
+        Returns:
+            Statistics of the run, or None when nothing ran
+        """
+        snapshot = self._snapshot()
+        settled = snapshot == self._seen
+        self._seen = snapshot
+
+        if not settled or snapshot == self._loaded:
+            return None
+
+        start = self.clock()
+        try:
+            stats = self.pipeline.run()
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Watch run failed, retrying on the next poll: {e}")
+            return None
+
+        self._loaded = snapshot
+        self.runs.append(stats)
+        logger.success(
+            f"Loaded {stats['files_processed']} new files "
+            f"({sum(stats['rows_loaded'].values())} rows) in {self.clock() - start:.3f}s"
+        )
+        return stats
+
+    def run(self, max_polls: Optional[int] = None):
+        """
+        Keep the session open and poll until stopped.
+
+        Args:
+            max_polls: Stop after this many polls (default: run until ``stop``)
+        """
+        logger.info(f"Watching {self.raw_folder} every {self.interval}s")
+        self.pipeline.open()
+        polls = 0
+
+        try:
+            while not self._stop.is_set():
+                self.poll()
+                polls += 1
+                if max_polls is not None and polls >= max_polls:
+                    break
+                self._stop.wait(self.interval)
+        finally:
+            self.pipeline.close()
+            logger.info(f"Watch stopped after {len(self.runs)} runs ({self.failures} failed)")
+
+    def stop(self):
+        """Ask ``run`` to return after the current poll."""
+        self._stop.set()
@@ -0,0 +1,183 @@
+"""Windowed asynchronous statement execution for Cassandra writes."""
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+from loguru import logger
+
+from src.etl.throttle import AdaptiveThrottle, overload_errors
+from src.utils.metrics import PipelineMetrics
+
+
+class _Request:
+    """A statement in flight and what is needed to retry it."""
+
+    __slots__ = ("future", "statement", "params", "table", "rows", "attempts", "times")
+
+    def __init__(self, statement, params, table: Optional[str], rows: int):
+        self.statement = statement
+        self.params = params
+        self.table = table
+        self.rows = rows
+        self.attempts = 0
+        self.future: Any = None
+        # [sent, completed]; completion is set by the driver callback when available
+        self.times: List[Optional[float]] = [None, None]
+
+
+def _mark_completed(_, times: List[Optional[float]]):
+    """Driver callback recording when a response arrived."""
+    times[1] = time.perf_counter()
+
+
+class ConcurrentWriter:
+    """
+    Send statements with a bounded number of requests in flight.
+
+    Statements are sent with ``session.execute_async`` and acknowledged in
+    submission order, so every acknowledged write is preceded only by
+    acknowledged writes. With a throttle, the window follows the throttle's
+    AIMD decisions and writes failing with a timeout or overload are retried
+    in place. With metrics, per-table write latencies, retries and errors are
+    recorded.
+
+    Usage:
+        with ConcurrentWriter(session, concurrency=100) as writer:
+            writer.submit(prepared, (1, 2), table="session_item")
+    """
+
+    def __init__(
+        self,
+        session,
+        concurrency: int = 100,
+        throttle: Optional[AdaptiveThrottle] = None,
+        metrics: Optional[PipelineMetrics] = None,
+    ):
+        """
+        Initialize writer.
+
+        Args:
+            session: Active Cassandra session
+            concurrency: Maximum number of requests in flight (ignored with a throttle)
+            throttle: Adaptive controller for the window and send rate (optional)
+            metrics: Collector for write latencies, retries and errors (optional)
+
+        Raises:
+            ValueError: If concurrency is lower than 1
+        """
+        if concurrency < 1:
+            raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+
+        self.session = session
+        self.concurrency = concurrency
+        self.throttle = throttle
+        self.metrics = metrics
+        self.rows_written: Dict[str, int] = {}
+        self._in_flight: Deque[_Request] = deque()
+
+    @property
+    def window(self) -> int:
+        """Current maximum number of requests in flight."""
+        return self.throttle.window if self.throttle else self.concurrency
+
+    def submit(
+        self,
+        statement,
+        params: Optional[Sequence[Any]] = None,
+        table: Optional[str] = None,
+        rows: int = 1,
+    ):
+        """
+        Send a statement, waiting for the oldest request if the window is full.
+
+        Args:
+            statement: Prepared, bound, simple or batch statement
+            params: Values to bind to the statement
+            table: Table name used for per-table write counts
+            rows: Number of rows written by the statement (batches write several)
+        """
+        while len(self._in_flight) >= self.window:
+            self._acknowledge_oldest()
+
+        request = _Request(statement, params, table, rows)
+        self._send(request)
+        self._in_flight.append(request)
+
+    def _send(self, request: _Request):
+        """Execute a request asynchronously, tracking timing when throttled or measured."""
+        request.attempts += 1
+
+        if not self.throttle and not self.metrics:
+            request.future = self.session.execute_async(request.statement, request.params)
+            return
+
+        if self.throttle:
+            self.throttle.acquire(request.rows)
+        request.times = [time.perf_counter(), None]
+        request.future = self.session.execute_async(request.statement, request.params)
+        request.future.add_callbacks(
+            _mark_completed,
+            _mark_completed,
+            callback_args=(request.times,),
+            errback_args=(request.times,),
+        )
+
+    def flush(self):
+        """Wait until every request in flight is acknowledged."""
+        while self._in_flight:
+            self._acknowledge_oldest()
+
+    def _acknowledge_oldest(self):
+        """Wait for the oldest request in flight and record its write."""
+        request = self._in_flight[0]
+
+        try:
+            request.future.result()
+        except overload_errors() as e:
+            if not self.throttle or request.attempts > self.throttle.max_retries:
+                self._fail(request, e)
+            if self.metrics:
+                self.metrics.increment("write_retries")
+            logger.warning(
+                f"Retrying write into {request.table or 'Cassandra'} "
+                f"(attempt {request.attempts}): {e}"
+            )
+            self.throttle.on_error(e)
+            self._send(request)
+            return
+        except Exception as e:
+            self._fail(request, e)
+
+        self._in_flight.popleft()
+
+        if self.throttle or self.metrics:
+            sent, completed = request.times
+            latency = (completed or time.perf_counter()) - sent
+            if self.throttle:
+                self.throttle.on_success(latency)
+            if self.metrics:
+                self.metrics.observe_latency(request.table or "unknown", latency)
+
+        if request.table is not None:
+            self.rows_written[request.table] = (
+                self.rows_written.get(request.table, 0) + request.rows
+            )
+
+    def _fail(self, request: _Request, error: Exception):
+        """Log a failed write, abandon requests in flight and re-raise."""
+        logger.error(f"Failed to write row into {request.table or 'Cassandra'}: {error}")
+        if self.metrics:
+            self.metrics.increment("write_errors")
+        self._in_flight.clear()
+        raise error
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - flush outstanding requests on success."""
+        if exc_type is None:
+            self.flush()
+        return False
@@ -0,0 +1,136 @@
+"""Bounded LRU cache with per-entry time-to-live."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after ``ttl_seconds``.
+
+    Usage:
+        cache = TTLCache(max_size=1024, ttl_seconds=60)
+        value = cache.get_or_load(key, lambda: expensive_lookup(key))
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_size: Maximum number of entries before the least recently used is evicted
+            ttl_seconds: Seconds an entry stays valid after it is stored
+            clock: Monotonic time source (replaceable in tests)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Get a cached value, counting a hit or a miss.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self.clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Get a cached value, loading and storing it on a miss.
+
+        Args:
+            key: Cache key
+            loader: Function producing the value on a miss
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = loader()
+            self.put(key, value)
+        return value
+
+    def keys(self) -> List[Hashable]:
+        """
+        Get the keys of unexpired entries, least recently used first.
+
+        Returns:
+            Cached keys
+        """
+        with self._lock:
+            now = self.clock()
+            return [key for key, (expires, _) in self._entries.items() if expires > now]
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """
+        Drop one entry, or every entry when no key is given.
+
+        Args:
+            key: Cache key to drop (optional)
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Size, hits, misses, evictions and hit ratio
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,458 @@
+"""Pipeline instrumentation: phase timings, latency histograms and exporters."""
+
+import json
+import os
+import sys
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    from src.utils.profiling import PhaseProfiler
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+# Histogram bucket upper bounds in seconds: 0.1ms to ~27s, 25% apart
+LATENCY_BUCKETS = tuple(1e-4 * 1.25**i for i in range(57))
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram with interpolated quantiles.
+
+    Buckets are geometric, so quantiles are accurate to within a bucket's
+    25% width at any scale, and observing a value costs one binary search.
+    """
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS):
+        """
+        Initialize histogram.
+
+        Args:
+            buckets: Increasing bucket upper bounds in seconds
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, seconds: float):
+        """
+        Record one latency.
+
+        Args:
+            seconds: Observed latency in seconds
+        """
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by interpolating within its bucket.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Latency in seconds, or None without observations
+        """
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - cumulative) / count
+                return min(max(estimate, self.min), self.max)
+            cumulative += count
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the histogram in milliseconds.
+
+        Returns:
+            Count, mean, min, max and p50/p95/p99
+        """
+        summary: Dict[str, Any] = {"count": self.count}
+        if self.count:
+            summary["mean_ms"] = round(self.sum / self.count * 1000, 3)
+            summary["min_ms"] = round(self.min * 1000, 3)
+            summary["max_ms"] = round(self.max * 1000, 3)
+            for q in QUANTILES:
+                summary[f"p{int(q * 100)}_ms"] = round(self.quantile(q) * 1000, 3)
+        return summary
+
+
+class _Frame:
+    """Timing of an open phase, excluding time spent in nested phases."""
+
+    __slots__ = ("name", "nested")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.nested = 0.0
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Get the peak resident set size of this process.
+
+    Returns:
+        Peak RSS in bytes, or None where the platform doesn't report it
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _add_metric(lines: List[str], name: str, kind: str, help_text: str, samples: List[tuple]):
+    """Append one metric family in exposition format, skipping empty ones."""
+    if not samples:
+        return
+
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    for suffix, labels, value in samples:
+        label_text = ",".join(f'{key}="{val}"' for key, val in labels.items())
+        label_text = f"{{{label_text}}}" if label_text else ""
+        lines.append(f"{name}{suffix}{label_text} {value:.10g}")
+
+
+def _histogram_samples(table: str, histogram: LatencyHistogram) -> List[tuple]:
+    """Get the cumulative bucket, sum and count samples of a table's histogram."""
+    samples = []
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts, strict=False):
+        cumulative += count
+        samples.append(("_bucket", {"table": table, "le": f"{bound:.6g}"}, cumulative))
+
+    samples.append(("_bucket", {"table": table, "le": "+Inf"}, histogram.count))
+    samples.append(("_sum", {"table": table}, histogram.sum))
+    samples.append(("_count", {"table": table}, histogram.count))
+    return samples
+
+
+class PipelineMetrics:
+    """
+    Collects per-phase timings, per-stage volumes, write latencies and counters.
+
+    Phases may nest; each phase is credited only with the time not spent in
+    phases nested inside it, so streaming stages that pull from each other
+    (extract inside transform inside load) are timed separately. Timing is
+    meant to be used from the pipeline's thread.
+
+    Usage:
+        metrics = PipelineMetrics()
+        with metrics.phase("load"):
+            for chunk in metrics.timed("extract", chunks):
+                ...
+        metrics.record_stage("extract", rows=1000, bytes=250000)
+        metrics.to_prometheus()
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.perf_counter,
+        profiler: Optional["PhaseProfiler"] = None,
+    ):
+        """
+        Initialize empty metrics.
+
+        Args:
+            clock: Time source for phases (replaceable in tests)
+            profiler: Profiler told about every phase entered and left (optional)
+        """
+        self.clock = clock
+        self.profiler = profiler
+        self.phases: Dict[str, float] = {}
+        self.stages: Dict[str, Dict[str, int]] = {}
+        self.latencies: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        self._stack: List[_Frame] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Time a block of work as a phase.
+
+        Args:
+            name: Phase name
+        """
+        frame = self._push(name)
+        if self.profiler:
+            self.profiler.enter(name)
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self._pop(frame, self.clock() - start)
+            if self.profiler:
+                self.profiler.exit(name)
+
+    @contextmanager
+    def profiled(self, name: str):
+        """
+        Profile a block separately without timing it as a phase.
+
+        Args:
+            name: Profile section name
+        """
+        if not self.profiler:
+            yield
+            return
+
+        self.profiler.enter(name)
+        try:
+            yield
+        finally:
+            self.profiler.exit(name)
+
+    def timed(self, name: str, items: Iterable, snapshot: bool = False) -> Iterator:
+        """
+        Credit the time spent producing items of an iterable to a phase.
+
+        Args:
+            name: Phase name
+            items: Iterable whose iteration is timed
+            snapshot: Whether a memory profile snapshots around every item. Worth
+                it for chunks of rows, too slow for single records.
+
+        Yields:
+            Items of the iterable
+        """
+        iterator = iter(items)
+        profiler = self.profiler
+        while True:
+            frame = self._push(name)
+            if profiler:
+                profiler.enter(name, snapshot=snapshot)
+            start = self.clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._pop(frame, self.clock() - start)
+                if profiler:
+                    profiler.exit(name, snapshot=snapshot)
+            yield item
+
+    def _push(self, name: str) -> _Frame:
+        """Open a phase frame."""
+        frame = _Frame(name)
+        self._stack.append(frame)
+        return frame
+
+    def _pop(self, frame: _Frame, elapsed: float):
+        """Close a phase frame, crediting its exclusive time."""
+        self._stack.pop()
+        self.phases[frame.name] = self.phases.get(frame.name, 0.0) + elapsed - frame.nested
+        if self._stack:
+            self._stack[-1].nested += elapsed
+
+    def record_stage(self, stage: str, rows: int, bytes: Optional[int] = None):
+        """
+        Record the volume processed by a stage.
+
+        Args:
+            stage: Stage name, matching the phase that timed it
+            rows: Rows processed
+            bytes: Bytes processed (optional)
+        """
+        volume = self.stages.setdefault(stage, {"rows": 0})
+        volume["rows"] += rows
+        if bytes is not None:
+            volume["bytes"] = volume.get("bytes", 0) + bytes
+
+    def observe_latency(self, table: str, seconds: float):
+        """
+        Record the latency of one acknowledged write.
+
+        Args:
+            table: Table written to
+            seconds: Write latency in seconds
+        """
+        histogram = self.latencies.get(table)
+        if histogram is None:
+            histogram = self.latencies[table] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    def increment(self, counter: str, amount: int = 1):
+        """
+        Increase an error or retry counter.
+
+        Args:
+            counter: Counter name, e.g. ``write_retries``
+            amount: Amount to add
+        """
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def stage_throughput(self, stage: str) -> Dict[str, float]:
+        """
+        Get the rows/s and bytes/s of a stage over its phase time.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            Throughput figures, empty when the stage wasn't timed
+        """
+        seconds = self.phases.get(stage)
+        volume = self.stages.get(stage, {})
+        if not seconds:
+            return {}
+
+        throughput = {"rows_per_second": round(volume.get("rows", 0) / seconds, 1)}
+        if "bytes" in volume:
+            throughput["bytes_per_second"] = round(volume["bytes"] / seconds, 1)
+        return throughput
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get every metric as JSON-serializable data.
+
+        Returns:
+            Phases, stages with throughput, latency summaries, counters and peak RSS
+        """
+        return {
+            "phases_seconds": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "stages": {
+                stage: {**volume, **self.stage_throughput(stage)}
+                for stage, volume in self.stages.items()
+            },
+            "insert_latency": {
+                table: histogram.to_dict() for table, histogram in self.latencies.items()
+            },
+            "counters": dict(self.counters),
+            "peak_rss_bytes": peak_rss_bytes(),
+        }
+
+    def to_json(self) -> str:
+        """
+        Export metrics as JSON.
+
+        Returns:
+            JSON document
+        """
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = "etl") -> str:
+        """
+        Export metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            Exposition text, e.g. for the node exporter textfile collector
+        """
+        lines: List[str] = []
+        throughput = {stage: self.stage_throughput(stage) for stage in self.stages}
+
+        _add_metric(
+            lines,
+            f"{prefix}_phase_seconds",
+            "gauge",
+            "Time spent in each pipeline phase.",
+            [("", {"phase": name}, seconds) for name, seconds in self.phases.items()],
+        )
+        _add_metric(
+            lines,
+            f"{prefix}_stage_rows",
+            "gauge",
+            "Rows processed by each stage.",
+            [("", {"stage": stage}, volume["rows"]) for stage, volume in self.stages.items()],
+        )
+        for unit in ("rows", "bytes"):
+            key = f"{unit}_per_second"
+            _add_metric(
+                lines,
+                f"{prefix}_stage_{key}",
+                "gauge",
+                f"Stage throughput in {unit} per second.",
+                [
+                    ("", {"stage": stage}, rates[key])
+                    for stage, rates in throughput.items()
+                    if key in rates
+                ],
+            )
+
+        _add_metric(
+            lines,
+            f"{prefix}_insert_latency_seconds",
+            "histogram",
+            "Latency of acknowledged writes per table.",
+            [
+                sample
+                for table, histogram in self.latencies.items()
+                for sample in _histogram_samples(table, histogram)
+            ],
+        )
+        _add_metric(
+            lines,
+            f"{prefix}_insert_latency_quantile_seconds",
+            "gauge",
+            "Estimated write latency quantiles per table.",
+            [
+                ("", {"table": table, "quantile": str(q)}, histogram.quantile(q))
+                for table, histogram in self.latencies.items()
+                if histogram.count
+                for q in QUANTILES
+            ],
+        )
+
+        for counter, value in self.counters.items():
+            _add_metric(
+                lines,
+                f"{prefix}_{counter}_total",
+                "counter",
+                f"Pipeline {counter.replace('_', ' ')}.",
+                [("", {}, value)],
+            )
+
+        rss = peak_rss_bytes()
+        if rss is not None:
+            _add_metric(
+                lines,
+                f"{prefix}_peak_rss_bytes",
+                "gauge",
+                "Peak resident set size.",
+                [("", {}, rss)],
+            )
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, json_file: Optional[str] = None, prometheus_file: Optional[str] = None):
+        """
+        Write metrics to files, replacing them atomically.
+
+        Args:
+            json_file: Path of the JSON export (optional)
+            prometheus_file: Path of the Prometheus text export (optional)
+        """
+        for path, content in ((json_file, self.to_json), (prometheus_file, self.to_prometheus)):
+            if not path:
+                continue
+            target = Path(path)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            temp = target.with_name(f"{target.name}.tmp")
+            temp.write_text(content(), encoding="utf8")
+            os.replace(temp, target)
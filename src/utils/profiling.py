@@ -0,0 +1,272 @@
+"""CPU and memory profiles per pipeline phase."""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from loguru import logger
+
+PROFILE_MODES = ("cpu", "memory", "both")
+DEFAULT_TOP = 30
+
+# Allocations made by the profiler itself or the import system aren't pipeline work
+_MEMORY_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+class _MemoryFrame:
+    """Allocation state when a phase was entered."""
+
+    __slots__ = ("name", "snapshot", "peak", "nested")
+
+    def __init__(self, name: str, snapshot: tracemalloc.Snapshot):
+        self.name = name
+        self.snapshot = snapshot
+        self.peak = 0
+        # Growth per allocation site already credited to nested phases
+        self.nested: Dict[tracemalloc.Traceback, List[int]] = {}
+
+
+class _MemoryTotals:
+    """Allocations of a phase, summed over every time it was entered."""
+
+    __slots__ = ("entries", "peak", "growth", "held")
+
+    def __init__(self):
+        self.entries = 0
+        self.peak = 0
+        # Allocation site -> [size change in bytes, block count change]
+        self.growth: Dict[tracemalloc.Traceback, List[int]] = {}
+        self.held: List[tracemalloc.Statistic] = []
+
+
+def _add_growth(
+    totals: Dict[tracemalloc.Traceback, List[int]], growth: Dict[tracemalloc.Traceback, List[int]]
+):
+    """Add per-site size and block count changes to running totals."""
+    for traceback, (size, count) in growth.items():
+        total = totals.setdefault(traceback, [0, 0])
+        total[0] += size
+        total[1] += count
+
+
+def _file_name(section: str) -> str:
+    """Make a section name safe to use in a file name."""
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in section)
+
+
+class PhaseProfiler:
+    """
+    Profile the pipeline's phases separately with cProfile and tracemalloc.
+
+    ``PipelineMetrics`` calls ``enter`` and ``exit`` around every phase, so
+    each phase gets its own profile. In CPU mode one ``cProfile.Profile`` per
+    phase is enabled while the phase is the innermost one; phases streamed
+    through ``PipelineMetrics.timed`` (extraction pulled by the transform)
+    switch profiles on every item, so parsing and transforming show up
+    separately. In memory mode a tracemalloc snapshot is taken when a
+    ``phase`` block starts and ends, and the report lists the allocation
+    sites that grew the most and the peak traced memory. Only the pipeline's
+    thread is profiled; extract worker processes and driver I/O threads
+    aren't.
+
+    Results are written by ``stop`` to ``<phase>.pstats`` / ``<phase>.cpu.txt``
+    and ``<phase>.memory.txt`` in the output folder.
+
+    Usage:
+        profiler = PhaseProfiler("both", "logs/profile-20250101-120000")
+        pipeline = ETLPipeline(config, profiler=profiler)
+        profiler.start()
+        try:
+            pipeline.run()
+        finally:
+            profiler.stop()
+    """
+
+    def __init__(self, mode: str, output_dir: Union[str, Path], top: int = DEFAULT_TOP):
+        """
+        Initialize profiler.
+
+        Args:
+            mode: "cpu", "memory" or "both"
+            output_dir: Folder for the profile files
+            top: Number of functions or allocation sites listed per phase
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in PROFILE_MODES:
+            logger.error(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}")
+            raise ValueError(f"Unknown profile mode: {mode}")
+
+        self.mode = mode
+        self.output_dir = Path(output_dir)
+        self.top = top
+        self.cpu = mode in ("cpu", "both")
+        self.memory = mode in ("memory", "both")
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.memory_totals: Dict[str, _MemoryTotals] = {}
+        self._sections: List[str] = []
+        self._memory_frames: List[_MemoryFrame] = []
+        self._active: Optional[cProfile.Profile] = None
+        self._running = False
+
+    @classmethod
+    def for_log_file(cls, mode: str, log_file: Union[str, Path], top: int = DEFAULT_TOP):
+        """
+        Create a profiler writing to a timestamped folder next to the log file.
+
+        Args:
+            mode: "cpu", "memory" or "both"
+            log_file: Path of the pipeline log file
+            top: Number of functions or allocation sites listed per phase
+
+        Returns:
+            Profiler for ``<log folder>/profile-<YYYYmmdd-HHMMSS>``
+        """
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return cls(mode, Path(log_file).parent / f"profile-{stamp}", top=top)
+
+    def start(self):
+        """Start collecting; phases entered before this aren't profiled."""
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._running = True
+
+    def enter(self, section: str, snapshot: bool = True):
+        """
+        Start profiling a phase nested in the current one.
+
+        Args:
+            section: Phase name
+            snapshot: Whether to take memory snapshots around the phase. Off
+                for stages entered once per streamed record.
+        """
+        if not self._running:
+            return
+
+        self._sections.append(section)
+        if self.cpu:
+            self._switch(section)
+        if self.memory and snapshot:
+            if self._memory_frames:
+                parent = self._memory_frames[-1]
+                parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+            self._memory_frames.append(_MemoryFrame(section, tracemalloc.take_snapshot()))
+            tracemalloc.reset_peak()
+
+    def exit(self, section: str, snapshot: bool = True):
+        """
+        Stop profiling the innermost phase and resume the enclosing one.
+
+        Args:
+            section: Phase name, as passed to ``enter``
+            snapshot: Whether ``enter`` took a memory snapshot
+        """
+        if not self._running or not self._sections:
+            return
+
+        self._sections.pop()
+        if self.cpu:
+            self._switch(self._sections[-1] if self._sections else None)
+        if self.memory and snapshot and self._memory_frames:
+            self._report_memory(self._memory_frames.pop())
+
+    def _switch(self, section: Optional[str]):
+        """Enable the CPU profile of a section, disabling the previous one."""
+        if self._active is not None:
+            self._active.disable()
+            self._active = None
+        if section is not None:
+            profile = self.profiles.get(section)
+            if profile is None:
+                profile = self.profiles[section] = cProfile.Profile()
+            profile.enable()
+            self._active = profile
+
+    def _report_memory(self, frame: _MemoryFrame):
+        """Add the allocations made while a phase ran to the phase's totals."""
+        peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+        end = tracemalloc.take_snapshot().filter_traces(_MEMORY_FILTERS)
+        start = frame.snapshot.filter_traces(_MEMORY_FILTERS)
+        growth = {
+            stat.traceback: [stat.size_diff, stat.count_diff]
+            for stat in end.compare_to(start, "lineno")
+            if stat.size_diff or stat.count_diff
+        }
+
+        if self._memory_frames:
+            parent = self._memory_frames[-1]
+            parent.peak = max(parent.peak, peak)
+            _add_growth(parent.nested, growth)
+
+        _add_growth(growth, {site: [-size, -count] for site, (size, count) in frame.nested.items()})
+        totals = self.memory_totals.get(frame.name)
+        if totals is None:
+            totals = self.memory_totals[frame.name] = _MemoryTotals()
+        totals.entries += 1
+        totals.peak = max(totals.peak, peak)
+        _add_growth(totals.growth, growth)
+        totals.held = end.statistics("lineno")[: self.top]
+
+    def _memory_report(self, name: str, totals: _MemoryTotals) -> str:
+        """Describe the allocations of a phase."""
+        growth = sorted(totals.growth.items(), key=lambda item: abs(item[1][0]), reverse=True)
+        net = sum(size for size, _ in totals.growth.values())
+        lines = [
+            f"Phase {name}: peak traced memory {totals.peak / 2**20:.1f} MiB, "
+            f"net change {net / 2**20:+.1f} MiB, entered {totals.entries}x "
+            "(nested phases excluded)",
+            f"Top {self.top} allocation sites by growth:",
+        ]
+        lines += [
+            f"  {traceback}: size={size / 1024:+.1f} KiB, count={count:+d}"
+            for traceback, (size, count) in growth[: self.top]
+            if size or count
+        ]
+        lines.append(f"Top {self.top} allocation sites held at the end of the phase:")
+        lines += [f"  {stat}" for stat in totals.held]
+        return "\n".join(lines) + "\n"
+
+    def stop(self) -> Path:
+        """
+        Stop collecting and write the profiles.
+
+        Returns:
+            Folder holding the profile files
+        """
+        self._switch(None)
+        self._sections.clear()
+        while self._memory_frames:
+            self._report_memory(self._memory_frames.pop())
+        if self.memory and self._running:
+            tracemalloc.stop()
+        self._running = False
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for section, profile in self.profiles.items():
+            name = _file_name(section)
+            profile.dump_stats(self.output_dir / f"{name}.pstats")
+
+            text = io.StringIO()
+            stats = pstats.Stats(profile, stream=text)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+            (self.output_dir / f"{name}.cpu.txt").write_text(text.getvalue(), encoding="utf8")
+
+        for section, totals in self.memory_totals.items():
+            (self.output_dir / f"{_file_name(section)}.memory.txt").write_text(
+                self._memory_report(section, totals), encoding="utf8"
+            )
+
+        sections = sorted(self.profiles.keys() | self.memory_totals.keys())
+        logger.info(f"Profiles of {sections} written to {self.output_dir}")
+        return self.output_dir
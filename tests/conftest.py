@@ -7,6 +7,14 @@ from unittest.mock import Mock
 
 import pytest
 
+from src.db.fake import FakeSession
+from src.db.schema import CassandraSchema
+
+RAW_COLUMNS = [
+    "artist", "auth", "firstName", "gender", "itemInSession", "lastName", "length", "level",
+    "location", "method", "page", "registration", "sessionId", "song", "status", "ts", "userId",
+]  # fmt: skip
+
 
 @pytest.fixture
 def sample_event_data():
@@ -18,6 +26,26 @@ def sample_event_data():
     ]
 
 
+@pytest.fixture
+def sample_raw_event_data():
+    """Sample raw event data in the 17-column layout of data/raw/event_data."""
+    return [
+        [
+            "Artist1", "Logged In", "John", "M", "1", "Doe", "200.5", "free", "NYC", "PUT",
+            "NextSong", "1.54E+12", "100", "Song1", "200", "1.54E+12", "1",
+        ],
+        [
+            "Artist2", "Logged In", "Jane", "F", "2", "Smith", "180.3", "paid",
+            "Phoenix-Mesa-Scottsdale, AZ", "PUT", "NextSong", "1.54E+12", "100", "Song2",
+            "200", "1.54E+12", "2",
+        ],
+        [
+            "", "Logged In", "Bob", "M", "3", "Wilson", "", "free", "SF", "GET", "Home",
+            "1.54E+12", "101", "", "200", "1.54E+12", "3",
+        ],  # Empty artist
+    ]  # fmt: skip
+
+
 @pytest.fixture
 def temp_csv_file(sample_event_data):
     """Create temporary CSV file with sample data."""
@@ -80,6 +108,22 @@ def temp_csv_folder(sample_event_data):
         yield str(temp_path)
 
 
+@pytest.fixture
+def temp_raw_csv_folder(sample_raw_event_data):
+    """Create temporary folder with raw daily event files."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+
+        for day in range(1, 3):
+            file_path = temp_path / f"2018-11-0{day}-events.csv"
+            with open(file_path, "w", newline="", encoding="utf8") as f:
+                writer = csv.writer(f)
+                writer.writerow(RAW_COLUMNS)
+                writer.writerows(sample_raw_event_data)
+
+        yield str(temp_path)
+
+
 @pytest.fixture
 def temp_output_file():
     """Create temporary output file path."""
@@ -102,6 +146,15 @@ def mock_cassandra_session():
     return session
 
 
+@pytest.fixture
+def fake_session():
+    """In-memory Cassandra stand-in with the project tables created."""
+    session = FakeSession()
+    CassandraSchema(session).create_all_tables()
+    yield session
+    session.shutdown()
+
+
 @pytest.fixture
 def mock_cassandra_cluster():
     """Mock Cassandra cluster for testing."""
@@ -0,0 +1,69 @@
+"""Tests for the asyncio query facade."""
+
+import asyncio
+
+import pytest
+from cassandra import OperationTimedOut
+
+from src.db.aio import AsyncEventQueryService, execute
+from src.db.fake import FakeSession, constant_latency
+from src.db.queries import Listener, SessionSong, SongPlay
+from src.db.schema import CassandraSchema
+
+
+@pytest.fixture
+def slow_session():
+    """Fake session answering from its background thread after 2ms."""
+    session = FakeSession(latency=constant_latency(2))
+    CassandraSchema(session).create_all_tables()
+    session.execute(
+        "INSERT INTO session_item (sessionId, itemInSession, artist, song, length) "
+        "VALUES (338, 4, 'Faithless', 'Music Matters', 495.3)"
+    )
+    session.execute(
+        "INSERT INTO user_session (sessionId, userId, itemInSession, artist, song, firstName, "
+        "lastName) VALUES (182, 10, 0, 'Down To The Bone', 'Keep On Keepin On', 'Sylvie', 'Cruz')"
+    )
+    session.execute(
+        "INSERT INTO user_song (song, userId, firstName, lastName) "
+        "VALUES ('All Hands Against His Own', 29, 'Sara', 'Johnson')"
+    )
+    yield session
+    session.shutdown()
+
+
+def test_execute_bridges_results_and_errors(slow_session):
+    """Test the awaitable resolves with rows from the driver thread, or raises its error."""
+
+    async def run():
+        rows = await execute(slow_session, "SELECT song FROM session_item WHERE sessionId = 338")
+        slow_session.inject_error(OperationTimedOut("timed out"))
+        with pytest.raises(OperationTimedOut):
+            await execute(slow_session, "SELECT song FROM session_item WHERE sessionId = 338")
+        return rows
+
+    assert [row.song for row in asyncio.run(run())] == ["Music Matters"]
+
+
+def test_async_queries_return_typed_cached_results(slow_session):
+    """Test the three query patterns run concurrently and are cached."""
+    service = AsyncEventQueryService(slow_session)
+
+    async def run():
+        return await asyncio.gather(
+            service.song_in_session(338, 4),
+            service.user_session_history(182, 10),
+            service.song_listeners("All Hands Against His Own"),
+            service.song_in_session(1, 1),
+        )
+
+    play, history, listeners, missing = asyncio.run(run())
+
+    assert play == SongPlay("Faithless", "Music Matters", 495.3)
+    assert history == [SessionSong("Down To The Bone", "Keep On Keepin On", "Sylvie", "Cruz")]
+    assert listeners == [Listener("Sara", "Johnson")]
+    assert missing is None
+
+    requests = slow_session.stats()["requests"]
+    assert asyncio.run(service.song_listeners("All Hands Against His Own")) == listeners
+    assert slow_session.stats()["requests"] == requests
@@ -0,0 +1,63 @@
+"""Tests for the asyncio loader."""
+
+import asyncio
+
+import pytest
+from cassandra import OperationTimedOut
+
+from src.db.fake import FakeSession, constant_latency
+from src.db.schema import CassandraSchema
+from src.etl.async_load import AsyncEventLoader
+from src.etl.records import EventRecord
+from src.utils.metrics import PipelineMetrics
+
+
+@pytest.fixture
+def slow_session():
+    """Fake session answering from its background thread after 2ms."""
+    session = FakeSession(latency=constant_latency(2))
+    CassandraSchema(session).create_all_tables()
+    yield session
+    session.shutdown()
+
+
+async def _records(count):
+    """Async source of records, as from an ingestion queue."""
+    for i in range(count):
+        yield EventRecord("Artist", "Ann", "F", i, "Lee", 200.0, "free", "NYC", 1, f"Song{i}", 7)
+        await asyncio.sleep(0)
+
+
+def test_load_writes_every_table_with_bounded_concurrency(slow_session):
+    """Test an async record source is written to all tables within the window."""
+    metrics = PipelineMetrics()
+    loader = AsyncEventLoader(slow_session, concurrency=16, metrics=metrics)
+
+    results = asyncio.run(loader.load(_records(200)))
+
+    assert results == {"session_item": 200, "user_session": 200, "user_song": 200}
+    assert 1 < slow_session.stats()["peak_in_flight"] <= 16
+    assert metrics.latencies["user_song"].count == 200
+    rows = slow_session.execute("SELECT song FROM session_item WHERE sessionId = 1")
+    assert len(list(rows)) == 200
+
+
+def test_load_accepts_plain_iterables(slow_session):
+    """Test a list of records loads like an async source."""
+    record = EventRecord("Artist", "Ann", "F", 0, "Lee", 200.0, "free", "NYC", 1, "Song", 7)
+
+    results = asyncio.run(AsyncEventLoader(slow_session, tables=["user_song"]).load([record]))
+
+    assert results == {"user_song": 1}
+
+
+def test_load_raises_first_error_after_draining(slow_session):
+    """Test a failed write stops reading records and is raised."""
+    slow_session.inject_error(OperationTimedOut("timed out"))
+    loader = AsyncEventLoader(slow_session, concurrency=4)
+
+    with pytest.raises(OperationTimedOut):
+        asyncio.run(loader.load(_records(100)))
+
+    assert slow_session.stats()["in_flight"] == 0
+    assert sum(loader.rows_written.values()) < 300
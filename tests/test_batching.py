@@ -0,0 +1,69 @@
+"""Tests for partition-aware batching."""
+
+from cassandra.query import BatchStatement
+
+from src.etl.batching import PartitionBatcher, estimate_size
+from src.etl.writer import ConcurrentWriter
+
+INSERT = "INSERT INTO user_song (song, userId) VALUES (%s, %s)"
+
+
+def _submitted(session):
+    """Return the statements passed to execute_async."""
+    return [call.args[0] for call in session.execute_async.call_args_list]
+
+
+def test_estimate_size_counts_strings_and_numbers():
+    """Test that string lengths and fixed-size numbers are summed."""
+    assert estimate_size(("abc", 1, 2.5)) == 7 + 8 + 8
+
+
+def test_estimate_size_counts_utf8_bytes():
+    """Test that non-ASCII text is sized by its encoded bytes, not its characters."""
+    assert estimate_size(("Beyoncé", "Björk")) == (8 + 4) + (6 + 4)
+    assert estimate_size(("東京",)) == 6 + 4
+
+
+def test_batcher_keeps_multibyte_rows_under_byte_cap(mock_cassandra_session):
+    """Test that multi-byte values near the cap start a new batch."""
+    writer = ConcurrentWriter(mock_cassandra_session, concurrency=10)
+    batcher = PartitionBatcher(writer, INSERT, "user_song", key_columns=1, max_bytes=60)
+    for user_id in range(4):
+        batcher.add(("é" * 10, user_id))  # 32 bytes each, though only 22 by characters
+    batcher.flush()
+
+    assert batcher.batches_sent == 4
+
+
+def test_batcher_groups_consecutive_rows_by_partition(mock_cassandra_session):
+    """Test that each batch targets exactly one partition."""
+    writer = ConcurrentWriter(mock_cassandra_session, concurrency=10)
+    batcher = PartitionBatcher(writer, INSERT, "user_song", key_columns=1)
+
+    for params in [("a", 1), ("a", 2), ("b", 1), ("a", 3)]:
+        batcher.add(params)
+    batcher.flush()
+    writer.flush()
+
+    statements = _submitted(mock_cassandra_session)
+    assert isinstance(statements[0], BatchStatement)
+    assert len(statements[0]) == 2
+    assert statements[1:] == [INSERT, INSERT]  # Single rows are sent unbatched
+    assert batcher.batches_sent == 3
+    assert writer.rows_written == {"user_song": 4}
+
+
+def test_batcher_caps_rows_and_bytes(mock_cassandra_session):
+    """Test that batches are split by row count and estimated size."""
+    writer = ConcurrentWriter(mock_cassandra_session, concurrency=10)
+    by_rows = PartitionBatcher(writer, INSERT, "user_song", key_columns=1, max_rows=2)
+    for user_id in range(5):
+        by_rows.add(("a", user_id))
+    by_rows.flush()
+    assert by_rows.batches_sent == 3
+
+    by_bytes = PartitionBatcher(writer, INSERT, "user_song", key_columns=1, max_bytes=40)
+    for user_id in range(4):
+        by_bytes.add(("a" * 10, user_id))  # 22 bytes each
+    by_bytes.flush()
+    assert by_bytes.batches_sent == 4
@@ -0,0 +1,75 @@
+"""Tests for the synthetic event generator and benchmark comparison."""
+
+import csv
+
+from benchmarks.generate_events import RAW_COLUMNS, EventGenerator
+from benchmarks.run_benchmarks import benchmark_size, compare_results, parse_size
+from src.etl.extract import EventDataExtractor
+
+
+class TestEventGenerator:
+    """Test cases for EventGenerator."""
+
+    def test_write_files_layout(self, tmp_path):
+        """Test generated files match the raw layout and requested size."""
+        written = EventGenerator(seed=1).write_files(tmp_path / "raw", rows=1001, days=4)
+
+        assert len(written) == 4
+        assert sum(count for _, count in written) == 1001
+        assert written[0][0].name == "2018-11-01-events.csv"
+
+        with open(written[0][0], "r", encoding="utf8", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == RAW_COLUMNS
+        assert len(rows) == 1 + 251
+        assert all(len(row) == len(RAW_COLUMNS) for row in rows)
+
+    def test_generation_is_reproducible(self, tmp_path):
+        """Test the same seed produces identical files."""
+        first = EventGenerator(seed=7).write_files(tmp_path / "a", rows=200, days=1)
+        second = EventGenerator(seed=7).write_files(tmp_path / "b", rows=200, days=1)
+
+        assert first[0][0].read_bytes() == second[0][0].read_bytes()
+
+    def test_files_are_extractable(self, tmp_path):
+        """Test the extractor reads every generated row."""
+        EventGenerator().write_files(tmp_path / "raw", rows=300, days=3)
+
+        extractor = EventDataExtractor(str(tmp_path / "raw"))
+        rows = extractor.extract_rows(extractor.get_file_paths())
+
+        assert len(rows) == 300
+
+
+class TestRunBenchmarks:
+    """Test cases for the benchmark runner."""
+
+    def test_parse_size(self):
+        """Test row counts with suffixes."""
+        assert parse_size("10k") == 10_000
+        assert parse_size("1M") == 1_000_000
+        assert parse_size("2500") == 2500
+
+    def test_benchmark_size(self, tmp_path):
+        """Test every stage reports throughput."""
+        EventGenerator().write_files(tmp_path / "raw", rows=500, days=2)
+
+        results = benchmark_size(tmp_path / "raw", tmp_path, batch_size=10)
+
+        assert set(results) == {"read_csv", "read_mmap", "extract", "transform", "load"}
+        assert results["extract"]["rows"] == 500
+        assert results["read_mmap"]["rows"] == results["read_csv"]["rows"] == 500
+        assert (
+            results["read_mmap"]["retained_bytes_per_row"]
+            < results["read_csv"]["retained_bytes_per_row"]
+        )
+        assert results["load"]["writes"] == 3 * results["load"]["rows"]
+
+    def test_compare_results(self):
+        """Test only slowdowns beyond the threshold are regressions."""
+        baseline = {"results": {"1000": {"extract": {"rows_per_second": 100.0}}}}
+        slower = {"results": {"1000": {"extract": {"rows_per_second": 70.0}}}}
+        similar = {"results": {"1000": {"extract": {"rows_per_second": 90.0}}}}
+
+        assert len(compare_results(baseline, slower, threshold=0.2)) == 1
+        assert compare_results(baseline, similar, threshold=0.2) == []
@@ -0,0 +1,47 @@
+"""Tests for the LRU/TTL cache."""
+
+from src.utils.cache import TTLCache
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_counts_hits_and_misses():
+    """Test that lookups are counted."""
+    cache = TTLCache(max_size=2)
+    cache.put("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "evictions": 0, "hit_ratio": 0.5}
+
+
+def test_cache_evicts_least_recently_used():
+    """Test LRU eviction when the cache is full."""
+    cache = TTLCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.keys() == ["a", "c"]
+    assert cache.evictions == 1
+
+
+def test_cache_expires_entries_after_ttl():
+    """Test that entries expire after their time-to-live."""
+    clock = FakeClock()
+    cache = TTLCache(ttl_seconds=10, clock=clock)
+    cache.put("a", 1)
+    clock.now = 10.5
+
+    assert cache.get("a") is None
+    assert cache.get_or_load("a", lambda: 2) == 2
+    assert cache.get("a") == 2
@@ -0,0 +1,42 @@
+"""Tests for load checkpoints."""
+
+from src.etl.checkpoint import LoadCheckpoint, source_fingerprint
+
+
+def test_checkpoint_round_trip(tmp_path):
+    """Test that saved positions are restored when resuming the same source."""
+    checkpoint_file = str(tmp_path / "checkpoint.json")
+    checkpoint = LoadCheckpoint(checkpoint_file, "source-a")
+    checkpoint.update("session_item", 42)
+    checkpoint.save()
+
+    assert LoadCheckpoint(checkpoint_file, "source-a", resume=True).position("session_item") == 42
+    assert LoadCheckpoint(checkpoint_file, "source-a").position("session_item") == 0
+
+
+def test_checkpoint_ignored_for_different_source(tmp_path):
+    """Test that a checkpoint for other input is not resumed."""
+    checkpoint_file = str(tmp_path / "checkpoint.json")
+    checkpoint = LoadCheckpoint(checkpoint_file, "source-a")
+    checkpoint.update("user_song", 7)
+    checkpoint.save()
+
+    assert LoadCheckpoint(checkpoint_file, "source-b", resume=True).position("user_song") == 0
+
+
+def test_checkpoint_clear_removes_file(tmp_path):
+    """Test that a completed load removes its checkpoint."""
+    checkpoint = LoadCheckpoint(str(tmp_path / "checkpoint.json"), "source-a")
+    checkpoint.save()
+    checkpoint.clear()
+
+    assert not checkpoint.checkpoint_file.exists()
+
+
+def test_source_fingerprint_changes_with_content(temp_csv_file):
+    """Test that the fingerprint tracks file size changes."""
+    before = source_fingerprint([temp_csv_file])
+    with open(temp_csv_file, "a", encoding="utf8") as f:
+        f.write("more\n")
+
+    assert source_fingerprint([temp_csv_file]) != before
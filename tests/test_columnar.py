@@ -0,0 +1,45 @@
+"""Tests for the columnar transformation engine."""
+
+from pathlib import Path
+
+from src.etl.columnar import ColumnarEventTransformer
+from src.etl.extract import EventDataExtractor
+from src.etl.transform import EventDataTransformer
+
+
+def test_columnar_output_matches_row_transformer(temp_raw_csv_folder, tmp_path):
+    """Test that both engines write byte-identical consolidated files."""
+    extractor = EventDataExtractor(temp_raw_csv_folder)
+    file_paths = sorted(extractor.get_file_paths())
+
+    row_output = EventDataTransformer(str(tmp_path / "rows.csv")).transform(
+        extractor.iter_rows(file_paths)
+    )
+    columnar = ColumnarEventTransformer(str(tmp_path / "columns.csv"))
+    columnar_output = columnar.transform(file_paths)
+
+    assert Path(columnar_output).read_bytes() == Path(row_output).read_bytes()
+    assert columnar.rows_extracted == 6
+    assert columnar.rows_skipped == 2
+
+
+def test_columnar_iter_records_casts_numeric_columns(temp_raw_csv_folder, tmp_path):
+    """Test that records carry int and float values cast from column arrays."""
+    extractor = EventDataExtractor(temp_raw_csv_folder)
+    transformer = ColumnarEventTransformer(str(tmp_path / "events.csv"))
+    records = list(transformer.iter_records(sorted(extractor.get_file_paths())))
+
+    assert len(records) == 4
+    assert records[1].location == "Phoenix-Mesa-Scottsdale, AZ"
+    assert (records[1].sessionId, records[1].userId, records[1].length) == (100, 2, 180.3)
+    assert type(records[1].itemInSession) is int
+
+
+def test_columnar_keeps_empty_artist_rows_when_configured(temp_raw_csv_folder, tmp_path):
+    """Test that the vectorized filter is only applied when enabled."""
+    extractor = EventDataExtractor(temp_raw_csv_folder)
+    transformer = ColumnarEventTransformer(str(tmp_path / "events.csv"), skip_empty_artist=False)
+    rows_written = transformer.write_consolidated_csv(extractor.get_file_paths())
+
+    assert rows_written == 6
+    assert transformer.rows_skipped == 0
@@ -0,0 +1,86 @@
+"""Tests for Cassandra connection management."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from cassandra import ConsistencyLevel
+from cassandra.cluster import EXEC_PROFILE_DEFAULT
+from cassandra.policies import DCAwareRoundRobinPolicy, HostDistance, TokenAwarePolicy
+
+from src.db.connection import CassandraConnection, cluster_options
+
+
+def test_cluster_options_defaults_to_token_and_dc_aware_routing():
+    """Test the default profile routes to local replicas."""
+    options = cluster_options()
+    profile = options["execution_profiles"][EXEC_PROFILE_DEFAULT]
+
+    assert isinstance(profile.load_balancing_policy, TokenAwarePolicy)
+    assert isinstance(profile.load_balancing_policy._child_policy, DCAwareRoundRobinPolicy)
+    assert profile.consistency_level == ConsistencyLevel.LOCAL_ONE
+    assert profile.request_timeout == 10.0
+    assert "protocol_version" not in options
+
+
+def test_cluster_options_applies_settings():
+    """Test configured settings reach the cluster and profile."""
+    options = cluster_options(
+        {
+            "local_dc": "dc1",
+            "token_aware": False,
+            "compression": False,
+            "protocol_version": 4,
+            "request_timeout": 2.5,
+            "consistency": "local_quorum",
+        }
+    )
+    profile = options["execution_profiles"][EXEC_PROFILE_DEFAULT]
+
+    assert isinstance(profile.load_balancing_policy, DCAwareRoundRobinPolicy)
+    assert profile.load_balancing_policy.local_dc == "dc1"
+    assert profile.consistency_level == ConsistencyLevel.LOCAL_QUORUM
+    assert profile.request_timeout == 2.5
+    assert options["protocol_version"] == 4
+    assert options["compression"] is False
+
+
+def test_cluster_options_falls_back_when_codec_missing(mocker):
+    """Test a compression codec that isn't installed falls back to the best available."""
+    mocker.patch.dict("src.db.connection.locally_supported_compressions", {}, clear=True)
+
+    assert cluster_options({"compression": "lz4"})["compression"] is True
+
+
+def test_cluster_options_rejects_unknown_consistency():
+    """Test an invalid consistency level fails clearly."""
+    with pytest.raises(ValueError, match="consistency"):
+        cluster_options({"consistency": "MOST"})
+
+
+def test_connect_applies_driver_settings(mocker):
+    """Test connect builds the cluster from driver settings and sets pool limits."""
+    cluster = MagicMock(protocol_version=2)
+    cluster_class = mocker.patch("src.db.connection.Cluster", return_value=cluster)
+
+    connection = CassandraConnection(
+        ["10.0.0.1"],
+        port=9043,
+        driver={"protocol_version": 2, "pool": {"max_connections_per_host": 8}},
+    )
+    assert connection.connect() is cluster.connect.return_value
+
+    args, kwargs = cluster_class.call_args
+    assert args == (["10.0.0.1"],)
+    assert kwargs["port"] == 9043
+    assert kwargs["protocol_version"] == 2
+    cluster.set_max_connections_per_host.assert_called_once_with(HostDistance.LOCAL, 8)
+
+
+def test_connect_ignores_pool_settings_for_protocol_v3(mocker):
+    """Test pool limits are skipped where the driver uses one connection per host."""
+    cluster = MagicMock(protocol_version=4)
+    mocker.patch("src.db.connection.Cluster", return_value=cluster)
+
+    CassandraConnection(["10.0.0.1"], driver={"pool": {"max_connections_per_host": 8}}).connect()
+
+    cluster.set_max_connections_per_host.assert_not_called()
@@ -0,0 +1,77 @@
+"""Tests for primary-key deduplication."""
+
+from src.etl import dedup as dedup_module
+from src.etl.dedup import LastWriteFilter
+from src.etl.records import EventRecord
+
+
+def _record(session_id, item, user_id, song, first_name="Ann"):
+    return EventRecord("Artist", first_name, "F", item, "Lee", 200.0, "free", "NYC", session_id, song, user_id)  # fmt: skip
+
+
+RECORDS = [
+    _record(1, 0, 7, "Song A", "Ann"),
+    _record(1, 1, 7, "Song B", "Ann"),
+    _record(2, 0, 7, "Song A", "Annie"),  # replays Song A
+    _record(1, 1, 7, "Song B", "Ann"),  # duplicated raw row
+]
+
+
+def test_scan_keeps_last_record_per_primary_key():
+    """Test each table keeps only the final record of every key."""
+    dedup = LastWriteFilter(["session_item", "user_session", "user_song"])
+
+    assert dedup.scan(RECORDS) == 4
+    assert {table: list(kept) for table, kept in dedup.kept.items()} == {
+        "session_item": [0, 2, 3],
+        "user_session": [0, 2, 3],
+        "user_song": [2, 3],
+    }
+    assert dedup.duplicates == {"session_item": 1, "user_session": 1, "user_song": 2}
+    assert dedup.write_amplification() == {
+        "session_item": 1.333,
+        "user_session": 1.333,
+        "user_song": 2.0,
+    }
+
+
+def test_wrap_sends_only_kept_writes_from_start_position():
+    """Test the wrapped write drops superseded rows, also when resuming mid-stream."""
+    dedup = LastWriteFilter(["user_song"])
+    dedup.scan(RECORDS)
+    sent = []
+
+    write = dedup.wrap("user_song", sent.append)
+    for record in RECORDS:
+        write(record.song)
+    assert sent == ["Song A", "Song B"]
+
+    start = dedup.record_position("user_song", 1)
+    assert start == 3
+    sent.clear()
+    write = dedup.wrap("user_song", sent.append, start=start)
+    for record in RECORDS[start:]:
+        write(record.song)
+    assert sent == ["Song B"]
+
+
+def test_scan_handles_no_records():
+    """Test an empty source yields empty masks."""
+    dedup = LastWriteFilter(["session_item"])
+
+    assert dedup.scan([]) == 0
+    assert dedup.duplicates == {"session_item": 0}
+    assert dedup.record_position("session_item", 0) == 0
+
+
+def test_scan_merges_blocks_into_distinct_key_index(monkeypatch):
+    """Test merging hash blocks keeps one entry per key with its last position."""
+    monkeypatch.setattr(dedup_module, "MERGE_BLOCK_ROWS", 3)
+    records = [_record(i % 4, 0, 7, f"Song {i % 5}") for i in range(40)]
+    dedup = LastWriteFilter(["session_item", "user_song"])
+
+    dedup.scan(records)
+
+    assert list(dedup.kept["session_item"]) == [36, 37, 38, 39]
+    assert list(dedup.kept["user_song"]) == [35, 36, 37, 38, 39]
+    assert dedup.record_position("user_song", 2) == 37
@@ -0,0 +1,61 @@
+"""Tests for the typed column-block event file."""
+
+import pytest
+
+from src.etl.eventfile import (
+    EventFileWriter,
+    is_event_file,
+    iter_event_blocks,
+    read_event_file,
+    write_event_file,
+)
+from src.etl.records import EventRecord
+
+
+@pytest.fixture
+def records():
+    """Typed records with repeated and unicode text values."""
+    return [
+        EventRecord("Artist1", "John", "M", 0, "Doe", 200.5, "free", "NYC", 100, "Song1", 1),
+        EventRecord("Beyoncé", "Jane", "F", 1, "Smith", 180.25, "paid", "NYC", 100, "Song2", 2),
+        EventRecord("Artist1", "John", "M", 2, "Doe", 0.1, "free", "NYC", 2**31 - 1, "", 1),
+    ]
+
+
+def test_is_event_file():
+    """Test the format is chosen by extension."""
+    assert is_event_file("data/events.evc")
+    assert is_event_file("EVENTS.EVC")
+    assert not is_event_file("data/events.csv")
+
+
+def test_round_trip_in_blocks(tmp_path, records):
+    """Test records are read back unchanged, block by block."""
+    output_file = tmp_path / "events.evc"
+
+    assert write_event_file(output_file, records, block_rows=2) == 3
+
+    assert [len(block) for block in iter_event_blocks(output_file)] == [2, 1]
+    assert list(read_event_file(output_file)) == records
+
+
+def test_wide_dictionary_indices(tmp_path):
+    """Test text columns with more distinct values than a one-byte index holds."""
+    records = [
+        EventRecord(f"Artist {i}", "A", "M", i, "B", 1.0, "free", "X", 1, f"Song {i}", i)
+        for i in range(70000)
+    ]
+    output_file = tmp_path / "events.evc"
+    with EventFileWriter(output_file) as writer:
+        writer.write(records)
+
+    assert list(read_event_file(output_file)) == records
+
+
+def test_rejects_other_files(tmp_path):
+    """Test a file without the event file header is rejected."""
+    other_file = tmp_path / "events.evc"
+    other_file.write_bytes(b'"artist","firstName"\r\n')
+
+    with pytest.raises(ValueError):
+        list(read_event_file(other_file))
@@ -1,10 +1,13 @@
 """Tests for data extraction module."""
 
+import csv
 from pathlib import Path
 
 import pytest
 
-from src.etl.extract import EventDataExtractor
+from src.etl import extract
+from src.etl.extract import EventDataExtractor, iter_mapped_rows
+from src.etl.transform import EventDataTransformer
 
 
 def test_extractor_initialization_with_valid_folder(temp_csv_folder):
@@ -55,3 +58,169 @@ def test_extract_handles_empty_folder():
         extractor = EventDataExtractor(temp_dir)
         file_paths = extractor.get_file_paths()
         assert len(file_paths) == 0
+
+
+def test_iter_rows_streams_rows_and_counts(temp_csv_folder):
+    """Test that iter_rows yields rows lazily and tracks counts."""
+    extractor = EventDataExtractor(temp_csv_folder)
+    rows = extractor.iter_rows(extractor.get_file_paths())
+
+    assert next(rows)
+    assert sum(1 for _ in rows) == 8
+    assert extractor.rows_extracted == 9
+    assert extractor.files_processed == 3
+
+
+def test_iter_chunks_bounds_chunk_size(temp_csv_folder):
+    """Test that iter_chunks never yields more than chunk_size rows."""
+    extractor = EventDataExtractor(temp_csv_folder)
+    chunks = list(extractor.iter_chunks(extractor.get_file_paths(), chunk_size=4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 1]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_iter_chunks_parallel_reads_all_files(temp_csv_folder, ordered):
+    """Test that parallel extraction returns every row with per-file stats."""
+    extractor = EventDataExtractor(temp_csv_folder)
+    chunks = list(
+        extractor.iter_chunks_parallel(extractor.get_file_paths(), workers=2, ordered=ordered)
+    )
+
+    assert sum(len(chunk) for chunk in chunks) == 9
+    assert extractor.rows_extracted == 9
+    assert extractor.file_stats == {f"event_{i}.csv": {"rows": 3, "error": None} for i in range(3)}
+
+
+@pytest.mark.parametrize("engine", ["csv", "mmap"])
+def test_iter_chunks_parallel_splits_files_into_bounded_chunks(tmp_path, engine):
+    """Test workers return chunk_size rows at a time, splitting at the right offsets."""
+    rows = [[f"Artist {i}", f'line {i}\nnext, "quoted"', str(i)] for i in range(25)]
+    for day in range(2):
+        with open(tmp_path / f"day_{day}.csv", "w", encoding="utf8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["artist", "location", "song"])
+            writer.writerows(rows)
+    extractor = EventDataExtractor(str(tmp_path), engine=engine)
+
+    chunks = list(
+        extractor.iter_chunks_parallel(extractor.get_file_paths(), workers=2, chunk_size=10)
+    )
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5, 10, 10, 5]
+    assert [list(row) for chunk in chunks for row in chunk] == rows + rows
+    assert extractor.files_processed == 2
+    assert extractor.file_stats["day_0.csv"] == {"rows": 25, "error": None}
+
+
+def test_iter_files_parallel_ordered_sorts_by_path(temp_csv_folder):
+    """Test that ordered parallel extraction yields files sorted by path."""
+    extractor = EventDataExtractor(temp_csv_folder)
+    paths = extractor.get_file_paths()
+    results = list(extractor.iter_files_parallel(sorted(paths, reverse=True), workers=2))
+
+    assert [r.path for r in results] == sorted(paths)
+
+
+def test_iter_chunks_parallel_reports_failed_files(temp_csv_folder):
+    """Test that failed files are reported and raised after the others are read."""
+    extractor = EventDataExtractor(temp_csv_folder)
+    paths = extractor.get_file_paths() + [Path(temp_csv_folder) / "missing.csv"]
+
+    with pytest.raises(RuntimeError, match="missing.csv"):
+        for _ in extractor.iter_chunks_parallel(paths, workers=2):
+            pass
+
+    assert extractor.rows_extracted == 9
+    assert "FileNotFoundError" in extractor.file_stats["missing.csv"]["error"]
+
+
+@pytest.fixture
+def raw_event_folder(tmp_path):
+    """Create raw event files with the full 17-column layout."""
+    from benchmarks.generate_events import EventGenerator
+
+    EventGenerator(seed=1, songs=200, artists=50, users=20).write_files(tmp_path, rows=300, days=3)
+    return str(tmp_path)
+
+
+def test_mmap_engine_matches_csv_engine(raw_event_folder):
+    """Test that projected mmap rows transform exactly like full csv rows."""
+    columns = EventDataTransformer.OUTPUT_COLUMNS
+    csv_extractor = EventDataExtractor(raw_event_folder)
+    mmap_extractor = EventDataExtractor(raw_event_folder, engine="mmap", columns=columns)
+    paths = sorted(csv_extractor.get_file_paths())
+
+    full_transformer = EventDataTransformer(str(Path(raw_event_folder) / "out.csv"))
+    expected = [full_transformer.transform_row(row) for row in csv_extractor.iter_rows(paths)]
+    rows = list(mmap_extractor.iter_rows(paths))
+
+    assert [list(row) for row in rows] == expected
+    assert mmap_extractor.rows_extracted == csv_extractor.rows_extracted == 300
+    assert mmap_extractor.files_processed == 3
+
+    projected_transformer = EventDataTransformer(
+        str(Path(raw_event_folder) / "out.csv"), input_columns=mmap_extractor.columns
+    )
+    assert [projected_transformer.transform_row(row) for row in rows] == expected
+    assert [projected_transformer.should_skip_row(row) for row in rows] == [
+        full_transformer.should_skip_row(row) for row in csv_extractor.iter_rows(paths)
+    ]
+
+
+def test_iter_mapped_rows_handles_quoted_fields(tmp_path):
+    """Test that quoted commas and newlines stay inside their field."""
+    file_path = tmp_path / "events.csv"
+    file_path.write_text(
+        "artist,location,song\r\n"
+        'A,"San Francisco-Oakland-Hayward, CA",x\r\n'
+        'B,"two\nlines",y\r\n',
+        encoding="utf8",
+    )
+
+    assert list(iter_mapped_rows(file_path, ["song", "location"])) == [
+        ("x", "San Francisco-Oakland-Hayward, CA"),
+        ("y", "two\nlines"),
+    ]
+    assert list(iter_mapped_rows(file_path)) == [
+        ["A", "San Francisco-Oakland-Hayward, CA", "x"],
+        ["B", "two\nlines", "y"],
+    ]
+
+
+def test_iter_mapped_rows_streams_small_blocks(tmp_path, monkeypatch):
+    """Test that rows, quoted newlines and multi-byte text survive block boundaries."""
+    monkeypatch.setattr(extract, "MAPPED_BLOCK_BYTES", 8)
+    file_path = tmp_path / "events.csv"
+    rows = [["Beyoncé", f'line {i}\nnext, "quoted"', str(i)] for i in range(50)]
+    with open(file_path, "w", encoding="utf8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["artist", "location", "song"])
+        writer.writerows(rows)
+
+    assert list(iter_mapped_rows(file_path)) == rows
+
+
+def test_iter_mapped_rows_rejects_missing_columns(tmp_path):
+    """Test that projecting a column absent from the header fails clearly."""
+    file_path = tmp_path / "events.csv"
+    file_path.write_text("artist,song\nA,x\n", encoding="utf8")
+
+    with pytest.raises(ValueError, match="userId"):
+        list(iter_mapped_rows(file_path, ["artist", "userId"]))
+
+
+def test_iter_chunks_parallel_mmap_engine(raw_event_folder):
+    """Test that worker processes read with the configured engine."""
+    columns = EventDataTransformer.OUTPUT_COLUMNS
+    extractor = EventDataExtractor(raw_event_folder, engine="mmap", columns=columns)
+    chunks = list(extractor.iter_chunks_parallel(extractor.get_file_paths(), workers=2))
+
+    assert sum(len(chunk) for chunk in chunks) == 300
+    assert all(len(row) == len(columns) for chunk in chunks for row in chunk)
+
+
+def test_extractor_rejects_unknown_engine(temp_csv_folder):
+    """Test that an unknown extract engine is rejected."""
+    with pytest.raises(ValueError, match="extract engine"):
+        EventDataExtractor(temp_csv_folder, engine="arrow")
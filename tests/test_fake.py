@@ -0,0 +1,124 @@
+"""Tests for the in-process Cassandra stand-in."""
+
+import pytest
+from cassandra import InvalidRequest, OperationTimedOut
+from cassandra.protocol import OverloadedErrorMessage
+from cassandra.query import BatchStatement, BatchType
+
+from src.db.fake import FakeCluster, FakeSession, constant_latency
+from src.etl.load import EventDataLoader
+from src.etl.throttle import AdaptiveThrottle
+
+
+def test_prepared_insert_and_select(fake_session):
+    """Test rows are stored by primary key and read back in clustering order."""
+    insert = fake_session.prepare(
+        "INSERT INTO user_session (sessionId, userId, itemInSession, artist, song, firstName, "
+        "lastName) VALUES (?, ?, ?, ?, ?, ?, ?)"
+    )
+    for item in (2, 0, 1):
+        fake_session.execute(insert, (7, 1, item, "A", f"Song {item}", "Ann", "Lee"))
+    fake_session.execute(insert, (7, 1, 1, "A", "Replaced", "Ann", "Lee"))
+
+    rows = fake_session.execute(
+        "SELECT song FROM user_session WHERE sessionId = %s AND userId = %s", (7, 1)
+    )
+
+    assert [row.song for row in rows] == ["Song 0", "Replaced", "Song 2"]
+    assert len(fake_session.tables["user_session"]) == 3
+
+
+def test_batch_of_prepared_statements(fake_session):
+    """Test an UNLOGGED batch applies every statement, including quoted literals."""
+    insert = fake_session.prepare(
+        "INSERT INTO user_song (song, userId, firstName, lastName) VALUES (?, ?, ?, ?)"
+    )
+    batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+    batch.add(insert, ("Don't Stop", 1, "Ann", "Lee"))
+    batch.add(insert, ("Don't Stop", 2, "Bob", None))
+    fake_session.execute(batch)
+
+    rows = fake_session.execute("SELECT * FROM user_song WHERE song = ?", ("Don't Stop",))
+
+    assert [(row.userid, row.lastname) for row in rows] == [(1, "Lee"), (2, None)]
+    assert fake_session.stats()["batches"] == 1
+
+
+def test_invalid_statements_fail(fake_session):
+    """Test missing tables and primary key columns are rejected."""
+    with pytest.raises(InvalidRequest):
+        fake_session.execute("INSERT INTO missing (a) VALUES (1)")
+    with pytest.raises(InvalidRequest):
+        fake_session.execute("INSERT INTO user_song (song, firstName) VALUES ('x', 'y')")
+
+
+def test_latency_completes_in_background():
+    """Test requests stay in flight until their latency elapses."""
+    session = FakeSession(latency=constant_latency(20))
+    session.execute("CREATE TABLE t (k int PRIMARY KEY, v text)")
+    calls = []
+
+    futures = [session.execute_async("INSERT INTO t (k, v) VALUES (%s, 'x')", (i,)) for i in (1, 2)]
+    futures[0].add_callbacks(calls.append, calls.append)
+
+    assert session.stats()["in_flight"] == 2
+    assert [f.result() for f in futures] == [[], []]
+    assert calls == [[]]
+    assert session.stats()["peak_in_flight"] == 2
+    session.shutdown()
+
+
+def test_max_in_flight_rejects_as_overloaded():
+    """Test requests beyond the in-flight limit fail with an overload error."""
+    session = FakeSession(latency=constant_latency(20), max_in_flight=1)
+    session.execute("CREATE TABLE t (k int PRIMARY KEY)")
+
+    session.execute_async("INSERT INTO t (k) VALUES (1)")
+    with pytest.raises(OverloadedErrorMessage):
+        session.execute_async("INSERT INTO t (k) VALUES (2)").result()
+
+    assert session.stats()["rejected"] == 1
+    session.shutdown()
+
+
+def test_injected_errors_are_not_applied(fake_session):
+    """Test injected failures surface on the future and skip the write."""
+    fake_session.inject_error(OperationTimedOut("boom"))
+
+    with pytest.raises(OperationTimedOut):
+        fake_session.execute("INSERT INTO user_song (song, userId) VALUES ('s', 1)")
+
+    assert len(fake_session.tables["user_song"]) == 0
+    assert fake_session.stats()["timeouts"] == 1
+
+
+def test_cluster_sessions_share_tables():
+    """Test sessions of one cluster see the same tables."""
+    cluster = FakeCluster(latency=constant_latency(1))
+    first, second = cluster.connect("sparkify"), cluster.connect()
+    first.execute("CREATE TABLE IF NOT EXISTS sparkify.t (k int, PRIMARY KEY (k))")
+
+    second.execute("INSERT INTO t (k) VALUES (1)")
+
+    assert first.keyspace == "sparkify"
+    assert len(first.tables["t"]) == 1
+    cluster.shutdown()
+
+
+def test_loader_retries_injected_overloads(fake_session, temp_csv_file):
+    """Test the throttled loader writes every row despite overload errors."""
+    fake_session.inject_error(OverloadedErrorMessage(0x1001, "Overloaded", {}), count=2)
+    loader = EventDataLoader(
+        fake_session,
+        temp_csv_file,
+        fan_out=True,
+        batch_rows=10,
+        throttle=AdaptiveThrottle(initial_window=4, max_retries=20),
+    )
+
+    results = loader.load_all_tables()
+
+    assert results == {"session_item": 3, "user_session": 3, "user_song": 3}
+    assert len(fake_session.tables["session_item"]) == 3
+    assert fake_session.stats()["overloads"] == 2
+    assert loader.throttle.stats()["retries"] == 2
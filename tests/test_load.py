@@ -1,10 +1,14 @@
 """Tests for data loading module."""
 
 from pathlib import Path
+from unittest.mock import Mock
 
 import pytest
 
+from src.etl.checkpoint import LoadCheckpoint
+from src.etl.eventfile import write_event_file
 from src.etl.load import EventDataLoader
+from src.etl.records import EventRecord
 
 
 def test_loader_initialization_with_valid_file(mock_cassandra_session, temp_csv_file):
@@ -57,3 +61,163 @@ def test_load_all_tables(mock_cassandra_session, temp_csv_file):
     assert "user_session" in results
     assert "user_song" in results
     assert all(count > 0 for count in results.values())
+
+
+def test_load_with_batch_size_uses_prepared_async_inserts(mock_cassandra_session, temp_csv_file):
+    """Test that batch_size switches to prepared statements and async inserts."""
+    loader = EventDataLoader(mock_cassandra_session, temp_csv_file, batch_size=2)
+    results = loader.load_all_tables()
+
+    assert results == {"session_item": 3, "user_session": 3, "user_song": 3}
+    assert mock_cassandra_session.prepare.call_count == 3
+    assert mock_cassandra_session.execute_async.call_count == 9
+    assert not mock_cassandra_session.execute.called
+
+
+def test_load_with_batch_size_binds_converted_values(mock_cassandra_session, temp_csv_file):
+    """Test that prepared inserts are bound with typed values."""
+    loader = EventDataLoader(mock_cassandra_session, temp_csv_file, batch_size=10)
+    loader.load_session_item_table()
+
+    args = mock_cassandra_session.execute_async.call_args_list[0][0]
+    assert args[0] == mock_cassandra_session.prepare.return_value
+    assert args[1] == (100, 1, "Artist1", "Song1", 200.5)
+
+
+def test_load_all_tables_fan_out_reads_file_once(mock_cassandra_session, temp_csv_file, mocker):
+    """Test that fan-out loading parses each row once for all tables."""
+    loader = EventDataLoader(mock_cassandra_session, temp_csv_file, batch_size=4, fan_out=True)
+    iter_records = mocker.spy(loader, "_iter_records")
+
+    results = loader.load_all_tables()
+
+    assert results == {"session_item": 3, "user_session": 3, "user_song": 3}
+    assert iter_records.call_count == 1
+    assert mock_cassandra_session.execute_async.call_count == 9
+
+
+def test_load_all_tables_with_partition_batches(mock_cassandra_session, temp_csv_file):
+    """Test that batching keeps per-table counts while sending fewer requests."""
+    mock_cassandra_session.prepare.side_effect = lambda query: query.replace("?", "%s")
+    loader = EventDataLoader(
+        mock_cassandra_session, temp_csv_file, batch_size=4, fan_out=True, batch_rows=10
+    )
+    results = loader.load_all_tables()
+
+    assert results == {"session_item": 3, "user_session": 3, "user_song": 3}
+    # Rows 1-2 share sessionId 100 in session_item; all other partitions differ
+    assert loader.batches_sent == {"session_item": 2, "user_session": 3, "user_song": 3}
+    assert mock_cassandra_session.execute_async.call_count == 8
+
+
+def test_load_records_without_data_file(mock_cassandra_session, temp_csv_file):
+    """Test loading records handed over in memory."""
+    file_loader = EventDataLoader(mock_cassandra_session, temp_csv_file)
+    records = list(file_loader._iter_records())
+
+    loader = EventDataLoader(mock_cassandra_session, batch_size=4)
+    results = loader.load_records(iter(records))
+
+    assert loader.data_file is None
+    assert results == {"session_item": 3, "user_session": 3, "user_song": 3}
+
+
+def test_load_resumes_from_checkpoint_after_failure(
+    mock_cassandra_session, temp_csv_file, tmp_path
+):
+    """Test that an interrupted fan-out load skips acknowledged rows on resume."""
+    checkpoint_file = str(tmp_path / "checkpoint.json")
+    failed = Mock()
+    failed.result.side_effect = RuntimeError("write timeout")
+    # Row 1 succeeds for all tables, row 2 fails on user_session
+    mock_cassandra_session.execute_async = Mock(
+        side_effect=[Mock(), Mock(), Mock(), Mock(), failed]
+    )
+
+    loader = EventDataLoader(
+        mock_cassandra_session,
+        temp_csv_file,
+        fan_out=True,
+        checkpoint=LoadCheckpoint(checkpoint_file, "events"),
+    )
+    with pytest.raises(RuntimeError):
+        loader.load_all_tables()
+
+    checkpoint = LoadCheckpoint(checkpoint_file, "events", resume=True)
+    assert checkpoint.positions == {"session_item": 2, "user_session": 1, "user_song": 1}
+
+    resumed_session = Mock()
+    resumed = EventDataLoader(resumed_session, temp_csv_file, fan_out=True, checkpoint=checkpoint)
+    results = resumed.load_all_tables()
+
+    assert results == {"session_item": 1, "user_session": 2, "user_song": 2}
+    assert resumed.rows_resumed == {"session_item": 2, "user_session": 1, "user_song": 1}
+    first_user_session = resumed_session.execute_async.call_args_list[0].args[1]
+    assert first_user_session[:2] == (100, 2)  # sessionId, userId of row 2
+
+
+@pytest.mark.parametrize("fan_out", [True, False])
+def test_load_from_event_file(fake_session, tmp_path, fan_out):
+    """Test a typed .evc file loads the same rows without CSV parsing."""
+    data_file = tmp_path / "events.evc"
+    write_event_file(
+        data_file,
+        [
+            EventRecord("Artist1", "John", "M", 1, "Doe", 200.5, "free", "NYC", 100, "Song1", 1),
+            EventRecord("Artist2", "Jane", "F", 2, "Smith", 180.3, "paid", "LA", 100, "Song2", 2),
+        ],
+    )
+
+    results = EventDataLoader(fake_session, str(data_file), fan_out=fan_out).load_all_tables()
+
+    assert results == {"session_item": 2, "user_session": 2, "user_song": 2}
+    rows = fake_session.execute("SELECT song, length FROM session_item WHERE sessionId = 100")
+    assert [(row.song, row.length) for row in rows] == [("Song1", 200.5), ("Song2", 180.3)]
+
+
+@pytest.mark.parametrize("fan_out", [True, False])
+def test_load_with_dedup_writes_last_row_per_key(fake_session, tmp_path, fan_out):
+    """Test deduplication drops superseded writes but leaves the same table contents."""
+    data_file = tmp_path / "events.evc"
+    write_event_file(
+        data_file,
+        [
+            EventRecord("Artist1", "John", "M", 1, "Doe", 200.5, "free", "NYC", 100, "Song1", 1),
+            EventRecord("Artist2", "John", "M", 2, "Doe", 180.3, "free", "NYC", 100, "Song2", 1),
+            EventRecord("Artist1", "Johnny", "M", 0, "Doe", 200.5, "paid", "NYC", 101, "Song1", 1),
+            EventRecord("Artist2", "John", "M", 2, "Doe", 180.3, "free", "NYC", 100, "Song2", 1),
+        ],
+    )
+
+    loader = EventDataLoader(fake_session, str(data_file), fan_out=fan_out, dedup=True)
+    results = loader.load_all_tables()
+
+    assert results == {"session_item": 3, "user_session": 3, "user_song": 2}
+    assert loader.rows_deduplicated == {"session_item": 1, "user_session": 1, "user_song": 2}
+    assert loader.write_amplification["user_song"] == 2.0
+    rows = fake_session.execute("SELECT userId, firstName FROM user_song WHERE song = 'Song1'")
+    assert [(row.userid, row.firstname) for row in rows] == [(1, "Johnny")]
+
+
+def test_load_with_dedup_resumes_from_checkpoint(fake_session, tmp_path):
+    """Test checkpoints count deduplicated writes, so a resume continues after them."""
+    data_file = tmp_path / "events.evc"
+    write_event_file(
+        data_file,
+        [
+            EventRecord("Artist1", "John", "M", 0, "Doe", 200.5, "free", "NYC", 100, "Song1", 1),
+            EventRecord("Artist1", "Jane", "F", 0, "Roe", 200.5, "free", "NYC", 200, "Song1", 1),
+            EventRecord("Artist2", "Jane", "F", 1, "Roe", 180.3, "free", "NYC", 200, "Song2", 1),
+        ],
+    )
+    checkpoint = LoadCheckpoint(str(tmp_path / "checkpoint.json"), "events")
+    checkpoint.update("user_song", 1)  # Song1 by its last record was acknowledged
+
+    loader = EventDataLoader(
+        fake_session, str(data_file), fan_out=True, dedup=True, checkpoint=checkpoint
+    )
+    results = loader.load_all_tables()
+
+    assert results == {"session_item": 3, "user_session": 3, "user_song": 1}
+    assert list(fake_session.execute("SELECT * FROM user_song WHERE song = 'Song1'")) == []
+    assert len(list(fake_session.execute("SELECT * FROM user_song WHERE song = 'Song2'"))) == 1
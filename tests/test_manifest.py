@@ -0,0 +1,57 @@
+"""Tests for the processed-file manifest."""
+
+import json
+import os
+from pathlib import Path
+
+from src.etl.manifest import FileManifest, file_sha256
+
+
+def _csv_files(folder):
+    """Return the sorted CSV files in a folder."""
+    return sorted(Path(folder).glob("*.csv"))
+
+
+def test_new_manifest_returns_all_files(temp_csv_folder, tmp_path):
+    """Test that every file is new when no manifest exists."""
+    manifest = FileManifest(str(tmp_path / "manifest.json"))
+    assert manifest.filter_changed(_csv_files(temp_csv_folder)) == _csv_files(temp_csv_folder)
+
+
+def test_commit_records_size_mtime_and_hash(temp_csv_folder, tmp_path):
+    """Test that committed entries are persisted with content hashes."""
+    manifest_file = tmp_path / "manifest.json"
+    manifest = FileManifest(str(manifest_file))
+    manifest.filter_changed(_csv_files(temp_csv_folder))
+    manifest.commit()
+
+    entries = json.loads(manifest_file.read_text())["files"]
+    first = _csv_files(temp_csv_folder)[0]
+    assert entries[str(first)]["sha256"] == file_sha256(first)
+    assert entries[str(first)]["size"] == first.stat().st_size
+
+
+def test_only_new_or_changed_files_are_returned(temp_csv_folder, tmp_path):
+    """Test incremental selection after a committed run."""
+    manifest_file = str(tmp_path / "manifest.json")
+    files = _csv_files(temp_csv_folder)
+    first_run = FileManifest(manifest_file)
+    first_run.filter_changed(files)
+    first_run.commit()
+
+    # Touched but identical content is not reprocessed; appended content is
+    os.utime(files[0], (0, 12345))
+    with open(files[1], "a", encoding="utf8") as f:
+        f.write("extra,row\n")
+
+    second_run = FileManifest(manifest_file)
+    assert second_run.filter_changed(files) == [files[1]]
+    assert second_run.filter_changed(files, full_refresh=True) == files
+
+
+def test_uncommitted_entries_are_not_persisted(temp_csv_folder, tmp_path):
+    """Test that a failed run leaves files to be processed again."""
+    manifest_file = str(tmp_path / "manifest.json")
+    FileManifest(manifest_file).filter_changed(_csv_files(temp_csv_folder))
+
+    assert len(FileManifest(manifest_file).filter_changed(_csv_files(temp_csv_folder))) == 3
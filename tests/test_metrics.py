@@ -0,0 +1,70 @@
+"""Tests for pipeline metrics."""
+
+import json
+
+import pytest
+
+from src.utils.metrics import LatencyHistogram, PipelineMetrics
+
+
+def test_histogram_quantiles():
+    """Test quantiles fall within a bucket of the exact values."""
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.observe(ms / 1000)
+
+    assert histogram.count == 100
+    assert histogram.quantile(0.5) == pytest.approx(0.050, rel=0.25)
+    assert histogram.quantile(0.99) == pytest.approx(0.099, rel=0.25)
+    assert histogram.quantile(1.0) == 0.1
+    assert LatencyHistogram().quantile(0.5) is None
+
+
+def test_nested_phases_are_exclusive():
+    """Test time spent in a nested phase isn't credited to the enclosing one."""
+    ticks = iter(range(100))
+    metrics = PipelineMetrics(clock=lambda: next(ticks))
+
+    with metrics.phase("load"):  # starts at 0
+        for _ in metrics.timed("extract", [1, 2]):  # 1-2, 3-4, 5-6
+            pass
+    # load ends at 7: 7 - 0 - 3 seconds spent extracting
+
+    assert metrics.phases == {"extract": 3, "load": 4}
+
+
+def test_stage_throughput():
+    """Test rows/s and bytes/s are computed over the stage's phase."""
+    metrics = PipelineMetrics()
+    metrics.phases["extract"] = 2.0
+    metrics.record_stage("extract", rows=1000, bytes=4000)
+    metrics.record_stage("load", rows=10)
+
+    assert metrics.stage_throughput("extract") == {
+        "rows_per_second": 500.0,
+        "bytes_per_second": 2000.0,
+    }
+    assert metrics.stage_throughput("load") == {}
+
+
+def test_export_json_and_prometheus(tmp_path):
+    """Test both export formats contain the recorded metrics."""
+    metrics = PipelineMetrics()
+    metrics.phases["load"] = 1.5
+    metrics.record_stage("load", rows=30)
+    metrics.observe_latency("user_song", 0.002)
+    metrics.increment("write_retries", 2)
+
+    metrics.export(str(tmp_path / "m.json"), str(tmp_path / "m.prom"))
+
+    exported = json.loads((tmp_path / "m.json").read_text())
+    assert exported["stages"]["load"]["rows_per_second"] == 20.0
+    assert exported["insert_latency"]["user_song"]["count"] == 1
+    assert exported["counters"] == {"write_retries": 2}
+
+    text = (tmp_path / "m.prom").read_text()
+    assert 'etl_phase_seconds{phase="load"} 1.5' in text
+    assert 'etl_insert_latency_seconds_bucket{table="user_song",le="+Inf"} 1' in text
+    assert 'etl_insert_latency_seconds_count{table="user_song"} 1' in text
+    assert "# TYPE etl_write_retries_total counter" in text
+    assert "etl_write_retries_total 2" in text
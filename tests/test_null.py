@@ -0,0 +1,30 @@
+"""Tests for the counting null session."""
+
+from src.db.null import NullBatchStatement, NullSession
+from src.etl.load import EventDataLoader
+
+
+def test_null_session_counts_loader_writes(temp_csv_file):
+    """Test every write is acknowledged and counted, batched or not."""
+    session = NullSession()
+
+    results = EventDataLoader(
+        session, temp_csv_file, batch_size=4, fan_out=True, batch_rows=10
+    ).load_all_tables()
+
+    assert results == {"session_item": 3, "user_session": 3, "user_song": 3}
+    assert session.stats()["statements"] == 9
+    assert session.execute("SELECT * FROM user_song") == []
+
+
+def test_null_session_counts_light_batches():
+    """Test a null batch counts as one request holding its statements."""
+    session = NullSession()
+    statement = session.prepare("INSERT INTO user_song (song, userId) VALUES (?, ?)")
+    batch = NullBatchStatement()
+    batch.add(statement, ("Song", 1))
+    batch.add(statement, ("Song", 2))
+
+    session.execute(batch)
+
+    assert session.stats() == {"requests": 1, "statements": 2, "batches": 1}
@@ -0,0 +1,213 @@
+"""Tests for ETL pipeline orchestration."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.etl.pipeline import ETLPipeline
+
+
+@pytest.fixture
+def pipeline_config(sample_config, temp_raw_csv_folder, tmp_path):
+    """Pipeline configuration pointing at temporary raw and processed files."""
+    sample_config["data"] = {
+        "raw_folder": temp_raw_csv_folder,
+        "processed_file": str(tmp_path / "events.csv"),
+    }
+    sample_config["etl"]["fan_out"] = True
+    return sample_config
+
+
+@pytest.fixture
+def mock_connection(mocker, mock_cassandra_session):
+    """Patch CassandraConnection to yield the mock session."""
+    connection = MagicMock()
+    connection.__enter__.return_value = mock_cassandra_session
+    mocker.patch("src.db.connection.CassandraConnection", return_value=connection)
+    return connection
+
+
+def test_pipeline_run_with_file_handoff(pipeline_config, mock_connection):
+    """Test that the pipeline loads every transformed row from the processed file."""
+    stats = ETLPipeline(pipeline_config).run()
+
+    assert stats["rows_extracted"] == 6
+    assert stats["rows_skipped"] == 2
+    assert stats["rows_transformed"] == 4
+    assert stats["rows_loaded"] == {"session_item": 4, "user_session": 4, "user_song": 4}
+
+
+@pytest.mark.parametrize("handoff", ["file", "memory"])
+def test_pipeline_records_metrics(pipeline_config, mock_connection, tmp_path, handoff):
+    """Test that stage metrics are recorded and exported in both formats."""
+    pipeline_config["etl"]["handoff"] = handoff
+    pipeline_config["etl"]["batch_size"] = 10
+    pipeline_config["metrics"] = {
+        "json_file": str(tmp_path / "metrics.json"),
+        "prometheus_file": str(tmp_path / "metrics.prom"),
+    }
+    stats = ETLPipeline(pipeline_config).run()
+
+    metrics = stats["metrics"]
+    assert {"discover", "extract", "transform", "schema", "load"} <= set(metrics["phases_seconds"])
+    assert metrics["stages"]["extract"]["rows"] == 6
+    assert metrics["stages"]["transform"]["rows"] == 4
+    assert metrics["stages"]["load"]["rows"] == 12
+    assert metrics["insert_latency"]["user_song"]["count"] == 4
+    assert (tmp_path / "metrics.json").exists()
+    assert "etl_stage_rows" in (tmp_path / "metrics.prom").read_text()
+
+
+@pytest.mark.parametrize("write_processed_file", [True, False])
+def test_pipeline_run_with_memory_handoff(pipeline_config, mock_connection, write_processed_file):
+    """Test that in-memory handoff loads the same rows and optionally writes the file."""
+    pipeline_config["etl"]["handoff"] = "memory"
+    pipeline_config["etl"]["write_processed_file"] = write_processed_file
+    stats = ETLPipeline(pipeline_config).run()
+
+    assert stats["rows_transformed"] == 4
+    assert stats["rows_loaded"] == {"session_item": 4, "user_session": 4, "user_song": 4}
+    assert Path(pipeline_config["data"]["processed_file"]).exists() is write_processed_file
+
+
+@pytest.mark.parametrize("handoff", ["file", "memory"])
+def test_pipeline_run_with_columnar_engine(pipeline_config, mock_connection, handoff):
+    """Test that the columnar engine reports the same counts as the row engine."""
+    pipeline_config["etl"]["transform_engine"] = "columnar"
+    pipeline_config["etl"]["handoff"] = handoff
+    stats = ETLPipeline(pipeline_config).run()
+
+    assert stats["rows_extracted"] == 6
+    assert stats["rows_transformed"] == 4
+    assert stats["rows_loaded"] == {"session_item": 4, "user_session": 4, "user_song": 4}
+
+
+def test_pipeline_incremental_run_skips_processed_files(pipeline_config, mock_connection, tmp_path):
+    """Test that a second incremental run only reprocesses with full refresh."""
+    pipeline_config["etl"]["incremental"] = True
+    pipeline_config["data"]["manifest_file"] = str(tmp_path / "manifest.json")
+
+    first = ETLPipeline(pipeline_config).run()
+    second = ETLPipeline(pipeline_config).run()
+    refreshed = ETLPipeline(pipeline_config, full_refresh=True).run()
+
+    assert first["files_processed"] == 2
+    assert second["files_processed"] == 0
+    assert second["rows_loaded"] == {}
+    assert refreshed["rows_loaded"]["user_song"] == 4
+
+
+def test_pipeline_reports_deduplicated_writes(pipeline_config, mock_connection):
+    """Test that rows repeated across raw files are written once per primary key."""
+    pipeline_config["etl"]["dedup"] = True
+    stats = ETLPipeline(pipeline_config).run()
+
+    # Both raw files hold the same events, so every key is written twice
+    tables = ("session_item", "user_session", "user_song")
+    assert stats["rows_transformed"] == 4
+    assert stats["rows_loaded"] == dict.fromkeys(tables, 2)
+    assert stats["rows_deduplicated"] == dict.fromkeys(tables, 2)
+    assert stats["write_amplification"] == dict.fromkeys(tables, 2.0)
+
+
+@pytest.mark.parametrize("handoff", ["file", "memory"])
+def test_pipeline_loads_partition_sorted_tables(
+    pipeline_config, mock_connection, tmp_path, handoff
+):
+    """Test that sorted per-table files are written, deduplicated and loaded."""
+    pipeline_config["etl"]["handoff"] = handoff
+    pipeline_config["etl"]["dedup"] = True
+    pipeline_config["etl"]["sort"] = {"enabled": True, "output_folder": str(tmp_path / "sorted")}
+    pipeline = ETLPipeline(pipeline_config)
+    stats = pipeline.run()
+
+    tables = ("session_item", "user_session", "user_song")
+    assert stats["rows_sorted"] == dict.fromkeys(tables, 2)
+    assert stats["rows_deduplicated"] == dict.fromkeys(tables, 2)
+    assert stats["rows_loaded"] == dict.fromkeys(tables, 2)
+    assert sorted(path.name for path in (tmp_path / "sorted").iterdir()) == [
+        f"{table}.csv" for table in tables
+    ]
+    assert "sort" in pipeline.metrics.phases
+
+
+def test_pipeline_dry_run_counts_writes_without_cassandra(pipeline_config, mocker, tmp_path):
+    """Test a dry run transforms everything and counts writes without connecting."""
+    connection = mocker.patch("src.db.connection.CassandraConnection")
+    pipeline_config["etl"].update(incremental=True, batch_size=10, batch_rows=2)
+    pipeline_config["data"]["manifest_file"] = str(tmp_path / "manifest.json")
+
+    stats = ETLPipeline(pipeline_config, dry_run=True).run()
+
+    connection.assert_not_called()
+    assert stats["rows_transformed"] == 4
+    assert stats["rows_loaded"] == {"session_item": 4, "user_session": 4, "user_song": 4}
+    assert stats["dry_run_requests"]["statements"] == 12
+    assert stats["dry_run_requests"]["batches"] > 0
+    assert not (tmp_path / "manifest.json").exists()
+
+
+def test_pipeline_import_does_not_load_driver_or_pandas():
+    """Test the driver and pandas are only imported on the code paths using them."""
+    code = (
+        "import sys; import src.etl.pipeline, src.etl.watch; "
+        "print(sorted({name.split('.')[0] for name in sys.modules} & {'cassandra', 'pandas'}))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_pipeline_dry_run_with_batching_does_not_load_driver(pipeline_config, tmp_path):
+    """Test a batching dry run builds light batches instead of importing the driver."""
+    pipeline_config["etl"].update(batch_size=10, batch_rows=2)
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(pipeline_config), encoding="utf8")
+    code = (
+        "import json, sys; from src.etl.pipeline import ETLPipeline; "
+        f"config = json.load(open({str(config_file)!r})); "
+        "stats = ETLPipeline(config, dry_run=True).run(); "
+        "print(stats['dry_run_requests']['batches'] > 0, 'cassandra' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip().splitlines()[-1] == "True False"
+
+
+def test_configured_pipeline_refreshes_query_cache_after_load(pipeline_config, mocker):
+    """Test the kept session gets a configured query service whose cache is re-warmed."""
+    from src.db.fake import FakeSession
+
+    connection = mocker.patch("src.db.connection.CassandraConnection").return_value
+    connection.connect.return_value = FakeSession()
+    pipeline_config["queries"] = {"cache_size": 8, "ttl_seconds": 30}
+    pipeline = ETLPipeline(pipeline_config)
+    pipeline.open()
+
+    queries = pipeline.query_service
+    assert (queries.cache.max_size, queries.cache.ttl_seconds) == (8, 30)
+    assert queries.song_listeners("Song1") == []
+
+    stats = pipeline.run()
+
+    assert [listener.firstName for listener in queries.song_listeners("Song1")] == ["John"]
+    assert stats["query_cache"]["size"] == 1
+    pipeline.close()
+    assert pipeline.query_service is None
+
+
+@pytest.mark.parametrize("mode", ["pre-warm", "none"])
+def test_pipeline_rejects_unknown_query_refresh_mode(pipeline_config, mode):
+    """Test a misspelt refresh mode fails when the pipeline is built, not after a load."""
+    pipeline_config["queries"] = {"refresh_after_load": mode}
+
+    with pytest.raises(ValueError, match="refresh mode"):
+        ETLPipeline(pipeline_config)
@@ -0,0 +1,134 @@
+"""Tests for per-phase CPU and memory profiling."""
+
+import pstats
+
+import pytest
+
+from src.etl.pipeline import ETLPipeline
+from src.utils.metrics import PipelineMetrics
+from src.utils.profiling import PhaseProfiler
+
+
+def parse_rows(count):
+    return [str(i) for i in range(count)]
+
+
+def transform_rows(rows):
+    return [row * 2 for row in rows]
+
+
+def _stats(path):
+    return {function for _, _, function in pstats.Stats(str(path)).stats}
+
+
+def test_cpu_profiles_are_split_by_phase(tmp_path):
+    """Test streamed stages and nested phases get separate CPU profiles."""
+    profiler = PhaseProfiler("cpu", tmp_path)
+    metrics = PipelineMetrics(profiler=profiler)
+    profiler.start()
+
+    with metrics.phase("transform"):
+        for rows in metrics.timed("extract", (parse_rows(100) for _ in range(3))):
+            transform_rows(rows)
+    profiler.stop()
+
+    assert "parse_rows" in _stats(tmp_path / "extract.pstats")
+    assert "parse_rows" not in _stats(tmp_path / "transform.pstats")
+    assert "transform_rows" in _stats(tmp_path / "transform.pstats")
+    assert "cumulative time" in (tmp_path / "transform.cpu.txt").read_text()
+
+
+def test_memory_reports_list_allocation_sites(tmp_path):
+    """Test memory mode reports peak memory and the lines that allocated it."""
+    profiler = PhaseProfiler("memory", tmp_path, top=5)
+    metrics = PipelineMetrics(profiler=profiler)
+    profiler.start()
+
+    with metrics.phase("load"):
+        kept = parse_rows(10000)
+    profiler.stop()
+
+    report = (tmp_path / "load.memory.txt").read_text()
+    assert report.startswith("Phase load: peak traced memory")
+    assert "test_profiling.py" in report
+    assert len(kept) == 10000
+    assert not list(tmp_path.glob("*.pstats"))
+
+
+def _growth_sites(report):
+    sites = report.split("by growth:")[1].split("held at the end")[0]
+    return {line.split(": size=")[0].rsplit("/", 1)[-1] for line in sites.splitlines()[1:]}
+
+
+def test_memory_of_streamed_phase_is_not_charged_to_enclosing_phase(tmp_path):
+    """Test each streamed chunk is snapshotted and credited to its own phase only."""
+    profiler = PhaseProfiler("memory", tmp_path)
+    metrics = PipelineMetrics(profiler=profiler)
+    profiler.start()
+
+    with metrics.phase("transform"):
+        chunks = metrics.timed("extract", (parse_rows(2000) for _ in range(3)), snapshot=True)
+        kept = [(rows, transform_rows(rows)) for rows in chunks]
+    profiler.stop()
+
+    parse_site = f"test_profiling.py:{parse_rows.__code__.co_firstlineno + 1}"
+    transform_site = f"test_profiling.py:{transform_rows.__code__.co_firstlineno + 1}"
+    extract_report = (tmp_path / "extract.memory.txt").read_text()
+    transform_report = (tmp_path / "transform.memory.txt").read_text()
+
+    assert "entered 4x" in extract_report  # 3 chunks and the end of the stream
+    assert parse_site in _growth_sites(extract_report)
+    assert parse_site not in _growth_sites(transform_report)
+    assert transform_site in _growth_sites(transform_report)
+    assert len(kept) == 3
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    """Test only cpu, memory and both are accepted."""
+    with pytest.raises(ValueError):
+        PhaseProfiler("io", tmp_path)
+
+
+def test_pipeline_profiles_each_table_load(sample_config, temp_raw_csv_folder, tmp_path):
+    """Test a profiled dry run writes a profile per phase and per loaded table."""
+    sample_config["data"] = {
+        "raw_folder": temp_raw_csv_folder,
+        "processed_file": str(tmp_path / "events.csv"),
+    }
+    sample_config["etl"].update(fan_out=False, batch_size=10)
+    profiler = PhaseProfiler.for_log_file("cpu", tmp_path / "logs" / "pipeline.log")
+
+    profiler.start()
+    ETLPipeline(sample_config, dry_run=True, profiler=profiler).run()
+    output_dir = profiler.stop()
+
+    assert output_dir.parent == tmp_path / "logs"
+    assert output_dir.name.startswith("profile-")
+    assert {path.stem for path in output_dir.glob("*.pstats")} >= {
+        "extract",
+        "transform",
+        "load",
+        "load_session_item",
+        "load_user_session",
+        "load_user_song",
+    }
+
+
+def test_pipeline_memory_profile_reports_extract(sample_config, temp_raw_csv_folder, tmp_path):
+    """Test a memory-profiled run writes a report for extraction as well."""
+    sample_config["data"] = {
+        "raw_folder": temp_raw_csv_folder,
+        "processed_file": str(tmp_path / "events.csv"),
+    }
+    profiler = PhaseProfiler("memory", tmp_path / "profile")
+
+    profiler.start()
+    ETLPipeline(sample_config, dry_run=True, profiler=profiler).run()
+    output_dir = profiler.stop()
+
+    assert {path.name.split(".")[0] for path in output_dir.glob("*.memory.txt")} >= {
+        "discover",
+        "extract",
+        "transform",
+        "load",
+    }
@@ -0,0 +1,45 @@
+"""Tests for the cached query service."""
+
+from src.db.queries import EventQueryService, Listener, SongPlay
+
+
+def test_song_in_session_returns_typed_result(mock_cassandra_session):
+    """Test that Query 1 rows are converted to SongPlay."""
+    mock_cassandra_session.execute.return_value = [("Faithless", "Music Matters", 495.3)]
+    service = EventQueryService(mock_cassandra_session)
+
+    assert service.song_in_session(338, 4) == SongPlay("Faithless", "Music Matters", 495.3)
+    assert service.song_in_session(1, 1) == SongPlay("Faithless", "Music Matters", 495.3)
+    mock_cassandra_session.execute.return_value = []
+    assert service.song_in_session(2, 2) is None
+
+
+def test_queries_are_prepared_once_and_cached(mock_cassandra_session):
+    """Test that repeated reads hit the cache without a round trip."""
+    mock_cassandra_session.execute.return_value = [("Sara", "Johnson")]
+    service = EventQueryService(mock_cassandra_session)
+
+    for _ in range(3):
+        assert service.song_listeners("All Hands Against His Own") == [Listener("Sara", "Johnson")]
+    mock_cassandra_session.execute.return_value = [("Artist1", "Song1", "Sara", "Johnson")]
+    service.user_session_history(182, 10)
+    service.user_session_history(182, 10)
+
+    assert mock_cassandra_session.prepare.call_count == 2
+    assert mock_cassandra_session.execute.call_count == 2
+    assert service.cache.stats()["hits"] == 3
+
+
+def test_refresh_refetches_cached_keys(mock_cassandra_session):
+    """Test that refresh re-reads hot keys and invalidate drops them."""
+    mock_cassandra_session.execute.return_value = [("Sara", "Johnson")]
+    service = EventQueryService(mock_cassandra_session)
+    service.song_listeners("Song1")
+    service.prewarm_songs(["Song2"])
+
+    mock_cassandra_session.execute.return_value = [("Sara", "Johnson"), ("Tom", "Lee")]
+    assert service.refresh() == 2
+    assert len(service.song_listeners("Song1")) == 2
+
+    service.invalidate()
+    assert service.cache.keys() == []
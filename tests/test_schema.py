@@ -0,0 +1,117 @@
+"""Tests for schema bootstrap from cluster metadata."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from cassandra.metadata import ColumnMetadata, KeyspaceMetadata, Metadata, TableMetadata
+
+from src.db.fake import FakeSession
+from src.db.schema import TABLE_LAYOUTS, CassandraSchema, table_drift
+
+
+def _table_metadata(name, columns, partition_key, clustering_key, reversed_columns=()):
+    """Build driver metadata for a table from (column, type) pairs."""
+    table = TableMetadata("sparkify", name)
+    for column, cql_type in columns:
+        table.columns[column] = ColumnMetadata(
+            table, column, cql_type, is_reversed=column in reversed_columns
+        )
+    table.partition_key = [table.columns[column] for column in partition_key]
+    table.clustering_key = [table.columns[column] for column in clustering_key]
+    return table
+
+
+def _expected_metadata(name):
+    """Build metadata matching a table's expected layout."""
+    layout = TABLE_LAYOUTS[name]
+    return _table_metadata(
+        name, layout.columns.items(), layout.partition_key, layout.clustering_key
+    )
+
+
+@pytest.fixture
+def metadata_session():
+    """Fake session whose cluster reports a keyspace holding only user_song."""
+    metadata = Metadata()
+    keyspace = KeyspaceMetadata("sparkify", True, "SimpleStrategy", {"replication_factor": "1"})
+    keyspace.tables["user_song"] = _expected_metadata("user_song")
+    metadata.keyspaces["sparkify"] = keyspace
+
+    session = FakeSession()
+    session.cluster = MagicMock(metadata=metadata, max_schema_agreement_wait=10)
+    yield session
+    session.shutdown()
+
+
+def test_bootstrap_creates_only_missing_tables(metadata_session):
+    """Test existing objects get no DDL and missing tables share one agreement wait."""
+    cluster = metadata_session.cluster
+
+    drift = CassandraSchema(metadata_session).bootstrap("sparkify")
+
+    assert drift == {}
+    assert metadata_session.keyspace == "sparkify"
+    assert set(metadata_session.tables) == {"session_item", "user_session"}
+    assert metadata_session.stats()["requests"] == 2
+    cluster.refresh_schema_metadata.assert_called_once_with(max_schema_agreement_wait=10)
+    assert cluster.max_schema_agreement_wait == 10
+
+
+def test_bootstrap_sends_no_ddl_when_schema_is_ready(metadata_session):
+    """Test a ready keyspace is verified from metadata alone."""
+    tables = metadata_session.cluster.metadata.keyspaces["sparkify"].tables
+    tables["session_item"] = _expected_metadata("session_item")
+    tables["user_session"] = _expected_metadata("user_session")
+
+    assert CassandraSchema(metadata_session).bootstrap("sparkify") == {}
+    assert metadata_session.stats()["requests"] == 0
+    metadata_session.cluster.refresh_schema_metadata.assert_not_called()
+
+
+def test_bootstrap_reports_drift(metadata_session):
+    """Test differences from the expected columns and keys are reported per table."""
+    tables = metadata_session.cluster.metadata.keyspaces["sparkify"].tables
+    tables["user_song"] = _table_metadata(
+        "user_song",
+        [("song", "text"), ("userid", "bigint"), ("firstname", "text"), ("level", "text")],
+        partition_key=["song", "userid"],
+        clustering_key=[],
+    )
+
+    drift = CassandraSchema(metadata_session).bootstrap("sparkify")
+
+    assert drift == {
+        "user_song": [
+            "column userid is bigint, expected int",
+            "missing column lastname text",
+            "unexpected column level text",
+            "partition key is ('song', 'userid'), expected ('song',)",
+            "clustering key is (), expected ('userid',)",
+        ]
+    }
+
+
+def test_table_drift_detects_clustering_order():
+    """Test a descending clustering column counts as drift."""
+    layout = TABLE_LAYOUTS["user_session"]
+    table = _table_metadata(
+        "user_session",
+        layout.columns.items(),
+        layout.partition_key,
+        layout.clustering_key,
+        reversed_columns={"iteminsession"},
+    )
+
+    assert table_drift(table, layout) == [
+        "descending clustering columns is ('iteminsession',), expected ()"
+    ]
+
+
+def test_bootstrap_without_metadata_sends_every_statement():
+    """Test sessions without cluster metadata fall back to CREATE ... IF NOT EXISTS."""
+    session = FakeSession()
+
+    assert CassandraSchema(session).bootstrap("sparkify") == {}
+    assert set(session.tables) == set(TABLE_LAYOUTS)
+    assert session.stats()["requests"] == 4
+    session.shutdown()
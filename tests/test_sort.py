@@ -0,0 +1,173 @@
+"""Tests for partition-sorted output and the external merge sort."""
+
+import random
+
+import pytest
+
+from src.db.tables import ColumnSpec, TableSpec
+from src.etl import sort
+from src.etl.load import EventDataLoader
+from src.etl.records import EventRecord
+from src.etl.sort import ExternalSorter, PartitionSorter, read_sorted_table
+
+
+def _record(session_id, item, user_id, song, first_name="Ann", length=200.0):
+    return EventRecord("Art, \"The\"", first_name, "F", item, "Lee", length, "free", "NYC", session_id, song, user_id)  # fmt: skip
+
+
+def test_external_sort_spills_runs_and_merges_stably(tmp_path, monkeypatch):
+    """Test rows come back in key order, keeping input order among equal keys."""
+    monkeypatch.setattr(sort, "MAX_MERGE_FAN_IN", 4)
+    rng = random.Random(7)
+    rows = [(rng.randrange(50), rng.randrange(5), position) for position in range(3000)]
+
+    sorter = ExternalSorter(key_length=2, memory_bytes=20_000, temp_folder=str(tmp_path))
+    for row in rows:
+        sorter.add(row)
+
+    assert len(sorter.runs) > sort.MAX_MERGE_FAN_IN
+    assert list(sorter) == sorted(rows, key=lambda row: row[:2])
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_external_sort_orders_descending_columns(tmp_path):
+    """Test descending key columns sort high to low, also across spilled runs."""
+    rng = random.Random(3)
+    rows = [(f"p{rng.randrange(5)}", rng.randrange(100), position) for position in range(2000)]
+
+    with ExternalSorter(
+        2, memory_bytes=10_000, temp_folder=str(tmp_path), descending=[1]
+    ) as sorter:
+        for row in rows:
+            sorter.add(row)
+        assert sorter.runs
+        result = list(sorter)
+
+    assert result == sorted(sorted(rows, key=lambda row: -row[1]), key=lambda row: row[0])
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_external_sort_removes_runs_when_merge_fails(tmp_path, monkeypatch):
+    """Test run files are deleted when merging raises partway."""
+    monkeypatch.setattr(sort, "MAX_MERGE_FAN_IN", 2)
+    sorter = ExternalSorter(1, memory_bytes=2_000, temp_folder=str(tmp_path))
+    for position in range(3000):
+        sorter.add((position % 7, position))
+    assert len(sorter.runs) > sort.MAX_MERGE_FAN_IN
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(sort.pickle, "dump", fail)
+    with pytest.raises(OSError):
+        list(sorter)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_partition_sorter_removes_runs_when_records_fail(tmp_path):
+    """Test a failing record source leaves no spilled runs behind."""
+    temp_folder = tmp_path / "runs"
+    temp_folder.mkdir()
+
+    def records():
+        for item in range(2000):
+            yield _record(item % 10, item, 7, f"Song {item}")
+        raise ValueError("bad row")
+
+    sorter = PartitionSorter(str(tmp_path / "sorted"), memory_mb=0.01, temp_folder=str(temp_folder))
+    with pytest.raises(ValueError):
+        sorter.sort(records())
+
+    assert list(temp_folder.iterdir()) == []
+
+
+def test_partition_sorter_follows_descending_clustering_order(tmp_path):
+    """Test a table with a descending clustering column gets its partitions high to low."""
+    spec = TableSpec(
+        "recent_items",
+        (ColumnSpec("sessionId", "int"), ColumnSpec("itemInSession", "int")),
+        partition_key=("sessionId",),
+        clustering_key=("itemInSession",),
+        descending=("itemInSession",),
+    )
+    records = [_record(session, item, 7, "Song") for item in (1, 3, 0, 2) for session in (2, 1)]
+
+    files = PartitionSorter(str(tmp_path), specs={"recent_items": spec}).sort(records)
+
+    assert list(read_sorted_table(files["recent_items"])) == [
+        (1, 3),
+        (1, 2),
+        (1, 1),
+        (1, 0),
+        (2, 3),
+        (2, 2),
+        (2, 1),
+        (2, 0),
+    ]
+
+
+def test_partition_sorter_writes_sorted_tables(tmp_path):
+    """Test each table file is ordered by primary key and reads back typed."""
+    records = [
+        _record(2, 1, 8, "Song B"),
+        _record(1, 3, 7, "Song A", length=180.25),
+        _record(2, 0, 8, "Song A"),
+        _record(1, 0, 7, "Song C"),
+    ]
+
+    files = PartitionSorter(str(tmp_path / "sorted")).sort(records)
+
+    assert [row[:2] for row in read_sorted_table(files["session_item"])] == [
+        (1, 0),
+        (1, 3),
+        (2, 0),
+        (2, 1),
+    ]
+    assert [row[:3] for row in read_sorted_table(files["user_session"])] == [
+        (1, 7, 0),
+        (1, 7, 3),
+        (2, 8, 0),
+        (2, 8, 1),
+    ]
+    assert list(read_sorted_table(files["user_song"])) == [
+        ("Song A", 7, "Ann", "Lee"),
+        ("Song A", 8, "Ann", "Lee"),
+        ("Song B", 8, "Ann", "Lee"),
+        ("Song C", 7, "Ann", "Lee"),
+    ]
+    assert (1, 3, 'Art, "The"', "Song A", 180.25) in read_sorted_table(files["session_item"])
+
+
+def test_partition_sorter_dedup_keeps_last_row_per_key(tmp_path):
+    """Test deduplication keeps the row written last for every primary key."""
+    records = [
+        _record(1, 0, 7, "Song A", "Ann"),
+        _record(2, 0, 7, "Song A", "Annie"),  # replays Song A
+        _record(1, 0, 7, "Song A", "Ann"),  # duplicated raw row
+    ]
+
+    sorter = PartitionSorter(str(tmp_path), dedup=True)
+    files = sorter.sort(records)
+
+    assert sorter.rows_written == {"session_item": 2, "user_session": 2, "user_song": 1}
+    assert sorter.rows_deduplicated == {"session_item": 1, "user_session": 1, "user_song": 2}
+    assert list(read_sorted_table(files["user_song"])) == [("Song A", 7, "Ann", "Lee")]
+
+
+@pytest.mark.parametrize("batch_rows", [None, 2])
+def test_load_sorted_tables(fake_session, tmp_path, batch_rows):
+    """Test sorted files load the same table contents as the unsorted records."""
+    records = [_record(session, item, session % 3, f"Song {item % 4}") for session in (3, 1, 2) for item in (2, 0, 1)]  # fmt: skip
+    files = PartitionSorter(str(tmp_path), memory_mb=0.001).sort(records)
+
+    loader = EventDataLoader(fake_session, batch_size=4, batch_rows=batch_rows)
+    results = loader.load_sorted_tables(files)
+
+    assert results == {"session_item": 9, "user_session": 9, "user_song": 9}
+    rows = fake_session.execute("SELECT itemInSession, song FROM session_item WHERE sessionId = 1")
+    assert [(row.iteminsession, row.song) for row in rows] == [
+        (0, "Song 0"),
+        (1, "Song 1"),
+        (2, "Song 2"),
+    ]
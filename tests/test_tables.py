@@ -0,0 +1,72 @@
+"""Tests for the declarative table specs."""
+
+import csv
+
+from src.db.fake import FakeSession
+from src.db.tables import TABLE_SPECS, ColumnSpec, TableSpec
+from src.etl.records import EventRecord
+
+SPEC = TableSpec(
+    "plays",
+    (
+        ColumnSpec("sessionId", "int"),
+        ColumnSpec("userId", "int"),
+        ColumnSpec("itemInSession", "int"),
+        ColumnSpec("title", "text", source="song"),
+        ColumnSpec("length", "double"),
+    ),
+    partition_key=("sessionId", "userId"),
+    clustering_key=("itemInSession",),
+    descending=("itemInSession",),
+)
+
+RECORD = EventRecord("Artist", "Ann", "F", 4, "Lee", 200.5, "free", "NYC", 100, "Song", 7)
+
+
+def test_create_query_builds_keys_and_clustering_order():
+    """Test the DDL lists the columns, a composite partition key and the clustering order."""
+    query = SPEC.create_query()
+
+    assert query.startswith("CREATE TABLE IF NOT EXISTS plays (")
+    assert "title text," in query and "length double," in query
+    assert "PRIMARY KEY ((sessionId, userId), itemInSession)" in query
+    assert query.endswith("WITH CLUSTERING ORDER BY (itemInSession DESC)")
+    assert "CLUSTERING" not in TableSpec("t", (ColumnSpec("k", "int"),), ("k",)).create_query()
+
+
+def test_generated_ddl_and_inserts_round_trip_through_fake_session():
+    """Test the generated statements define and fill the tables as specified."""
+    session = FakeSession()
+    for spec in (SPEC, *TABLE_SPECS.values()):
+        session.execute(spec.create_query())
+        session.execute(session.prepare(spec.insert_query()), spec.converter()(RECORD))
+
+    table = session.tables["plays"]
+    assert table.partition_key == ["sessionid", "userid"]
+    assert table.clustering_key == ["iteminsession"]
+    assert table.descending == {"iteminsession"}
+
+    row = session.execute("SELECT title, length FROM plays WHERE sessionId = 100 AND userId = 7")
+    assert (row[0].title, row[0].length) == ("Song", 200.5)
+    assert len(session.execute("SELECT * FROM user_song WHERE song = 'Song'")) == 1
+
+
+def test_converters_read_source_fields_in_column_order():
+    """Test the record converter and the key getter follow the spec."""
+    assert SPEC.converter()(RECORD) == (100, 7, 4, "Song", 200.5)
+    assert SPEC.key_getter()(RECORD) == (100, 7, 4)
+    assert TableSpec("t", (ColumnSpec("song", "text"),), ("song",)).converter()(RECORD) == ("Song",)
+
+
+def test_row_converter_matches_record_converter(temp_csv_file):
+    """Test the compiled CSV row converter types values like the record path."""
+    with open(temp_csv_file, encoding="utf8") as f:
+        reader = csv.reader(f)
+        next(reader)
+        rows = list(reader)
+
+    for spec in (SPEC, *TABLE_SPECS.values()):
+        to_params = spec.row_converter()
+        convert = spec.converter()
+        for row in rows:
+            assert to_params(row) == convert(EventRecord.from_row(row))
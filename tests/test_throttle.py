@@ -0,0 +1,86 @@
+"""Tests for adaptive write throttling."""
+
+from unittest.mock import Mock
+
+import pytest
+from cassandra import OperationTimedOut
+
+from src.etl.throttle import AdaptiveThrottle
+from src.etl.writer import ConcurrentWriter
+
+
+def test_window_grows_after_full_window_of_fast_writes():
+    """Test additive increase once a whole window completes under target latency."""
+    throttle = AdaptiveThrottle(initial_window=4, max_window=10, target_latency_ms=50)
+    for _ in range(4):
+        throttle.on_success(0.001)
+
+    assert throttle.window == 5
+    assert throttle.stats()["increases"] == 1
+
+
+def test_window_shrinks_on_slow_writes_once_per_window():
+    """Test multiplicative decrease on latency above target, rate limited per window."""
+    throttle = AdaptiveThrottle(initial_window=8, target_latency_ms=50)
+    for _ in range(8):
+        throttle.on_success(0.2)
+
+    assert throttle.window == 4
+    assert throttle.stats()["decreases"] == 1
+
+
+def test_window_shrinks_on_errors_down_to_minimum():
+    """Test that timeouts always shrink the window but never below the minimum."""
+    throttle = AdaptiveThrottle(initial_window=8, min_window=3)
+    for _ in range(3):
+        throttle.on_error(OperationTimedOut("timeout"))
+
+    stats = throttle.stats()
+    assert throttle.window == 3
+    assert (stats["timeouts"], stats["retries"], stats["min_window_seen"]) == (3, 3, 3)
+
+
+def test_rate_ceiling_sleeps_between_sends(mocker):
+    """Test that the rows-per-second ceiling delays sends."""
+    sleep = mocker.patch("src.etl.throttle.time.sleep")
+    throttle = AdaptiveThrottle(max_rows_per_second=10)
+    for _ in range(3):
+        throttle.acquire()
+
+    assert sleep.call_count == 2
+    assert sleep.call_args_list[0].args[0] == pytest.approx(0.1, abs=0.02)
+
+
+def test_writer_retries_timed_out_writes_in_order(mock_cassandra_session):
+    """Test that a timed out write is resent and counted once acknowledged."""
+    timed_out = Mock()
+    timed_out.result.side_effect = OperationTimedOut("timeout")
+    mock_cassandra_session.execute_async = Mock(side_effect=[timed_out, Mock(), Mock()])
+    throttle = AdaptiveThrottle(initial_window=4)
+
+    with ConcurrentWriter(mock_cassandra_session, throttle=throttle) as writer:
+        writer.submit("stmt", (1,), table="t")
+        writer.submit("stmt", (2,), table="t")
+
+    assert writer.rows_written == {"t": 2}
+    assert [c.args[1] for c in mock_cassandra_session.execute_async.call_args_list] == [
+        (1,),
+        (2,),
+        (1,),
+    ]
+    assert throttle.stats()["retries"] == 1
+
+
+def test_writer_gives_up_after_max_retries(mock_cassandra_session):
+    """Test that persistent timeouts are raised after the retry budget."""
+    timed_out = Mock()
+    timed_out.result.side_effect = OperationTimedOut("timeout")
+    mock_cassandra_session.execute_async = Mock(return_value=timed_out)
+
+    with pytest.raises(OperationTimedOut):
+        with ConcurrentWriter(
+            mock_cassandra_session, throttle=AdaptiveThrottle(max_retries=2)
+        ) as writer:
+            writer.submit("stmt", (1,), table="t")
+
+    assert mock_cassandra_session.execute_async.call_count == 3
@@ -3,6 +3,7 @@
 import csv
 from pathlib import Path
 
+from src.etl.eventfile import read_event_file
 from src.etl.transform import EventDataTransformer
 
 
@@ -66,3 +67,58 @@ def test_transform_complete_process(temp_output_file, sample_event_data):
 
     assert output_path == temp_output_file
     assert Path(output_path).exists()
+
+
+def test_transform_chunks_streams_raw_rows(temp_output_file, sample_raw_event_data):
+    """Test that transform_chunks writes rows from an iterator of chunks."""
+    transformer = EventDataTransformer(temp_output_file)
+    chunks = iter([sample_raw_event_data[:2], sample_raw_event_data[2:]])
+    output_path = transformer.transform_chunks(chunks)
+
+    with open(output_path, "r", encoding="utf8") as f:
+        lines = list(csv.reader(f))
+
+    assert len(lines) == 3
+    assert lines[2] == [
+        "Artist2", "Jane", "F", "2", "Smith", "180.3", "paid",
+        "Phoenix-Mesa-Scottsdale, AZ", "100", "Song2", "2",
+    ]  # fmt: skip
+    assert transformer.rows_skipped == 1
+
+
+def test_iter_records_hands_off_typed_records(temp_output_file, sample_raw_event_data):
+    """Test that iter_records yields typed records without writing a file."""
+    Path(temp_output_file).unlink()
+    transformer = EventDataTransformer(temp_output_file)
+    records = list(transformer.iter_records([sample_raw_event_data]))
+
+    assert len(records) == 2
+    assert records[0].sessionId == 100
+    assert records[0].length == 200.5
+    assert transformer.rows_skipped == 1
+    assert not Path(temp_output_file).exists()
+
+
+def test_iter_records_writes_audit_file_in_background(temp_output_file, sample_raw_event_data):
+    """Test that iter_records can also write the consolidated CSV file."""
+    transformer = EventDataTransformer(temp_output_file)
+    records = list(transformer.iter_records([sample_raw_event_data], write_file=True))
+
+    with open(temp_output_file, "r", encoding="utf8") as f:
+        lines = list(csv.reader(f))
+
+    assert lines[0] == transformer.OUTPUT_COLUMNS
+    assert len(lines) == len(records) + 1
+
+
+def test_transform_chunks_writes_event_file(tmp_path, sample_raw_event_data):
+    """Test a .evc output file holds the same typed records as the CSV path."""
+    transformer = EventDataTransformer(str(tmp_path / "events.evc"))
+
+    output_file = transformer.transform_chunks([sample_raw_event_data])
+
+    records = list(read_event_file(output_file))
+    assert [record.artist for record in records] == ["Artist1", "Artist2"]
+    assert records[1].location == "Phoenix-Mesa-Scottsdale, AZ"
+    assert records[0].length == 200.5
+    assert transformer.rows_skipped == 1
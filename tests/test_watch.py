@@ -0,0 +1,83 @@
+"""Tests for watch mode."""
+
+import shutil
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.db.fake import FakeSession
+from src.etl.watch import PipelineWatcher
+
+
+@pytest.fixture
+def watch_config(sample_config, temp_raw_csv_folder, tmp_path):
+    """Configuration for a watcher over a temporary raw folder."""
+    sample_config["data"] = {
+        "raw_folder": temp_raw_csv_folder,
+        "processed_file": str(tmp_path / "events.csv"),
+        "manifest_file": str(tmp_path / "manifest.json"),
+    }
+    sample_config["etl"]["fan_out"] = True
+    return sample_config
+
+
+@pytest.fixture
+def connection(mocker):
+    """Patch CassandraConnection to connect to an in-memory session."""
+    connection = MagicMock()
+    connection.connect.return_value = FakeSession()
+    mocker.patch("src.db.connection.CassandraConnection", return_value=connection)
+    return connection
+
+
+def test_watcher_loads_files_once_settled(watch_config, connection, mocker):
+    """Test new files are loaded after two identical polls, over one session."""
+    watcher = PipelineWatcher(watch_config)
+    watcher.pipeline.open()
+    session = connection.connect.return_value
+    prepare = mocker.spy(session, "prepare")
+
+    assert watcher.poll() is None  # First look at the folder
+    stats = watcher.poll()
+    assert stats["files_processed"] == 2
+    assert stats["rows_loaded"]["session_item"] == 4
+    assert watcher.poll() is None  # Nothing new
+
+    raw_folder = Path(watch_config["data"]["raw_folder"])
+    shutil.copy(raw_folder / "2018-11-01-events.csv", raw_folder / "2018-11-03-events.csv")
+    assert watcher.poll() is None  # Not settled yet
+    stats = watcher.poll()
+
+    assert stats["files_processed"] == 1
+    assert stats["rows_loaded"]["session_item"] == 2
+    assert connection.connect.call_count == 1
+    assert prepare.call_count == 3  # Statements prepared by the first run only
+    watcher.pipeline.close()
+    connection.close.assert_called_once()
+
+
+def test_watcher_retries_failed_run(watch_config, connection, mocker):
+    """Test a failed run is counted and retried on the next poll."""
+    watcher = PipelineWatcher(watch_config)
+    mocker.patch.object(
+        watcher.pipeline,
+        "run",
+        side_effect=[RuntimeError("node down"), {"files_processed": 2, "rows_loaded": {}}],
+    )
+
+    watcher.poll()
+    assert watcher.poll() is None
+    assert watcher.failures == 1
+    assert watcher.poll() == {"files_processed": 2, "rows_loaded": {}}
+
+
+def test_watcher_run_stops_and_closes_session(watch_config, connection):
+    """Test run keeps one connection for every poll and closes it when done."""
+    watcher = PipelineWatcher(watch_config, interval=0)
+    watcher.run(max_polls=3)
+
+    assert len(watcher.runs) == 1
+    assert watcher.config["etl"]["incremental"] is True
+    connection.connect.assert_called_once()
+    connection.close.assert_called_once()
@@ -0,0 +1,61 @@
+"""Tests for concurrent statement writer."""
+
+from unittest.mock import Mock
+
+import pytest
+from cassandra import OperationTimedOut
+
+from src.etl.throttle import AdaptiveThrottle
+from src.etl.writer import ConcurrentWriter
+from src.utils.metrics import PipelineMetrics
+
+
+def test_writer_rejects_invalid_concurrency(mock_cassandra_session):
+    """Test that writer requires at least one request in flight."""
+    with pytest.raises(ValueError):
+        ConcurrentWriter(mock_cassandra_session, concurrency=0)
+
+
+def test_writer_bounds_requests_in_flight(mock_cassandra_session):
+    """Test that writer waits for the oldest request when the window is full."""
+    futures = [Mock() for _ in range(5)]
+    mock_cassandra_session.execute_async = Mock(side_effect=futures)
+
+    writer = ConcurrentWriter(mock_cassandra_session, concurrency=2)
+    for i in range(5):
+        writer.submit("stmt", (i,), table="t")
+
+    # Three oldest requests acknowledged, two still in flight
+    assert [f.result.called for f in futures] == [True, True, True, False, False]
+    writer.flush()
+    assert writer.rows_written == {"t": 5}
+
+
+def test_writer_raises_on_failed_write(mock_cassandra_session):
+    """Test that a failed write propagates when acknowledged."""
+    future = Mock()
+    future.result.side_effect = RuntimeError("write timeout")
+    mock_cassandra_session.execute_async = Mock(return_value=future)
+
+    with pytest.raises(RuntimeError):
+        with ConcurrentWriter(mock_cassandra_session, concurrency=1) as writer:
+            writer.submit("stmt", (1,), table="t")
+            writer.submit("stmt", (2,), table="t")
+
+
+def test_writer_records_metrics(fake_session):
+    """Test that acknowledged writes and retries are recorded in metrics."""
+    metrics = PipelineMetrics()
+    fake_session.inject_error(OperationTimedOut("slow"))
+    statement = fake_session.prepare(
+        "INSERT INTO user_song (song, userId, firstName, lastName) VALUES (?, ?, ?, ?)"
+    )
+
+    with ConcurrentWriter(
+        fake_session, concurrency=2, throttle=AdaptiveThrottle(initial_window=2), metrics=metrics
+    ) as writer:
+        for user_id in range(3):
+            writer.submit(statement, ("Song", user_id, "Ann", "Lee"), table="user_song")
+
+    assert metrics.latencies["user_song"].count == 3
+    assert metrics.counters == {"write_retries": 1}